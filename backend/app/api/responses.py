@@ -0,0 +1,80 @@
+"""
+Application-wide JSON response class.
+
+FastJSONResponse renders with the encoder selected by JSON_RESPONSE_BACKEND.
+Besides the plain data FastAPI hands to response classes, it accepts Pydantic
+models (and lists or dicts of them), so routes can return models that are
+already valid without going through response_model re-validation.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+from app.core.config import settings
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Z suffix for UTC timestamps, matching Pydantic's own JSON output
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if ORJSON_AVAILABLE else 0
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        # Python-mode dump keeps datetimes and UUIDs, which orjson encodes natively
+        return obj.model_dump()
+    # Anything else orjson does not know (Decimal, sets, ...) goes through pydantic-core
+    return to_jsonable_python(obj)
+
+
+def encode_orjson(content: Any) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+def encode_pydantic(content: Any) -> bytes:
+    return to_json(content)
+
+
+def encode_stdlib(content: Any) -> bytes:
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def build_json_encoder(backend: Optional[str] = None) -> Callable[[Any], bytes]:
+    """Get the encoder for JSON_RESPONSE_BACKEND ("orjson", "pydantic" or "stdlib")"""
+    backend = backend or settings.json_response_backend
+    if backend == "orjson":
+        if not ORJSON_AVAILABLE:
+            raise ImportError(
+                "orjson is required for JSON_RESPONSE_BACKEND=orjson. Install it with: pip install orjson"
+            )
+        return encode_orjson
+    if backend == "pydantic":
+        return encode_pydantic
+    if backend == "stdlib":
+        return encode_stdlib
+    raise ValueError(f"Unknown JSON_RESPONSE_BACKEND: {backend}")
+
+
+json_encoder = build_json_encoder()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the configured encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return json_encoder(content)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Query
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Query
 from typing import Optional
 from app.core.config import settings
+from app.services.ocr_engine import OCRTimeoutError, OCRUnavailableError
+from app.services.registry import ServiceRegistry, ServiceUnavailableError, get_service_registry
 
 router = APIRouter(prefix="/ocr", tags=["ocr"])
 
@@ -11,7 +13,8 @@ async def ocr_image(
     method: Optional[str] = Query(
         None,
         description="OCR method: 'vision' (OpenAI Vision, recommended), 'hybrid' (Tesseract + OpenAI, requires Tesseract), 'tesseract' (Tesseract only, requires Tesseract)"
-    )
+    ),
+    services: ServiceRegistry = Depends(get_service_registry)
 ):
     """
     Extract recipe from image using OCR.
@@ -33,44 +36,42 @@ async def ocr_image(
         # Try OpenAI Vision first (default and recommended)
         if ocr_method == "vision" or ocr_method is None:
             try:
-                from app.services.openai_ocr_service import OpenAIOCRService
-                service = OpenAIOCRService()
-                result = await service.extract_from_image_vision(image_data)
-                return result
-            except (ImportError, ValueError) as e:
+                service = services.get("vision_ocr")
+            except ServiceUnavailableError as e:
                 raise HTTPException(
                     status_code=503,
                     detail=f"OpenAI Vision API not available: {str(e)}. Please configure OPENAI_API_KEY in backend/.env file."
                 )
+            return await service.extract_from_image_vision(image_data)
         
         elif ocr_method == "tesseract":
             # Use Tesseract only (traditional method)
             try:
-                from app.services.ocr_service import OCRService
-                service = OCRService(use_openai=False)
-                result = await service.process_image(image_data, use_openai_parsing=False)
-                return result
-            except ImportError:
+                service = services.get("ocr")
+            except ServiceUnavailableError as e:
                 raise HTTPException(
                     status_code=503,
-                    detail="OCR service not available. Please install pytesseract and Pillow."
+                    detail=f"OCR service not available: {str(e)}"
                 )
+            return await service.process_image(image_data, use_openai_parsing=False)
         
         else:  # hybrid (default)
             # Use Tesseract + OpenAI text parsing (cheaper)
             try:
-                from app.services.ocr_service import OCRService
-                service = OCRService(use_openai=True)
-                result = await service.process_image(image_data, use_openai_parsing=True)
-                return result
-            except ImportError:
+                service = services.get("ocr")
+            except ServiceUnavailableError as e:
                 raise HTTPException(
                     status_code=503,
-                    detail="OCR service not available. Please install pytesseract and Pillow."
+                    detail=f"OCR service not available: {str(e)}"
                 )
+            return await service.process_image(image_data, use_openai_parsing=True)
     
     except HTTPException:
         raise
+    except OCRTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except OCRUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OCR processing failed: {str(e)}")
 
@@ -1,39 +1,232 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+import zlib
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional, Union
 from uuid import UUID
-from app.models.recipe import Recipe, RecipeCreate, RecipeUpdate
+from app.api.responses import FastJSONResponse, json_encoder
+from app.models.recipe import (
+    Recipe, RecipeCreate, RecipeUpdate, RecipeSummary, RecipeBatchRequest, RecipeBatchResponse,
+    RecipeChanges, PantrySearchRequest, PantryMatch, RecipeFilters, RecipeFacets, RecipeImportResponse,
+)
 from app.services.recipe_service import RecipeService
-from app.core.dependencies import get_current_user, get_supabase_client
+from app.core.dependencies import get_current_user, get_current_user_remote, get_supabase_client
+from app.utils.archive import gunzip_chunks, iter_archive_records
+from app.utils.helpers import etag_matches, make_etag, recipe_etag
 from supabase import Client
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
 
+# Clients may keep responses but must revalidate them with If-None-Match
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# Recipes fetched per database round trip while streaming an export
+EXPORT_PAGE_SIZE = 100
+
 
 def get_recipe_service(supabase: Client = Depends(get_supabase_client)) -> RecipeService:
     return RecipeService(supabase)
 
 
-@router.get("/", response_model=List[Recipe])
+def get_recipe_filters(
+    cuisine: Optional[List[str]] = Query(None, description="Cuisine types; repeat for several"),
+    difficulty: Optional[List[str]] = Query(None, description="easy, medium or hard; repeat for several"),
+    tag: Optional[List[str]] = Query(None, description="Tag names; repeat for several"),
+    max_total_time: Optional[int] = Query(None, ge=0, description="Max prep + cook time in minutes"),
+) -> RecipeFilters:
+    return RecipeFilters(
+        cuisine_types=cuisine,
+        difficulties=difficulty,
+        tags=tag,
+        max_total_time=max_total_time,
+    )
+
+
+@router.get("/", response_model=Union[List[Recipe], List[RecipeSummary]])
 async def get_recipes(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit to return all recipes"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: str = Query("full", pattern="^(full|summary)$", description="'summary' returns card-level columns only"),
+    if_none_match: Optional[str] = Header(None),
+    filters: RecipeFilters = Depends(get_recipe_filters),
+    current_user: dict = Depends(get_current_user),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """
+    Get recipes for the current user, most recently updated first.
+
+    Pass `limit` to paginate; the cursor for the next page is returned in the
+    X-Next-Cursor header (absent on the last page). Facet filters (cuisine,
+    difficulty, tag, max_total_time) narrow the list in the database.
+
+    The ETag combines the user's collection version with the query, so an
+    unchanged list is answered with 304 before any recipe is loaded.
+    """
+    user_id = UUID(current_user["id"])
+    version = await service.get_list_version(user_id)
+    etag = make_etag(user_id, version, request.url.query)
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+        )
+
+    try:
+        recipes, next_cursor = await service.get_recipes_page(
+            user_id,
+            limit=limit,
+            cursor=cursor,
+            summary=fields == "summary",
+            filters=filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(recipes, headers=headers)
+
+
+@router.get("/changes", response_model=RecipeChanges)
+async def get_recipe_changes(
+    since: Optional[str] = Query(None, description="Cursor from the previous pull; omit for a full sync"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: dict = Depends(get_current_user),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """
+    Get recipes created, updated or deleted since the last sync.
+
+    Keep calling with the returned cursor while has_more is true. Deletions
+    are kept for 90 days; an older cursor gets 400 and the client must pull
+    again without `since` and drop local recipes missing from the result.
+    """
+    try:
+        changes = await service.get_changes(UUID(current_user["id"]), since=since, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(changes)
+
+
+async def _ndjson_chunks(pages: AsyncIterator[List[Recipe]]) -> AsyncIterator[bytes]:
+    """One JSON document per line, one chunk per page of recipes"""
+    async for page in pages:
+        yield b"".join(json_encoder(recipe) + b"\n" for recipe in page)
+
+
+async def _gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a gzip file as it is produced"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@router.get("/export")
+async def export_recipes(
+    format: str = Query("ndjson", pattern="^ndjson$", description="Export format (one recipe per line)"),
+    compress: Optional[str] = Query(None, pattern="^gzip$", description="'gzip' to download a .ndjson.gz file"),
+    current_user: dict = Depends(get_current_user),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """
+    Download every recipe in the vault as newline-delimited JSON.
+
+    Recipes are streamed page by page straight from the database, so memory
+    use does not grow with the size of the vault.
+    """
+    chunks = _ndjson_chunks(service.iter_recipe_pages(UUID(current_user["id"]), page_size=EXPORT_PAGE_SIZE))
+    filename = "recipe-vault-export.ndjson"
+    media_type = "application/x-ndjson"
+    if compress == "gzip":
+        chunks = _gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/facets", response_model=RecipeFacets)
+async def get_recipe_facets(
+    filters: RecipeFilters = Depends(get_recipe_filters),
+    current_user: dict = Depends(get_current_user),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """
+    Count recipes matching the filters per cuisine, difficulty, tag and total time.
+
+    total_time counts are cumulative: recipes taking at most max_total_time minutes.
+    """
+    return await service.get_facets(UUID(current_user["id"]), filters)
+
+
+@router.get("/search", response_model=List[Recipe])
+async def search_recipes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    mode: str = Query(
+        "fulltext",
+        pattern="^(fulltext|fuzzy|prefix)$",
+        description="'fuzzy' tolerates typos, 'prefix' matches partially typed words",
+    ),
+    filters: RecipeFilters = Depends(get_recipe_filters),
     current_user: dict = Depends(get_current_user),
     service: RecipeService = Depends(get_recipe_service)
 ):
-    """Get all recipes for the current user"""
-    recipes = await service.get_user_recipes(UUID(current_user["id"]))
-    return recipes
+    """
+    Search recipes by title, description and ingredients, best matches first.
+
+    Use mode=prefix while the user is typing and mode=fuzzy to recover from
+    misspellings when a full-text search finds nothing.
+
+    The offset of the next page is returned in the X-Next-Offset header
+    (absent on the last page).
+    """
+    recipes, has_more = await service.search_recipes(
+        q, UUID(current_user["id"]), limit=limit, offset=offset, mode=mode, filters=filters
+    )
+    return FastJSONResponse(recipes, headers={"X-Next-Offset": str(offset + limit)} if has_more else None)
 
 
 @router.get("/{recipe_id}", response_model=Recipe)
 async def get_recipe(
     recipe_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
     service: RecipeService = Depends(get_recipe_service)
 ):
-    """Get a single recipe by ID"""
-    recipe = await service.get_recipe(recipe_id, UUID(current_user["id"]))
+    """
+    Get a single recipe by ID.
+
+    With If-None-Match, only updated_at is read first; if the ETag still
+    matches, 304 is returned without loading the full recipe.
+    """
+    user_id = UUID(current_user["id"])
+    if if_none_match:
+        updated_at = await service.get_recipe_updated_at(recipe_id, user_id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        etag = recipe_etag(recipe_id, updated_at)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+            )
+
+    recipe = await service.get_recipe(recipe_id, user_id)
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
-    return recipe
+    return FastJSONResponse(
+        recipe,
+        headers={"ETag": recipe_etag(recipe.id, recipe.updated_at), "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
 
 
 @router.post("/", response_model=Recipe, status_code=status.HTTP_201_CREATED)
@@ -50,6 +243,73 @@ async def create_recipe(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/batch", response_model=RecipeBatchResponse)
+async def apply_recipe_batch(
+    batch: RecipeBatchRequest,
+    # Batches can delete: confirm with Supabase Auth that the session is still valid
+    current_user: dict = Depends(get_current_user_remote),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """
+    Apply create/update/delete operations from an offline client in one request.
+
+    Each result echoes the operation's local_id with the server id and a
+    per-item status, so one bad record does not fail the whole sync.
+    """
+    try:
+        results = await service.apply_batch(batch.operations, UUID(current_user["id"]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RecipeBatchResponse(results=results)
+
+
+@router.post("/import", response_model=RecipeImportResponse)
+async def import_recipes(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """
+    Import recipes from an archive sent as the raw request body.
+
+    Accepts NDJSON (including files from GET /recipes/export) or a JSON array
+    of recipes, optionally gzipped (Content-Encoding: gzip or an
+    application/gzip body). The body is parsed as it arrives and inserted in
+    batches; records that fail are listed in the response by their position
+    in the archive while the rest are imported. A corrupt upload stops the
+    import where it breaks; what was imported by then is still reported.
+    """
+    chunks: AsyncIterator[bytes] = request.stream()
+    if request.headers.get("content-encoding") == "gzip" or request.headers.get("content-type") == "application/gzip":
+        chunks = gunzip_chunks(chunks)
+
+    return await service.import_recipes(iter_archive_records(chunks), UUID(current_user["id"]))
+
+
+@router.post("/pantry", response_model=List[PantryMatch])
+async def search_recipes_by_pantry(
+    pantry: PantrySearchRequest,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_user),
+    service: RecipeService = Depends(get_recipe_service)
+):
+    """
+    Find recipes you can cook with the ingredients you have.
+
+    Best coverage first; each match lists the recipe ingredients still missing.
+    The offset of the next page is returned in the X-Next-Offset header.
+    """
+    matches, has_more = await service.search_by_pantry(
+        pantry.ingredients,
+        UUID(current_user["id"]),
+        max_missing=pantry.max_missing,
+        limit=limit,
+        offset=offset,
+    )
+    return FastJSONResponse(matches, headers={"X-Next-Offset": str(offset + limit)} if has_more else None)
+
+
 @router.put("/{recipe_id}", response_model=Recipe)
 async def update_recipe(
     recipe_id: UUID,
@@ -72,7 +332,8 @@ async def update_recipe(
 @router.delete("/{recipe_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_recipe(
     recipe_id: UUID,
-    current_user: dict = Depends(get_current_user),
+    # Destructive: confirm with Supabase Auth that the session is still valid
+    current_user: dict = Depends(get_current_user_remote),
     service: RecipeService = Depends(get_recipe_service)
 ):
     """Delete a recipe"""
@@ -81,14 +342,3 @@ async def delete_recipe(
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-
-@router.get("/search", response_model=List[Recipe])
-async def search_recipes(
-    q: str,
-    current_user: dict = Depends(get_current_user),
-    service: RecipeService = Depends(get_recipe_service)
-):
-    """Search recipes by query"""
-    recipes = await service.search_recipes(q, UUID(current_user["id"]))
-    return recipes
-
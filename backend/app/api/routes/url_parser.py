@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, HttpUrl
+from app.services.registry import ServiceRegistry, ServiceUnavailableError, get_service_registry
 
 router = APIRouter(prefix="/parse-url", tags=["url-parser"])
 
@@ -9,15 +10,18 @@ class URLParseRequest(BaseModel):
 
 
 @router.post("/")
-async def parse_recipe_url(request: URLParseRequest):
+async def parse_recipe_url(request: URLParseRequest, services: ServiceRegistry = Depends(get_service_registry)):
     """Parse recipe from URL"""
     url_str = str(request.url)
     
     # Check if it's an Instagram URL
     if "instagram.com" in url_str and ("/p/" in url_str or "/reel/" in url_str):
         try:
-            from app.services.instagram_parser_service import InstagramParserService
-            service = InstagramParserService()
+            service = services.get("instagram_parser")
+        except ServiceUnavailableError as e:
+            raise HTTPException(status_code=503, detail=f"Instagram parsing service not available: {str(e)}")
+
+        try:
             recipe = await service.extract_from_instagram_url(url_str)
             return recipe
         except Exception as e:
@@ -25,14 +29,12 @@ async def parse_recipe_url(request: URLParseRequest):
     
     # Regular URL parsing
     try:
-        from app.services.url_parser_service import URLParserService
-    except ImportError:
-        raise HTTPException(status_code=503, detail="URL parsing service not available. Please install trafilatura.")
+        service = services.get("url_parser")
+    except ServiceUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"URL parsing service not available: {str(e)}")
     
     try:
-        service = URLParserService()
         recipe = await service.parse_url(url_str)
         return recipe
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"URL parsing failed: {str(e)}")
-
@@ -12,18 +12,60 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     supabase_service_key: str
+    supabase_jwt_secret: Optional[str] = None  # Project JWT secret, enables local HS256 token verification
+    db_max_workers: int = 32  # Max concurrent Supabase queries (thread pool size)
+    
+    # Recipe cache settings
+    recipe_cache_backend: str = "memory"  # Options: "memory" (per-process LRU), "redis" (shared), "none"
+    recipe_cache_ttl: int = 300  # seconds
+    recipe_cache_max_entries: int = 5000  # memory backend only
+    ensured_users_max_entries: int = 10000  # user ids known to have a public.users row, per process
+    redis_url: Optional[str] = None  # e.g. redis://localhost:6379/0
+    
+    # Search settings
+    search_fuzzy_threshold: float = 0.4  # Minimum pg_trgm word similarity for fuzzy matches (0-1)
+    
+    # Auth settings
+    auth_local_verification: bool = True  # Verify access tokens locally instead of calling Supabase Auth
+    jwt_audience: str = "authenticated"
+    jwks_cache_ttl: int = 600  # seconds
+    token_cache_ttl: int = 60  # seconds a remotely validated token is trusted (capped at its exp)
+    token_cache_max_entries: int = 10000
+    
+    # Outbound HTTP client settings (shared pool for recipe pages, Instagram and JWKS)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_max_connections_per_host: int = 10
+    http_keepalive_expiry: float = 60.0  # seconds an idle connection is kept open
+    http_timeout: float = 30.0  # seconds
+    http_connect_timeout: float = 5.0  # seconds
+    http_http2: bool = True  # Requires the h2 package (httpx[http2])
     
     # CORS settings
     cors_origins: list[str] = ["*"]
     
     # OCR settings
     tesseract_cmd: str = "/usr/bin/tesseract"
+    ocr_workers: int = 2  # Tesseract worker processes (0 = one per CPU core)
+    ocr_timeout: float = 30.0  # seconds of recognition per image
+    ocr_language: str = "eng"
+    ocr_tessdata_dir: Optional[str] = None  # e.g. a tessdata_fast checkout: much faster models, slightly less accurate
+    ocr_preprocess: bool = True  # Downscale, rotate and grayscale images before Tesseract (which thresholds them itself)
+    ocr_max_image_side: int = 2400  # px; about 300 DPI for a page that fills the photo
+    ocr_deskew: bool = False  # Straighten tilted photos (slower)
     ocr_method: str = "vision"  # Options: "vision" (OpenAI Vision - recommended), "hybrid" (Tesseract + OpenAI text), "tesseract" (Tesseract only)
     
     # OpenAI settings
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4o-mini"  # Use gpt-4o-mini for cost efficiency, can be changed to gpt-4o
     openai_vision_model: str = "gpt-4o-mini"  # Vision model (gpt-4o-mini is cheaper, gpt-4o is more accurate)
+    openai_vision_detail: str = "auto"  # "auto" (low for images that fit one 512px tile, else high), "low" or "high"
+    openai_vision_format: str = "jpeg"  # Re-encode vision uploads as "jpeg" or "webp"
+    openai_vision_quality: int = 85  # JPEG/WebP quality for vision uploads
+    openai_timeout: float = 60.0  # seconds per API request (vision calls can take 10-20s)
+    openai_connect_timeout: float = 5.0  # seconds
+    openai_max_retries: int = 2
+    openai_max_concurrency: int = 8  # Max OpenAI requests in flight per process; others wait
     
     # Storage settings
     storage_bucket: str = "recipe-images"
@@ -31,6 +73,7 @@ class Settings(BaseSettings):
     
     # API settings
     api_v1_prefix: str = "/api/v1"
+    json_response_backend: str = "orjson"  # Options: "orjson" (fastest), "pydantic" (pydantic-core), "stdlib" (json module)
     
     class Config:
         env_file = ".env"
@@ -1,8 +1,14 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.db.session import get_supabase
+from jose import ExpiredSignatureError, JWTError
+from app.core.config import settings
+from app.core.security import decode_access_token, token_cache
+from app.db.session import get_supabase, run_sync
 from supabase import Client
 from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
@@ -11,12 +17,63 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     supabase: Client = Depends(get_supabase)
 ) -> dict:
-    """Get current authenticated user from JWT token"""
+    """
+    Get current authenticated user from JWT token.
+
+    The token is verified locally (signature, expiry, audience, issuer) when
+    possible; otherwise it is validated remotely with Supabase Auth, and the
+    result is cached briefly so repeated requests with the same token are cheap.
+    """
+    token = credentials.credentials
+    if settings.auth_local_verification:
+        try:
+            claims = await decode_access_token(token)
+        except ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has expired",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        except JWTError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Could not validate credentials: {str(e)}",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        except Exception as e:
+            # JWKS unavailable: fall back to asking Supabase Auth
+            logger.warning(f"Local token verification unavailable: {str(e)}")
+            claims = None
+
+        if claims is not None:
+            return {
+                "id": claims["sub"],
+                "email": claims.get("email"),
+                "user_metadata": claims.get("user_metadata") or {}
+            }
+
+    return await token_cache.get_or_fetch(token, lambda: _validate_token_remote(token, supabase))
+
+
+async def get_current_user_remote(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    supabase: Client = Depends(get_supabase)
+) -> dict:
+    """
+    Get current user by validating the token with Supabase Auth.
+
+    Costs a network round trip (never cached) but also rejects tokens of
+    signed-out or deleted users, so use it for revocation-sensitive routes.
+    """
+    return await _validate_token_remote(credentials.credentials, supabase)
+
+
+async def _validate_token_remote(token: str, supabase: Client) -> dict:
+    """Resolve the user for a token via Supabase Auth, raising 401 if it is not valid"""
     try:
-        token = credentials.credentials
         # Verify token with Supabase using service key client
         # The service key is used for server-side token validation
-        response = supabase.auth.get_user(token)
+        response = await run_sync(supabase.auth.get_user, token)
         
         # Check if response has error or no user
         if hasattr(response, 'user') and response.user is None:
@@ -52,8 +109,6 @@ async def get_current_user(
         raise
     except Exception as e:
         # Log the actual error for debugging
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Token validation error: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
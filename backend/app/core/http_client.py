@@ -0,0 +1,133 @@
+"""
+Application-wide HTTP client for outbound fetches (recipe pages, Instagram
+posts, Supabase Auth's JWKS).
+
+One pooled httpx.AsyncClient lives for the lifetime of the app, so repeated
+imports from the same site reuse warm connections, TLS sessions and DNS
+results instead of paying for them on every request. It is opened by the
+FastAPI lifespan handler and injected into the fetchers.
+"""
+
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees its per-host slot once read or closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Caps concurrent requests per host on top of the pool-wide limits.
+
+    httpx only limits connections across the whole pool, so without this a
+    burst of imports from one site could take every connection.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self.max_per_host = max_per_host
+        # host -> [semaphore, requests holding or waiting for a slot]
+        self._hosts: Dict[str, List] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        entry = self._hosts.setdefault(host, [asyncio.Semaphore(self.max_per_host), 0])
+        entry[1] += 1
+
+        def release() -> None:
+            entry[0].release()
+            self._leave(host, entry)
+
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._leave(host, entry)
+            raise
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        if not isinstance(response.stream, httpx.AsyncByteStream):
+            release()
+            raise TypeError("HostLimitedTransport requires an async transport")
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    def _leave(self, host: str, entry: List) -> None:
+        entry[1] -= 1
+        if entry[1] == 0 and self._hosts.get(host) is entry:
+            del self._hosts[host]
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Create the pooled client configured by the HTTP_* settings"""
+    http2 = settings.http_http2 and HTTP2_AVAILABLE
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=1)
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(
+            transport, max_per_host=settings.http_max_connections_per_host
+        ),
+        timeout=httpx.Timeout(
+            settings.http_timeout, connect=settings.http_connect_timeout
+        ),
+        follow_redirects=True,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use (outside the app lifespan, e.g. scripts)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = build_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections (called on application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,68 @@
+"""
+Application-wide OpenAI client for the recipe extraction services.
+
+All chat completions go through one AsyncOpenAI client, so a 10-20 second
+vision call awaits on the event loop instead of blocking it, and every
+service shares the client's connection pool. OPENAI_MAX_CONCURRENCY caps how
+many completions run at once across the process; extra calls wait their turn
+rather than piling onto the API (and its rate limits).
+"""
+
+import asyncio
+from typing import Any, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+_openai_client: Optional["OpenAIClient"] = None
+
+
+class OpenAIClient:
+    """AsyncOpenAI with a process-wide cap on concurrent requests"""
+
+    def __init__(self, client: AsyncOpenAI, max_concurrency: int):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def chat_completion(self, **kwargs: Any):
+        """chat.completions.create, waiting for a free slot first"""
+        async with self._semaphore:
+            return await self.client.chat.completions.create(**kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+
+def build_openai_client() -> OpenAIClient:
+    """Create the client configured by the OPENAI_* settings"""
+    if not settings.openai_api_key:
+        raise ValueError(
+            "OpenAI API key is not configured. Set OPENAI_API_KEY in environment variables."
+        )
+    client = AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        timeout=httpx.Timeout(
+            settings.openai_timeout, connect=settings.openai_connect_timeout
+        ),
+        max_retries=settings.openai_max_retries,
+    )
+    return OpenAIClient(client, max_concurrency=settings.openai_max_concurrency)
+
+
+def get_openai_client() -> OpenAIClient:
+    """Get the shared OpenAI client, creating it on first use; raises ValueError if no API key is set"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = build_openai_client()
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client (called on application shutdown)"""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.aclose()
+        _openai_client = None
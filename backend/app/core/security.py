@@ -0,0 +1,159 @@
+"""
+Local verification of Supabase access tokens.
+
+Supabase Auth issues JWTs signed either with the project's shared JWT secret
+(HS256) or with an asymmetric signing key published as a JWKS. Verifying them
+here avoids a round trip to Supabase Auth on every request; revocation is not
+visible locally, so sensitive routes can still ask Supabase directly. Tokens
+that do need remote validation are cached briefly by TokenCache.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+import httpx
+from jose import jwt, JWTError
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
+# Refresh the JWKS at most this often when a token names an unknown key id
+JWKS_MIN_REFRESH_INTERVAL = 30
+
+# Algorithms Supabase Auth signs access tokens with; anything else is rejected
+SUPPORTED_ALGORITHMS = ("HS256", "RS256", "ES256")
+
+
+class JWKSCache:
+    """Signing keys from Supabase Auth's JWKS endpoint, refreshed on a TTL or unknown kid"""
+
+    def __init__(self, url: str, ttl: int, http_client: Optional[httpx.AsyncClient] = None):
+        self.url = url
+        self.ttl = ttl
+        # Resolved per refresh so the cache follows the shared client across app restarts
+        self.http_client = http_client
+        self._keys: List[Dict] = []
+        self._fetched_at = 0.0
+
+    async def get_key(self, kid: Optional[str]) -> Optional[Dict]:
+        now = time.monotonic()
+        if now - self._fetched_at > self.ttl:
+            await self._refresh()
+        key = self._find(kid)
+        if key is None and now - self._fetched_at > JWKS_MIN_REFRESH_INTERVAL:
+            # Keys may have been rotated since the last fetch
+            await self._refresh()
+            key = self._find(kid)
+        return key
+
+    def _find(self, kid: Optional[str]) -> Optional[Dict]:
+        for key in self._keys:
+            if kid is None or key.get("kid") == kid:
+                return key
+        return None
+
+    async def _refresh(self) -> None:
+        client = self.http_client or get_http_client()
+        response = await client.get(self.url, timeout=5.0)
+        response.raise_for_status()
+        self._keys = response.json().get("keys", [])
+        self._fetched_at = time.monotonic()
+
+
+jwks_cache = JWKSCache(
+    f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+    ttl=settings.jwks_cache_ttl,
+)
+
+
+async def decode_access_token(token: str) -> Optional[Dict]:
+    """
+    Verify a Supabase access token's signature, expiry, audience and issuer.
+
+    Returns the claims, or None when the token's algorithm cannot be verified
+    locally (HS256 without SUPABASE_JWT_SECRET configured). Raises JWTError for
+    tokens that are invalid.
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    if not isinstance(algorithm, str) or algorithm not in SUPPORTED_ALGORITHMS:
+        raise JWTError(f"Unsupported token algorithm: {algorithm}")
+
+    key: Union[str, Dict]
+    if algorithm == "HS256":
+        if not settings.supabase_jwt_secret:
+            return None
+        key = settings.supabase_jwt_secret
+    else:
+        jwk = await jwks_cache.get_key(header.get("kid"))
+        if jwk is None:
+            raise JWTError("Unknown signing key")
+        key = jwk
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=settings.jwt_audience,
+        issuer=f"{settings.supabase_url.rstrip('/')}/auth/v1",
+        options={"require_aud": True, "require_exp": True, "require_sub": True},
+    )
+
+
+class TokenCache:
+    """
+    Users resolved by remote token validation, keyed by a hash of the token.
+
+    Entries live for at most `ttl` seconds and never past the token's exp claim.
+    Concurrent lookups of the same uncached token share one upstream call.
+    """
+
+    def __init__(self, ttl: int = 60, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get_or_fetch(self, token: str, fetch: Callable[[], Awaitable[Dict]]) -> Dict:
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                return user
+            del self._entries[key]
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(fetch())
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+            pending.add_done_callback(lambda task: self._store(key, token, task))
+        # Shield so one cancelled caller does not cancel the lookup for the others
+        return await asyncio.shield(pending)
+
+    def _store(self, key: str, token: str, task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        expires_at = time.time() + self.ttl
+        try:
+            token_exp = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            token_exp = None
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        if expires_at <= time.time():
+            return
+
+        self._entries[key] = (expires_at, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(ttl=settings.token_cache_ttl, max_entries=settings.token_cache_max_entries)
@@ -1,3 +1,6 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from supabase import create_client, Client
 from app.core.config import settings
 
@@ -8,8 +11,41 @@ supabase: Client = create_client(
     settings.supabase_service_key
 )
 
+# supabase-py's PostgREST builders are synchronous, so queries run on a bounded
+# thread pool instead of the event loop. max_workers caps concurrent DB calls.
+_db_executor: Optional[ThreadPoolExecutor] = None
+
 
 def get_supabase() -> Client:
     """Get Supabase client instance (with service key for server-side operations)"""
     return supabase
 
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for Supabase queries, creating it on first use"""
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=settings.db_max_workers,
+            thread_name_prefix="supabase-db",
+        )
+    return _db_executor
+
+
+async def run_sync(func, *args):
+    """Run a blocking Supabase call on the DB thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), func, *args)
+
+
+async def run_query(query):
+    """Execute a PostgREST query builder without blocking the event loop"""
+    return await run_sync(query.execute)
+
+
+def shutdown_db_executor() -> None:
+    """Stop the query thread pool (called on application shutdown)"""
+    global _db_executor
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=True)
+        _db_executor = None
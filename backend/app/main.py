@@ -1,12 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.api.responses import FastJSONResponse
+from app.core.http_client import close_http_client, get_http_client
+from app.core.openai_client import close_openai_client
+from app.db.session import shutdown_db_executor
+from app.services.ocr_engine import shutdown_ocr_executor
+from app.services.recipe_cache import get_recipe_cache
+from app.services.registry import get_service_registry, shutdown_services, start_services
 from app.api.routes import recipes, ocr, url_parser, auth
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and tear down application-lifetime resources"""
+    start_services(get_http_client())
+    yield
+    shutdown_services()
+    await close_openai_client()
+    await close_http_client()
+    shutdown_ocr_executor()
+    shutdown_db_executor()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="Backend API for Recipe Vault mobile app",
     version=settings.app_version,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -16,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "ETag"],
 )
 
 # Register routers
@@ -32,4 +56,9 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    cache = get_recipe_cache()
+    return {
+        "status": "healthy",
+        "recipe_cache": cache.stats() if cache else None,
+        "services": get_service_registry().health(),
+    }
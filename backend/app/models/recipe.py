@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Union
 from datetime import datetime
 from uuid import UUID
 
@@ -153,3 +153,108 @@ class Recipe(RecipeBase):
 
     class Config:
         from_attributes = True
+
+
+class RecipeSummary(BaseModel):
+    """Card-level projection of a recipe used by list views"""
+    id: UUID
+    user_id: UUID
+    title: str
+    description: Optional[str] = None
+    prep_time: Optional[int] = None
+    cook_time: Optional[int] = None
+    servings: Optional[int] = None
+    image_url: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RecipeBatchOperation(BaseModel):
+    op: str = Field(..., pattern="^(create|update|delete)$")
+    local_id: str  # Client-side identifier echoed back in the result
+    id: Optional[UUID] = None  # Server id, required for update and delete
+    recipe: Optional[Dict[str, Any]] = None  # RecipeCreate for create, RecipeUpdate for update
+
+
+class RecipeBatchRequest(BaseModel):
+    operations: List[RecipeBatchOperation] = Field(..., max_length=200)
+
+
+class RecipeBatchResult(BaseModel):
+    local_id: str
+    id: Optional[UUID] = None
+    status: str  # created, updated, deleted, not_found, invalid or error
+    error: Optional[str] = None
+
+
+class RecipeBatchResponse(BaseModel):
+    results: List[RecipeBatchResult]
+
+
+class RecipeChanges(BaseModel):
+    recipes: List[Recipe]  # Created or updated since the cursor
+    deleted_ids: List[UUID]  # Deleted since the cursor
+    cursor: Optional[str] = None  # Pass as `since` on the next pull
+    has_more: bool = False
+
+
+class PantrySearchRequest(BaseModel):
+    ingredients: List[str] = Field(..., min_length=1, max_length=100)  # What the user has, e.g. ["eggs", "spinach"]
+    max_missing: Optional[int] = Field(None, ge=0)  # Only recipes missing at most this many ingredients
+
+
+class PantryMatch(BaseModel):
+    recipe: Recipe
+    matched: int  # Recipe ingredients covered by the pantry
+    required: int  # Total recipe ingredients
+    missing: int
+    coverage: float  # matched / required
+    missing_ingredients: List[str] = []
+
+
+class RecipeFilters(BaseModel):
+    """Facet filters for list and search; values within one filter are alternatives"""
+    cuisine_types: Optional[List[str]] = None
+    difficulties: Optional[List[str]] = None
+    tags: Optional[List[str]] = None  # Tag names
+    max_total_time: Optional[int] = Field(None, ge=0)  # prep_time + cook_time, in minutes
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class TotalTimeFacetCount(BaseModel):
+    max_total_time: int
+    count: int  # Recipes taking at most max_total_time minutes
+
+
+class RecipeFacets(BaseModel):
+    total: int
+    cuisine_type: List[FacetCount] = []
+    difficulty: List[FacetCount] = []
+    tags: List[FacetCount] = []
+    total_time: List[TotalTimeFacetCount] = []
+
+
+class RecipeImport(RecipeBase):
+    """A recipe in an import archive: RecipeCreate fields, or a Recipe as written by the export"""
+    ingredients: List[IngredientCreate] = []
+    steps: List[StepCreate] = []
+    tags: List[Union[str, TagBase]] = []  # Tag names, or tag objects from an export
+
+
+class RecipeImportError(BaseModel):
+    index: int  # 0-based position of the record in the archive
+    title: Optional[str] = None
+    error: str
+
+
+class RecipeImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[RecipeImportError] = []
@@ -8,16 +8,18 @@ from typing import Dict, Optional
 from bs4 import BeautifulSoup
 from app.services.openai_recipe_extractor import OpenAIRecipeExtractor
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 
 class InstagramParserService:
     """Extract recipes from Instagram post descriptions"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.http_client = http_client or get_http_client()
         self.openai_extractor = None
         try:
             if settings.openai_api_key:
-                self.openai_extractor = OpenAIRecipeExtractor()
+                self.openai_extractor = OpenAIRecipeExtractor(http_client=self.http_client)
         except (ValueError, ImportError):
             pass
     
@@ -70,10 +72,9 @@ class InstagramParserService:
                 'Accept-Language': 'en-US,en;q=0.5',
             }
             
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                html_content = response.text
+            response = await self.http_client.get(url, headers=headers, follow_redirects=True)
+            response.raise_for_status()
+            html_content = response.text
             
             # Parse HTML
             soup = BeautifulSoup(html_content, "html.parser")
@@ -152,6 +153,10 @@ class InstagramParserService:
     
     async def _parse_description_with_openai(self, url: str, description: str) -> Dict:
         """Parse Instagram description using OpenAI"""
+        extractor = self.openai_extractor
+        if extractor is None:
+            raise ValueError("OpenAI is not configured")
+
         # Truncate if too long
         max_chars = 8000
         if len(description) > max_chars:
@@ -207,8 +212,8 @@ Important:
 
         try:
             import json
-            response = self.openai_extractor.client.chat.completions.create(
-                model=self.openai_extractor.model,
+            response = await extractor.client.chat_completion(
+                model=extractor.model,
                 messages=[
                     {
                         "role": "system",
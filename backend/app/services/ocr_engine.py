@@ -0,0 +1,209 @@
+"""
+Tesseract OCR in a pool of worker processes.
+
+pytesseract.image_to_string forks a Tesseract process, writes temp files and
+blocks for seconds per image; run on the event loop it stalls every other
+request. Instead, images are recognised in a bounded ProcessPoolExecutor
+(OCR_WORKERS), so OCR throughput scales with cores and API traffic keeps
+flowing.
+
+With tesserocr installed (pip install tesserocr), each worker keeps one
+resident Tesseract engine, so language data is loaded once per worker rather
+than once per image. Without it, workers fall back to pytesseract. Images
+are cleaned up by app.services.ocr_preprocess in the worker too, unless
+OCR_PREPROCESS is off.
+OCR_TESSDATA_DIR can point at the tessdata_fast models, which are several
+times faster than the default tessdata_best at a small accuracy cost.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from PIL import Image
+
+from app.core.config import settings
+from app.services.ocr_preprocess import preprocess_for_ocr
+
+try:
+    import tesserocr
+
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import pytesseract
+
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+OCR_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
+
+
+class OCRTimeoutError(Exception):
+    """An image took longer than OCR_TIMEOUT to recognise"""
+
+
+class OCRUnavailableError(Exception):
+    """The OCR worker pool kept crashing, even after being rebuilt"""
+
+
+_ocr_executor: Optional[ProcessPoolExecutor] = None
+
+# Per-worker state, set by _init_worker in each pool process
+_engine = None
+_language = "eng"
+_tessdata_dir: Optional[str] = None
+_timeout = 0.0
+# preprocess_for_ocr keyword arguments, or None to OCR images as uploaded
+_preprocess: Optional[dict] = None
+
+
+def _init_worker(
+    language: str,
+    tessdata_dir: Optional[str],
+    tesseract_cmd: Optional[str],
+    timeout: float,
+    preprocess: Optional[dict] = None,
+) -> None:
+    """Load the Tesseract engine once for the lifetime of this worker"""
+    global _engine, _language, _tessdata_dir, _timeout, _preprocess
+    _language = language
+    _tessdata_dir = tessdata_dir
+    _timeout = timeout
+    _preprocess = preprocess
+    if TESSEROCR_AVAILABLE:
+        kwargs = {"lang": language, "oem": tesserocr.OEM.LSTM_ONLY}
+        if tessdata_dir:
+            kwargs["path"] = tessdata_dir
+        _engine = tesserocr.PyTessBaseAPI(**kwargs)
+    elif tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _recognize(image_data: bytes) -> str:
+    """Decode an image and return its text (runs in a worker process)"""
+    try:
+        image: Image.Image = Image.open(io.BytesIO(image_data))
+        if _preprocess is not None:
+            image = preprocess_for_ocr(image, **_preprocess)
+        return _recognize_image(image)
+    except OCRTimeoutError:
+        raise
+    except Exception as e:
+        # Library exceptions (e.g. pytesseract's) do not all survive pickling
+        # back to the parent, which would break the whole pool
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+def _recognize_image(image: "Image.Image") -> str:
+    if _engine is not None:
+        _engine.SetImage(image)
+        started = time.monotonic()
+        # Tesseract stops recognising at the deadline and reports failure, but
+        # it also reports failure for images it cannot recognise at all
+        if not _engine.Recognize(int(_timeout * 1000)):
+            if _timeout and time.monotonic() - started >= _timeout:
+                raise OCRTimeoutError(f"OCR timed out after {_timeout:g}s")
+            raise RuntimeError("Tesseract could not recognise the image")
+        return _engine.GetUTF8Text()
+
+    config = f'--tessdata-dir "{_tessdata_dir}"' if _tessdata_dir else ""
+    try:
+        # pytesseract kills the Tesseract process once the timeout passes
+        return pytesseract.image_to_string(
+            image, lang=_language, config=config, timeout=_timeout
+        )
+    except RuntimeError as e:
+        if "timeout" in str(e).lower():
+            raise OCRTimeoutError(f"OCR timed out after {_timeout:g}s")
+        raise
+
+
+def check_engine() -> None:
+    """Raise if Tesseract cannot be used (called once when the OCR service is built)"""
+    if TESSEROCR_AVAILABLE:
+        if settings.ocr_tessdata_dir:
+            path, languages = tesserocr.get_languages(settings.ocr_tessdata_dir)
+        else:
+            path, languages = tesserocr.get_languages()
+        if settings.ocr_language not in languages:
+            raise RuntimeError(
+                f"Tesseract language data '{settings.ocr_language}' not found in {path}"
+            )
+        return
+    if settings.tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = settings.tesseract_cmd
+    pytesseract.get_tesseract_version()
+
+
+def get_ocr_executor() -> ProcessPoolExecutor:
+    """Get the OCR worker pool, creating it on first use"""
+    global _ocr_executor
+    if _ocr_executor is None:
+        _ocr_executor = ProcessPoolExecutor(
+            max_workers=settings.ocr_workers or None,
+            # Forking a process that runs threads (DB pool, event loop) is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                settings.ocr_language,
+                settings.ocr_tessdata_dir,
+                settings.tesseract_cmd,
+                settings.ocr_timeout,
+                preprocess_options(),
+            ),
+        )
+    return _ocr_executor
+
+
+def preprocess_options() -> Optional[dict]:
+    """preprocess_for_ocr arguments from the OCR_* settings, or None when preprocessing is off"""
+    if not settings.ocr_preprocess:
+        return None
+    return {"max_side": settings.ocr_max_image_side, "deskew": settings.ocr_deskew}
+
+
+async def recognize_text(image_data: bytes) -> str:
+    """
+    OCR an image in the worker pool.
+
+    Raises OCRTimeoutError when recognition takes longer than OCR_TIMEOUT
+    seconds; the limit is enforced inside the worker, so a slow image never
+    keeps a worker busy past it.
+
+    A worker that dies (e.g. killed for memory) breaks the whole pool, so the
+    pool is rebuilt and the image tried once more; OCRUnavailableError is
+    raised if that fails too.
+    """
+    loop = asyncio.get_running_loop()
+    for _ in range(2):
+        executor = get_ocr_executor()
+        try:
+            return await loop.run_in_executor(executor, _recognize, image_data)
+        except BrokenProcessPool:
+            _discard_ocr_executor(executor)
+    raise OCRUnavailableError("OCR workers crashed while recognising the image")
+
+
+def _discard_ocr_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call builds a new one"""
+    global _ocr_executor
+    # Concurrent requests on the same broken pool must not discard its replacement
+    if _ocr_executor is executor:
+        _ocr_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_ocr_executor() -> None:
+    """Stop the OCR worker pool (called on application shutdown)"""
+    global _ocr_executor
+    if _ocr_executor is not None:
+        _ocr_executor.shutdown(wait=True, cancel_futures=True)
+        _ocr_executor = None
@@ -0,0 +1,118 @@
+"""
+Image preprocessing before Tesseract.
+
+Phone photos of recipes arrive as 12 MP colour images, often rotated via
+EXIF and slightly skewed. Tesseract is slower on those than on an upright
+page at a sensible resolution, so images are normalised first:
+
+  1. downscaling so the long side is at most OCR_MAX_IMAGE_SIDE (about
+     300 DPI for a page that fills the frame)
+  2. EXIF-aware rotation, on the already downscaled image
+  3. grayscale
+  4. optional deskew (OCR_DESKEW), by projection profile
+
+Thresholding is left to Tesseract's own (Otsu) binarization: a local-mean
+threshold hollows out dark areas wider than its window (bold headings,
+photos, dark backgrounds), which costs more accuracy than it wins on
+unevenly lit pages.
+
+Every step is a whole-image Pillow operation implemented in C; nothing loops
+over pixels in Python.
+"""
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+# Local background window for finding ink (skew estimation), as a fraction of the long side
+BINARIZE_WINDOW_FRACTION = 1 / 60
+# How much darker than its surroundings (0-255) a pixel must be to count as ink
+BINARIZE_OFFSET = 12
+
+# Skew angles tried by deskew, in degrees
+DESKEW_MAX_ANGLE = 5.0
+DESKEW_STEP = 0.25
+# Width of the thumbnail the skew is estimated on
+DESKEW_SAMPLE_WIDTH = 800
+
+
+def preprocess_for_ocr(image: Image.Image, max_side: int = 2400, deskew: bool = False) -> Image.Image:
+    """Return an upright, grayscale, OCR-sized version of `image`"""
+    # For a freshly opened JPEG, let the decoder skip pixels that would be scaled away
+    image.draft(None, (max_side, max_side))
+    # Downscaling first means the rotation moves a quarter of the pixels; the
+    # long side is the same either way round
+    image = ImageOps.exif_transpose(downscale(image, max_side))
+    gray = to_grayscale(image)
+    if deskew:
+        gray = rotate(gray, estimate_skew(gray))
+    return gray
+
+
+def downscale(image: Image.Image, max_side: int) -> Image.Image:
+    """Shrink so the long side is at most max_side; never upscales"""
+    if max(image.size) <= max_side:
+        return image
+    image = image.copy()
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return image
+
+
+def to_grayscale(image: Image.Image) -> Image.Image:
+    return flatten_alpha(image).convert("L")
+
+
+def flatten_alpha(image: Image.Image) -> Image.Image:
+    """Put transparent images (screenshots) on paper white rather than black"""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+        return Image.alpha_composite(background, rgba).convert("RGB")
+    return image
+
+
+def binarize(gray: Image.Image) -> Image.Image:
+    """
+    Adaptive (local mean) threshold: ink is whatever is darker than its neighbourhood.
+
+    Good enough to find text lines on a skew-estimation thumbnail; not applied
+    to the image Tesseract reads, since areas darker than the window come out
+    hollow.
+    """
+    radius = max(4, int(max(gray.size) * BINARIZE_WINDOW_FRACTION))
+    background = gray.filter(ImageFilter.BoxBlur(radius))
+    # background - pixel, clipped at 0: how much darker each pixel is than its surroundings
+    darkness = ImageChops.subtract(background, gray)
+    return darkness.point(lambda value: 0 if value > BINARIZE_OFFSET else 255)
+
+
+def estimate_skew(gray: Image.Image) -> float:
+    """
+    Angle (degrees, counter-clockwise) that makes text lines horizontal.
+
+    Text lines are horizontal when the row-by-row ink profile is most
+    uneven (dark lines, white gaps), so each candidate rotation of a small
+    inverted thumbnail is scored by the variance of its row means.
+    """
+    sample = gray.copy()
+    sample.thumbnail((DESKEW_SAMPLE_WIDTH, DESKEW_SAMPLE_WIDTH))
+    ink = ImageOps.invert(binarize(sample))
+
+    best_angle, best_score = 0.0, -1.0
+    steps = int(DESKEW_MAX_ANGLE / DESKEW_STEP)
+    for step in range(-steps, steps + 1):
+        angle = step * DESKEW_STEP
+        score = _row_profile_variance(ink.rotate(angle, resample=Image.Resampling.BILINEAR, fillcolor=0))
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle
+
+
+def rotate(gray: Image.Image, angle: float) -> Image.Image:
+    if not angle:
+        return gray
+    return gray.rotate(angle, resample=Image.Resampling.BICUBIC, expand=True, fillcolor=255)
+
+
+def _row_profile_variance(ink: Image.Image) -> float:
+    # Box-resizing to one column averages each row in C
+    rows = ink.resize((1, ink.height), Image.Resampling.BOX).tobytes()
+    mean = sum(rows) / len(rows)
+    return sum((value - mean) ** 2 for value in rows) / len(rows)
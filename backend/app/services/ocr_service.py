@@ -1,56 +1,47 @@
-try:
-    import pytesseract
-    from PIL import Image
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-
 try:
     from app.services.openai_recipe_extractor import OpenAIRecipeExtractor
     OPENAI_AVAILABLE = True
 except (ImportError, ValueError):
     OPENAI_AVAILABLE = False
 
-import io
 import json
+import httpx
 from typing import Dict, Optional
+from app.services.ocr_engine import OCR_AVAILABLE, OCRTimeoutError, OCRUnavailableError, check_engine, recognize_text
 from app.services.recipe_parser import RecipeParser
 from app.core.config import settings
 
 
 class OCRService:
-    def __init__(self, use_openai: bool = True):
+    def __init__(self, use_openai: bool = True, http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize OCR service.
         
         Args:
             use_openai: If True and OpenAI is available, use OpenAI to parse OCR text.
                        If False, use traditional RecipeParser.
+            http_client: Passed on to the OpenAI recipe extractor.
         """
         if not OCR_AVAILABLE:
-            raise ImportError("pytesseract and Pillow are required for OCR functionality")
+            raise ImportError("tesserocr or pytesseract is required for OCR functionality")
         
         self.use_openai = use_openai and OPENAI_AVAILABLE
         self.openai_extractor = None
         
         if self.use_openai:
             try:
-                self.openai_extractor = OpenAIRecipeExtractor()
+                self.openai_extractor = OpenAIRecipeExtractor(http_client=http_client)
             except (ValueError, ImportError):
                 # Fall back to traditional parsing
                 self.use_openai = False
         
-        # Fallback parser
-        if not self.use_openai:
-            self.parser = RecipeParser()
+        # Fallback parser; also used when a call opts out of OpenAI parsing
+        # or OpenAI parsing fails
+        self.parser = RecipeParser()
         
-        # Set Tesseract command path
-        if settings.tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = settings.tesseract_cmd
-        
-        # Verify Tesseract is accessible
+        # Verify Tesseract is accessible (OCR itself runs in the ocr_engine worker pool)
         try:
-            pytesseract.get_tesseract_version()
+            check_engine()
         except Exception as e:
             raise RuntimeError(
                 f"Tesseract OCR is not installed or not accessible at '{settings.tesseract_cmd}'. "
@@ -71,11 +62,8 @@ class OCRService:
             Dict with 'text' (extracted text) and 'recipe' (structured recipe data)
         """
         try:
-            # Read image
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Run OCR with Tesseract (free)
-            text = pytesseract.image_to_string(image)
+            # Run OCR with Tesseract (free) in a worker process
+            text = await recognize_text(image_data)
             
             # Determine if we should use OpenAI for parsing
             should_use_openai = use_openai_parsing if use_openai_parsing is not None else self.use_openai
@@ -92,6 +80,8 @@ class OCRService:
                 "text": text,
                 "recipe": recipe_data,
             }
+        except (OCRTimeoutError, OCRUnavailableError):
+            raise
         except Exception as e:
             raise ValueError(f"OCR processing failed: {str(e)}")
     
@@ -147,7 +137,7 @@ Important:
 """
 
         try:
-            response = self.openai_extractor.client.chat.completions.create(
+            response = await self.openai_extractor.client.chat_completion(
                 model=self.openai_extractor.model,
                 messages=[
                     {
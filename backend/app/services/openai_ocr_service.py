@@ -4,23 +4,26 @@ Supports two methods:
 1. Vision API: Direct image analysis (more accurate, more expensive)
 2. Hybrid: Tesseract OCR + OpenAI text parsing (cheaper, good accuracy)
 """
-import base64
-import io
+import asyncio
+import functools
 import json
+import logging
 import re
 from typing import Dict, Optional
-from PIL import Image
-from openai import OpenAI
 from app.core.config import settings
+from app.core.openai_client import OpenAIClient, get_openai_client
+from app.services.vision_payload import prepare_vision_image
+
+logger = logging.getLogger(__name__)
 
 
 class OpenAIOCRService:
     """Extract recipes from images using OpenAI Vision API"""
     
-    def __init__(self):
-        if not settings.openai_api_key:
+    def __init__(self, openai_client: Optional[OpenAIClient] = None):
+        if not settings.openai_api_key and openai_client is None:
             raise ValueError("OpenAI API key is not configured. Set OPENAI_API_KEY in environment variables.")
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = openai_client or get_openai_client()
         self.model = settings.openai_model
     
     async def extract_from_image_vision(self, image_data: bytes) -> Dict:
@@ -30,13 +33,19 @@ class OpenAIOCRService:
         
         Returns recipe data in format matching RecipeCreate schema.
         """
-        # Encode image to base64
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        # Use gpt-4o-mini for vision (cheaper) or gpt-4o (more accurate)
+        vision_model = settings.openai_vision_model or "gpt-4o-mini"
         
-        # Determine image format
-        image = Image.open(io.BytesIO(image_data))
-        image_format = image.format.lower() if image.format else 'jpeg'
-        mime_type = f"image/{image_format}"
+        # Shrink the upload to what the model actually looks at (CPU-bound, so off the event loop)
+        payload = await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+            prepare_vision_image,
+            image_data,
+            vision_model,
+            detail=settings.openai_vision_detail,
+            image_format=settings.openai_vision_format,
+            quality=settings.openai_vision_quality,
+        ))
+        logger.info(f"Vision payload: {payload.report()}")
         
         prompt = """Extract recipe information from this image and return it as a JSON object.
 
@@ -80,10 +89,7 @@ Important:
 """
 
         try:
-            # Use gpt-4o-mini for vision (cheaper) or gpt-4o (more accurate)
-            vision_model = settings.openai_vision_model or "gpt-4o-mini"
-            
-            response = self.client.chat.completions.create(
+            response = await self.client.chat_completion(
                 model=vision_model,
                 messages=[
                     {
@@ -100,7 +106,8 @@ Important:
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:{mime_type};base64,{image_base64}"
+                                    "url": payload.data_url,
+                                    "detail": payload.detail
                                 }
                             }
                         ]
@@ -120,6 +127,7 @@ Important:
             return {
                 "text": "Extracted from image using OpenAI Vision",
                 "recipe": recipe_data,
+                "image": payload.report(),
             }
             
         except Exception as e:
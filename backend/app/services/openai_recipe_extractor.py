@@ -7,18 +7,20 @@ import re
 import httpx
 from typing import Dict, Optional, List
 from bs4 import BeautifulSoup
-from openai import OpenAI
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.openai_client import OpenAIClient, get_openai_client
 
 
 class OpenAIRecipeExtractor:
     """Extract recipes from URLs using OpenAI API"""
     
-    def __init__(self):
-        if not settings.openai_api_key:
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None, openai_client: Optional[OpenAIClient] = None):
+        if not settings.openai_api_key and openai_client is None:
             raise ValueError("OpenAI API key is not configured. Set OPENAI_API_KEY in environment variables.")
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = openai_client or get_openai_client()
         self.model = settings.openai_model
+        self.http_client = http_client or get_http_client()
     
     async def extract_from_url(self, url: str) -> Dict:
         """
@@ -63,10 +65,9 @@ class OpenAIRecipeExtractor:
     async def _fetch_url_content(self, url: str) -> str:
         """Fetch HTML content from URL"""
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.text
+            response = await self.http_client.get(url, follow_redirects=True)
+            response.raise_for_status()
+            return response.text
         except Exception as e:
             raise ValueError(f"Failed to fetch URL content: {str(e)}")
     
@@ -143,7 +144,7 @@ Important:
 """
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat_completion(
                 model=self.model,
                 messages=[
                     {
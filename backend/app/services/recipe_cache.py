@@ -0,0 +1,170 @@
+"""
+Read-through cache for assembled Recipe documents.
+
+Entries are keyed per user and recipe, expire after a TTL and are replaced or
+evicted by RecipeService on every write. The storage backend is pluggable:
+the in-process LRU is fastest but private to one worker, while the Redis
+backend lets several workers share entries and invalidations. Lookups are
+coroutines so a network backend never blocks the event loop.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.models.recipe import Recipe
+
+try:
+    from redis import asyncio as aioredis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class CacheBackend(ABC):
+    """Storage for cached recipes"""
+
+    # Whether every worker sees the same entries (and so the same invalidations)
+    shared = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Recipe]: ...
+
+    @abstractmethod
+    async def set(self, key: str, recipe: Recipe, ttl: int) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """LRU of Recipe objects with per-entry expiry, local to this process"""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[Recipe]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, recipe = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return recipe
+
+    async def set(self, key: str, recipe: Recipe, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, recipe)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Recipes stored as JSON in Redis (or any asyncio client with get/set(ex=)/delete), shared by all workers"""
+
+    shared = True
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[Recipe]:
+        raw = await self.client.get(key)
+        if raw is None:
+            return None
+        return Recipe.model_validate_json(raw)
+
+    async def set(self, key: str, recipe: Recipe, ttl: int) -> None:
+        await self.client.set(key, recipe.model_dump_json(), ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+
+class RecipeCache:
+    """Per-user recipe cache with hit/miss counters"""
+
+    def __init__(self, backend: CacheBackend, ttl: int = 300):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        """Whether entries are invalidated for every worker, not just this one"""
+        return self.backend.shared
+
+    @staticmethod
+    def _key(recipe_id: UUID, user_id: UUID) -> str:
+        return f"recipe:{user_id}:{recipe_id}"
+
+    async def get(self, recipe_id: UUID, user_id: UUID) -> Optional[Recipe]:
+        recipe = await self.backend.get(self._key(recipe_id, user_id))
+        with self._stats_lock:
+            if recipe is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return recipe
+
+    async def set(self, recipe: Recipe) -> None:
+        await self.backend.set(self._key(recipe.id, recipe.user_id), recipe, self.ttl)
+
+    async def invalidate(self, recipe_id: UUID, user_id: UUID) -> None:
+        await self.backend.delete(self._key(recipe_id, user_id))
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_recipe_cache() -> Optional[RecipeCache]:
+    """Create the cache configured by RECIPE_CACHE_BACKEND ("memory", "redis" or "none")"""
+    backend_name = settings.recipe_cache_backend
+    if backend_name == "none":
+        return None
+    backend: CacheBackend
+    if backend_name == "redis":
+        if not REDIS_AVAILABLE:
+            raise ImportError(
+                "redis is required for RECIPE_CACHE_BACKEND=redis. Install it with: pip install redis"
+            )
+        if not settings.redis_url:
+            raise ValueError("REDIS_URL must be set for RECIPE_CACHE_BACKEND=redis")
+        backend = RedisCacheBackend(aioredis.Redis.from_url(settings.redis_url))
+    else:
+        backend = InMemoryCacheBackend(max_entries=settings.recipe_cache_max_entries)
+    return RecipeCache(backend, ttl=settings.recipe_cache_ttl)
+
+
+recipe_cache: Optional[RecipeCache] = build_recipe_cache()
+
+
+def get_recipe_cache() -> Optional[RecipeCache]:
+    """Get the application-wide recipe cache (None when caching is disabled)"""
+    return recipe_cache
@@ -1,75 +1,647 @@
-from typing import List, Optional
+import threading
+import zlib
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from uuid import UUID
-from app.db.session import get_supabase
-from app.models.recipe import Recipe, RecipeCreate, RecipeUpdate, Ingredient, Step, Tag
+from app.core.config import settings
+from app.db.session import get_supabase, run_query
+from app.models.recipe import (
+    Recipe, RecipeCreate, RecipeUpdate, RecipeSummary,
+    RecipeBatchOperation, RecipeBatchResult, RecipeChanges, PantryMatch, RecipeFilters, RecipeFacets,
+    RecipeImport, RecipeImportError, RecipeImportResponse,
+)
+from app.utils.archive import ArchiveRecord
+from app.utils.helpers import encode_cursor, decode_cursor, encode_sync_cursor, decode_sync_cursor, gc_paused
+from app.services.recipe_cache import RecipeCache, get_recipe_cache
 from app.services.storage_service import StorageService
+import httpx
+from postgrest.exceptions import APIError
+from pydantic import TypeAdapter, ValidationError
 from supabase import Client
 
+# Nested PostgREST select for a fully assembled recipe document
+RECIPE_DETAIL_SELECT = """
+    *,
+    ingredients(*),
+    steps(*),
+    recipe_tags(
+        tags(*)
+    ),
+    attachments(*)
+"""
+
+# SQLSTATE raised by the recipe RPCs when the recipe is missing or not owned by the user
+RECIPE_NOT_FOUND_CODE = "P0002"
+
+# Columns rendered by the app's recipe cards (fields=summary)
+RECIPE_SUMMARY_SELECT = (
+    "id,user_id,title,description,prep_time,cook_time,servings,image_url,created_at,updated_at"
+)
+
+RECIPE_TAG_FILTER_EMBED = "tag_filter:recipe_tags!inner(tags!inner(name))"
+
+# Bulk validators: one pydantic-core call builds a whole page of nested models
+RECIPE_LIST_ADAPTER = TypeAdapter(List[Recipe])
+RECIPE_SUMMARY_LIST_ADAPTER = TypeAdapter(List[RecipeSummary])
+PANTRY_MATCH_LIST_ADAPTER = TypeAdapter(List[PantryMatch])
+RECIPE_IMPORT_LIST_ADAPTER = TypeAdapter(List[RecipeImport])
+
+# Archive records validated and inserted per import_recipes call
+IMPORT_BATCH_SIZE = 100
+
+# Errors that end an import part-way: a broken upload stream (gzip or UTF-8), or
+# the database becoming unreachable mid-batch
+IMPORT_STOPPING_ERRORS = (zlib.error, UnicodeDecodeError, httpx.HTTPError)
+
+class _AppCache:
+    """Default for RecipeService(cache=...): use the application-wide cache (None disables caching)"""
+
+
+APP_CACHE = _AppCache()
+
+# SQLSTATE for a foreign key violation, e.g. a recipe insert for a user without a profile row
+FOREIGN_KEY_VIOLATION_CODE = "23503"
+
+
+class EnsuredUsers:
+    """
+    LRU set of user ids confirmed to have a public.users row, local to this process.
+
+    Profiles are never removed while their auth user exists, so once a user
+    has been confirmed later writes skip the check entirely.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._ids: "OrderedDict[UUID, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, user_id: UUID) -> bool:
+        with self._lock:
+            if user_id not in self._ids:
+                return False
+            self._ids.move_to_end(user_id)
+            return True
+
+    def add(self, user_id: UUID) -> None:
+        with self._lock:
+            self._ids[user_id] = None
+            self._ids.move_to_end(user_id)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+
+    def discard(self, user_id: UUID) -> None:
+        with self._lock:
+            self._ids.pop(user_id, None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+ensured_users = EnsuredUsers(max_entries=settings.ensured_users_max_entries)
+
 
 class RecipeService:
-    def __init__(self, supabase: Client = None):
+    def __init__(
+        self,
+        supabase: Client = None,
+        cache: Union[RecipeCache, None, _AppCache] = APP_CACHE,
+        known_users: Optional[EnsuredUsers] = None,
+    ):
         self.supabase = supabase or get_supabase()
         self.storage = StorageService(self.supabase)
+        # cache=None disables caching; by default the application-wide cache is used
+        self.cache = get_recipe_cache() if isinstance(cache, _AppCache) else cache
+        self.known_users = known_users if known_users is not None else ensured_users
 
     async def get_user_recipes(self, user_id: UUID) -> List[Recipe]:
         """Get all recipes for a user"""
-        response = self.supabase.table("recipes").select(
-            """
-            *,
-            ingredients(*),
-            steps(*),
-            recipe_tags(
-                tags(*)
-            ),
-            attachments(*)
-            """
-        ).eq("user_id", str(user_id)).order("updated_at", desc=True).execute()
-
-        recipes = []
-        for item in response.data:
-            recipe = self._transform_recipe(item)
-            recipes.append(recipe)
-        return recipes
+        response = await run_query(
+            self.supabase.table("recipes")
+            .select(RECIPE_DETAIL_SELECT)
+            .eq("user_id", str(user_id))
+            .order("updated_at", desc=True)
+        )
+
+        return self._transform_recipes(response.data)
+
+    async def get_recipes_page(
+        self,
+        user_id: UUID,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        filters: Optional[RecipeFilters] = None,
+    ) -> Tuple[List[Union[Recipe, RecipeSummary]], Optional[str]]:
+        """
+        Get a page of recipes ordered by (updated_at, id) descending.
+
+        Keyset pagination: the cursor encodes the last row of the previous page,
+        so each page is an index range scan regardless of how deep it is.
+        Returns the recipes and the cursor for the next page (None on the last page).
+        """
+        select = RECIPE_SUMMARY_SELECT if summary else RECIPE_DETAIL_SELECT
+        rows, next_cursor = await self._get_page_rows(user_id, select, limit, cursor, filters)
+
+        recipes: List[Union[Recipe, RecipeSummary]]
+        if summary:
+            recipes = list(RECIPE_SUMMARY_LIST_ADAPTER.validate_python(rows))
+        else:
+            recipes = list(self._transform_recipes(rows))
+        return recipes, next_cursor
+
+    async def iter_recipe_pages(
+        self, user_id: UUID, page_size: int = 100
+    ) -> AsyncIterator[List[Recipe]]:
+        """
+        Yield all of a user's recipes page by page (keyset pagination).
+
+        Only one page is held in memory at a time, however large the vault.
+        """
+        cursor: Optional[str] = None
+        while True:
+            rows, cursor = await self._get_page_rows(user_id, RECIPE_DETAIL_SELECT, page_size, cursor)
+            if rows:
+                yield self._transform_recipes(rows)
+            if not cursor:
+                return
+
+    async def _get_page_rows(
+        self,
+        user_id: UUID,
+        select: str,
+        limit: Optional[int],
+        cursor: Optional[str],
+        filters: Optional[RecipeFilters] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Fetch one keyset page of recipe rows and the cursor for the next page"""
+        if filters and filters.tags:
+            # Inner-joined copy of the tags, only used to filter recipes by tag name
+            select += f",{RECIPE_TAG_FILTER_EMBED}"
+        query = self.supabase.table("recipes").select(select).eq("user_id", str(user_id))
+        if filters:
+            query = self._apply_filters(query, filters)
+        if cursor:
+            updated_at, last_id = decode_cursor(cursor)
+            query = query.or_(
+                f'updated_at.lt."{updated_at}",'
+                f'and(updated_at.eq."{updated_at}",id.lt.{last_id})'
+            )
+        query = query.order("updated_at", desc=True).order("id", desc=True)
+        if limit is not None:
+            # Fetch one extra row to learn whether another page exists
+            query = query.limit(limit + 1)
+
+        response = await run_query(query)
+        rows = response.data
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["updated_at"], rows[-1]["id"])
+        return rows, next_cursor
+
+    async def get_changes(
+        self, user_id: UUID, since: Optional[str] = None, limit: int = 100
+    ) -> RecipeChanges:
+        """
+        Get recipes changed and deleted since a sync cursor, oldest first.
+
+        The cursor is the change sequence number of the last change the client
+        has seen (numbers are assigned in commit order per user, so nothing can
+        commit behind it); without one, every recipe is returned (a full sync)
+        in pages.
+        """
+        since_seq = decode_sync_cursor(since) if since else None
+        response = await run_query(
+            self.supabase.rpc(
+                "get_recipe_changes",
+                {"p_user_id": str(user_id), "p_since": since_seq, "p_limit": limit},
+            )
+        )
+
+        if response.data.get("expired"):
+            # Deletions after the cursor were pruned (see prune_recipe_tombstones)
+            raise ValueError("Sync cursor expired; pull again without `since`")
+        changes = response.data["changes"]
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        return RecipeChanges(
+            recipes=self._transform_recipes([c["recipe"] for c in changes if not c["deleted"]]),
+            deleted_ids=[UUID(c["id"]) for c in changes if c["deleted"]],
+            cursor=encode_sync_cursor(changes[-1]["seq"]) if changes else since,
+            has_more=has_more,
+        )
+
+    async def get_recipe_updated_at(self, recipe_id: UUID, user_id: UUID) -> Optional[str]:
+        """Get only a recipe's updated_at (for ETag checks), or None if not found"""
+        # A per-process cache misses other workers' writes, and a stale
+        # updated_at here would answer 304 for a recipe that has changed
+        if self.cache and self.cache.shared:
+            cached = await self.cache.get(recipe_id, user_id)
+            if cached:
+                return cached.updated_at.isoformat()
+
+        response = await run_query(
+            self.supabase.table("recipes")
+            .select("updated_at")
+            .eq("id", str(recipe_id))
+            .eq("user_id", str(user_id))
+            .limit(1)
+        )
+        return response.data[0]["updated_at"] if response.data else None
+
+    async def get_list_version(self, user_id: UUID) -> int:
+        """Get the user's recipe collection version (bumped on every write that changes the list)"""
+        response = await run_query(
+            self.supabase.table("recipe_list_versions")
+            .select("version")
+            .eq("user_id", str(user_id))
+        )
+        return response.data[0]["version"] if response.data else 0
 
     async def get_recipe(self, recipe_id: UUID, user_id: UUID) -> Optional[Recipe]:
-        """Get a single recipe by ID"""
-        response = self.supabase.table("recipes").select(
-            """
-            *,
-            ingredients(*),
-            steps(*),
-            recipe_tags(
-                tags(*)
-            ),
-            attachments(*)
-            """
-        ).eq("id", str(recipe_id)).eq("user_id", str(user_id)).single().execute()
+        """Get a single recipe by ID, served from the recipe cache when possible"""
+        if self.cache:
+            cached = await self.cache.get(recipe_id, user_id)
+            if cached:
+                return cached
+
+        response = await run_query(
+            self.supabase.table("recipes")
+            .select(RECIPE_DETAIL_SELECT)
+            .eq("id", str(recipe_id))
+            .eq("user_id", str(user_id))
+            .single()
+        )
 
         if not response.data:
             return None
-        return self._transform_recipe(response.data)
+        recipe = self._transform_recipe(response.data)
+        if self.cache:
+            await self.cache.set(recipe)
+        return recipe
 
     async def create_recipe(self, recipe: RecipeCreate, user_id: UUID) -> Recipe:
         """Create a new recipe"""
-        # Ensure user exists in public.users (safety net if trigger didn't run)
+        await self._ensure_user_exists(user_id)
+
+        # Insert the recipe and all of its children in one transaction;
+        # the function returns the assembled recipe document
+        payload = self._build_create_payload(recipe, user_id)
+        try:
+            response = await run_query(self.supabase.rpc("create_recipe_full", {"payload": payload}))
+        except APIError as e:
+            if e.code != FOREIGN_KEY_VIOLATION_CODE or user_id not in self.known_users:
+                raise
+            # The profile row went away after this process confirmed it; check again once
+            self.known_users.discard(user_id)
+            await self._ensure_user_exists(user_id)
+            response = await run_query(self.supabase.rpc("create_recipe_full", {"payload": payload}))
+        created = self._transform_recipe(response.data)
+        if self.cache:
+            await self.cache.set(created)
+        return created
+
+    async def import_recipes(
+        self, records: AsyncIterator[ArchiveRecord], user_id: UUID, batch_size: int = IMPORT_BATCH_SIZE
+    ) -> RecipeImportResponse:
+        """
+        Import recipes from a parsed archive (see app.utils.archive).
+
+        Records are validated and inserted in batches, each with one call to
+        the import_recipes function (multi-row inserts, tags resolved by name
+        in one lookup). A record that fails is reported by its archive index
+        and does not stop the rest of the import.
+
+        If the upload itself breaks (corrupt gzip or UTF-8) or a batch cannot
+        be written, the import stops there. Batches already written stay
+        imported, and the response counts them and reports the archive index
+        the import stopped at.
+        """
+        await self._ensure_user_exists(user_id)
+
+        imported = 0
+        errors: List[RecipeImportError] = []
+        batch: List[Tuple[int, dict]] = []
+        position = 0  # archive index of the next record
+        try:
+            async for index, record in records:
+                position = index + 1
+                if isinstance(record, ValueError):
+                    errors.append(RecipeImportError(index=index, error=str(record)))
+                    continue
+                batch.append((index, record))
+                if len(batch) >= batch_size:
+                    imported += await self._import_batch(batch, user_id, errors)
+                    batch = []
+            if batch:
+                imported += await self._import_batch(batch, user_id, errors)
+        except IMPORT_STOPPING_ERRORS as e:
+            stopped_at = batch[0][0] if batch else position
+            errors.append(RecipeImportError(
+                index=stopped_at,
+                error=f"Import stopped, records from here on were not imported: {e}",
+            ))
+
+        return RecipeImportResponse(imported=imported, failed=len(errors), errors=errors)
+
+    async def update_recipe(
+        self, recipe_id: UUID, recipe: RecipeUpdate, user_id: UUID
+    ) -> Recipe:
+        """Update an existing recipe"""
+        # Ownership is checked by the function's UPDATE ... WHERE user_id, and
+        # child lists are diffed against the stored rows in the same transaction
+        payload = self._build_update_payload(recipe)
+        try:
+            response = await run_query(
+                self.supabase.rpc(
+                    "update_recipe_full",
+                    {"p_recipe_id": str(recipe_id), "p_user_id": str(user_id), "payload": payload},
+                )
+            )
+        except APIError as e:
+            if e.code == RECIPE_NOT_FOUND_CODE:
+                raise ValueError("Recipe not found")
+            raise
+        updated = self._transform_recipe(response.data)
+        if self.cache:
+            await self.cache.set(updated)
+        return updated
+
+    async def delete_recipe(self, recipe_id: UUID, user_id: UUID) -> None:
+        """Delete a recipe"""
+        # Ownership is part of the filter; nothing deleted means missing or not owned.
+        # Cascade will handle related records.
+        response = await run_query(
+            self.supabase.table("recipes").delete().eq("id", str(recipe_id)).eq("user_id", str(user_id))
+        )
+        if self.cache:
+            await self.cache.invalidate(recipe_id, user_id)
+        if not response.data:
+            raise ValueError("Recipe not found")
+
+    async def apply_batch(
+        self, operations: List[RecipeBatchOperation], user_id: UUID
+    ) -> List[RecipeBatchResult]:
+        """
+        Apply a batch of create/update/delete operations from an offline client.
+
+        Operations are validated here, then applied by the apply_recipe_batch
+        function in one round trip. Each operation runs in its own savepoint,
+        so one failure does not roll back the rest. Results keep the request order.
+        """
+        results: Dict[int, RecipeBatchResult] = {}
+        rpc_operations = []
+        rpc_indexes = []
+
+        for index, operation in enumerate(operations):
+            payload: Optional[dict] = None
+            try:
+                if operation.op == "create":
+                    recipe = RecipeCreate.model_validate(operation.recipe or {})
+                    payload = self._build_create_payload(recipe, user_id)
+                else:
+                    if operation.id is None:
+                        raise ValueError(f"'id' is required for {operation.op}")
+                    if operation.op == "update":
+                        payload = self._build_update_payload(RecipeUpdate.model_validate(operation.recipe or {}))
+            except (ValidationError, ValueError) as e:
+                results[index] = RecipeBatchResult(
+                    local_id=operation.local_id, id=operation.id, status="invalid", error=str(e)
+                )
+                continue
+
+            rpc_operations.append({
+                "op": operation.op,
+                "local_id": operation.local_id,
+                "id": str(operation.id) if operation.id else None,
+                "recipe": payload,
+            })
+            rpc_indexes.append(index)
+
+        if rpc_operations:
+            if any(op["op"] == "create" for op in rpc_operations):
+                await self._ensure_user_exists(user_id)
+            response = await run_query(
+                self.supabase.rpc(
+                    "apply_recipe_batch",
+                    {"p_user_id": str(user_id), "operations": rpc_operations},
+                )
+            )
+            rows = response.data or []
+            for index, item in zip(rpc_indexes, rows):
+                result = RecipeBatchResult.model_validate(item)
+                results[index] = result
+                if self.cache and result.id is not None and result.status in ("updated", "deleted"):
+                    await self.cache.invalidate(result.id, user_id)
+
+        # Operations the function returned no row for are reported as errors
+        # rather than dropped, so every request entry gets a result
+        return [
+            results.get(index)
+            or RecipeBatchResult(
+                local_id=operation.local_id, id=operation.id, status="error", error="No result returned for operation"
+            )
+            for index, operation in enumerate(operations)
+        ]
+
+    async def get_facets(self, user_id: UUID, filters: Optional[RecipeFilters] = None) -> RecipeFacets:
+        """Count the user's recipes matching `filters` per cuisine, difficulty, tag and total time"""
+        response = await run_query(
+            self.supabase.rpc(
+                "get_recipe_facets",
+                {"p_user_id": str(user_id), "p_filters": self._filters_payload(filters)},
+            )
+        )
+        return RecipeFacets.model_validate(response.data)
+
+    async def search_recipes(
+        self,
+        query: str,
+        user_id: UUID,
+        limit: int = 20,
+        offset: int = 0,
+        mode: str = "fulltext",
+        filters: Optional[RecipeFilters] = None,
+    ) -> Tuple[List[Recipe], bool]:
+        """
+        Search recipes, best matches first.
+
+        Modes:
+        - "fulltext": ranked full-text search over title, description, ingredient
+          names and cuisine (title matches weigh most). `query` accepts web
+          search syntax ("quoted phrase", or, -exclude).
+        - "fuzzy": typo-tolerant trigram match on titles and ingredient names
+          ("parmesean" finds parmesan).
+        - "prefix": words starting with `query`, for search-as-you-type.
+
+        Only recipes passing `filters` are returned. Returns the page of recipes
+        and whether more results exist.
+        """
+        if mode == "fulltext":
+            rpc = self.supabase.rpc(
+                "search_recipes",
+                {
+                    "p_user_id": str(user_id),
+                    "p_query": query,
+                    "p_limit": limit,
+                    "p_offset": offset,
+                    "p_filters": self._filters_payload(filters),
+                },
+            )
+        else:
+            rpc = self.supabase.rpc(
+                "search_recipes_fuzzy",
+                {
+                    "p_user_id": str(user_id),
+                    "p_query": query,
+                    "p_prefix": mode == "prefix",
+                    "p_threshold": settings.search_fuzzy_threshold,
+                    "p_limit": limit,
+                    "p_offset": offset,
+                    "p_filters": self._filters_payload(filters),
+                },
+            )
+        response = await run_query(rpc)
+
+        results = response.data["results"]
+        has_more = len(results) > limit
+        return self._transform_recipes([r["recipe"] for r in results[:limit]]), has_more
+
+    async def search_by_pantry(
+        self,
+        ingredients: List[str],
+        user_id: UUID,
+        max_missing: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[PantryMatch], bool]:
+        """
+        Find recipes cookable from the given pantry items.
+
+        Ranked by coverage (matched / required ingredients), then fewest missing.
+        An ingredient is matched by a pantry item whose words it all contains
+        ("chicken" matches "chicken thighs", "red wine" not "red onion").
+        Matching uses the ingredient_index inverted index, so only recipes that
+        share at least one ingredient token with the pantry are considered.
+        Returns the page of matches and whether more exist.
+        """
+        response = await run_query(
+            self.supabase.rpc(
+                "search_recipes_by_pantry",
+                {
+                    "p_user_id": str(user_id),
+                    "p_ingredients": ingredients,
+                    "p_max_missing": max_missing,
+                    "p_limit": limit,
+                    "p_offset": offset,
+                },
+            )
+        )
+
+        results = response.data["results"]
+        has_more = len(results) > limit
+        matches = PANTRY_MATCH_LIST_ADAPTER.validate_python(
+            [{**r, "recipe": self._recipe_document(r["recipe"])} for r in results[:limit]]
+        )
+        return matches, has_more
+
+    async def _ensure_user_exists(self, user_id: UUID) -> None:
+        """
+        Ensure user exists in public.users (safety net if trigger didn't run).
+
+        Users already confirmed by this process cost nothing; otherwise one
+        ensure_user call creates the row from auth.users if it is missing.
+        """
+        if user_id in self.known_users:
+            return
         try:
-            user_check = self.supabase.table("users").select("id").eq("id", str(user_id)).execute()
-            if not user_check.data:
-                # User doesn't exist in public.users, create it
-                # Get user info from auth
-                auth_user = self.supabase.auth.admin.get_user_by_id(str(user_id))
-                if auth_user and auth_user.user:
-                    self.supabase.table("users").insert({
-                        "id": str(user_id),
-                        "email": auth_user.user.email,
-                        "full_name": auth_user.user.user_metadata.get("full_name") if auth_user.user.user_metadata else None,
-                    }).execute()
+            response = await run_query(self.supabase.rpc("ensure_user", {"p_user_id": str(user_id)}))
+            if response.data:
+                self.known_users.add(user_id)
         except Exception as e:
             # If we can't create the user, continue anyway - the error will be more informative
             print(f"Warning: Could not ensure user exists: {e}")
-        
-        # Prepare recipe data
-        recipe_data = {
+
+    def _apply_filters(self, query, filters: RecipeFilters):
+        """Add facet filters to a recipes table query (tags need RECIPE_TAG_FILTER_EMBED selected)"""
+        if filters.cuisine_types:
+            query = query.in_("cuisine_type", filters.cuisine_types)
+        if filters.difficulties:
+            query = query.in_("difficulty", filters.difficulties)
+        if filters.max_total_time is not None:
+            query = query.lte("total_time", filters.max_total_time)
+        if filters.tags:
+            query = query.in_("tag_filter.tags.name", filters.tags)
+        return query
+
+    def _filters_payload(self, filters: Optional[RecipeFilters]) -> dict:
+        """Filters as the JSON document accepted by recipe_matches_filters (unset keys omitted)"""
+        if filters is None:
+            return {}
+        return {key: value for key, value in filters.model_dump(exclude_none=True).items() if value != []}
+
+    async def _import_batch(
+        self, batch: List[Tuple[int, dict]], user_id: UUID, errors: List[RecipeImportError]
+    ) -> int:
+        """Validate and insert one batch of archive records; returns how many were imported"""
+        records = [self._normalize_import_record(record) for _, record in batch]
+        try:
+            recipes = RECIPE_IMPORT_LIST_ADAPTER.validate_python(records)
+            valid = list(zip(batch, recipes))
+        except ValidationError:
+            # Find the bad records one by one; the rest of the batch still goes in
+            valid = []
+            for item, record in zip(batch, records):
+                try:
+                    valid.append((item, RecipeImport.model_validate(record)))
+                except ValidationError as e:
+                    errors.append(RecipeImportError(index=item[0], title=self._record_title(record), error=str(e)))
+        if not valid:
+            return 0
+
+        payloads = [self._build_import_payload(recipe) for _, recipe in valid]
+        try:
+            await run_query(self.supabase.rpc("import_recipes", {"p_user_id": str(user_id), "p_recipes": payloads}))
+            return len(valid)
+        except APIError as e:
+            if len(valid) == 1:
+                (index, record), _ = valid[0]
+                errors.append(RecipeImportError(index=index, title=self._record_title(record), error=e.message or str(e)))
+                return 0
+
+        # The failed batch was rolled back as a whole; retry its records one at a time
+        imported = 0
+        for item, _ in valid:
+            imported += await self._import_batch([item], user_id, errors)
+        return imported
+
+    def _normalize_import_record(self, record: dict) -> dict:
+        """Number ingredients and steps by position when the source did not"""
+        for key in ("ingredients", "steps"):
+            items = record.get(key)
+            if isinstance(items, list):
+                record[key] = [
+                    {"order_index": position, **item} if isinstance(item, dict) else item
+                    for position, item in enumerate(items)
+                ]
+        return record
+
+    def _record_title(self, record: dict) -> Optional[str]:
+        title = record.get("title")
+        return title if isinstance(title, str) else None
+
+    def _build_import_payload(self, recipe: RecipeImport) -> dict:
+        """Build one element of the array accepted by the import_recipes function"""
+        payload = recipe.model_dump(exclude={"tags"})
+        payload["tags"] = sorted({tag if isinstance(tag, str) else tag.name for tag in recipe.tags})
+        return payload
+
+    def _build_create_payload(self, recipe: RecipeCreate, user_id: UUID) -> dict:
+        """Build the JSON document accepted by the create_recipe_full function"""
+        return {
             "user_id": str(user_id),
             "title": recipe.title,
             "description": recipe.description,
@@ -81,17 +653,8 @@ class RecipeService:
             "image_url": recipe.image_url,
             "source_url": recipe.source_url,
             "notes": recipe.notes,
-        }
-
-        # Create recipe
-        response = self.supabase.table("recipes").insert(recipe_data).execute()
-        recipe_id = UUID(response.data[0]["id"])
-
-        # Create ingredients
-        if recipe.ingredients:
-            ingredients_data = [
+            "ingredients": [
                 {
-                    "recipe_id": str(recipe_id),
                     "name": ing.name,
                     "amount": ing.amount,
                     "unit": ing.unit,
@@ -99,168 +662,45 @@ class RecipeService:
                     "order_index": ing.order_index,
                 }
                 for ing in recipe.ingredients
-            ]
-            self.supabase.table("ingredients").insert(ingredients_data).execute()
-
-        # Create steps
-        if recipe.steps:
-            steps_data = [
+            ],
+            "steps": [
                 {
-                    "recipe_id": str(recipe_id),
                     "description": step.description,
                     "order_index": step.order_index,
                     "duration": step.duration,
                     "temperature": step.temperature,
                 }
                 for step in recipe.steps
-            ]
-            self.supabase.table("steps").insert(steps_data).execute()
-
-        # Create recipe-tag associations
-        if recipe.tag_ids:
-            recipe_tags_data = [
-                {"recipe_id": str(recipe_id), "tag_id": str(tag_id)}
-                for tag_id in recipe.tag_ids
-            ]
-            self.supabase.table("recipe_tags").insert(recipe_tags_data).execute()
-
-        # Fetch and return complete recipe
-        return await self.get_recipe(recipe_id, user_id)
-
-    async def update_recipe(
-        self, recipe_id: UUID, recipe: RecipeUpdate, user_id: UUID
-    ) -> Recipe:
-        """Update an existing recipe"""
-        # Verify ownership
-        existing = await self.get_recipe(recipe_id, user_id)
-        if not existing:
-            raise ValueError("Recipe not found")
+            ],
+            "tag_ids": [str(tag_id) for tag_id in recipe.tag_ids],
+        }
 
-        # Update recipe fields
-        recipe_data = {}
+    def _build_update_payload(self, recipe: RecipeUpdate) -> dict:
+        """Build the JSON document accepted by the update_recipe_full function"""
+        payload = {}
         for field, value in recipe.model_dump(exclude_unset=True, exclude={"ingredients", "steps", "tag_ids"}).items():
             if value is not None:
-                recipe_data[field] = value
-
-        if recipe_data:
-            self.supabase.table("recipes").update(recipe_data).eq("id", str(recipe_id)).execute()
+                payload[field] = value
 
-        # Update ingredients if provided
         if recipe.ingredients is not None:
-            # Delete existing ingredients
-            self.supabase.table("ingredients").delete().eq("recipe_id", str(recipe_id)).execute()
-            # Insert new ingredients
-            if recipe.ingredients:
-                ingredients_data = [
-                    {
-                        "recipe_id": str(recipe_id),
-                        "name": ing.name,
-                        "amount": ing.amount,
-                        "unit": ing.unit,
-                        "notes": ing.notes,
-                        "order_index": ing.order_index,
-                    }
-                    for ing in recipe.ingredients
-                ]
-                self.supabase.table("ingredients").insert(ingredients_data).execute()
-
-        # Update steps if provided
+            payload["ingredients"] = [ing.model_dump() for ing in recipe.ingredients]
         if recipe.steps is not None:
-            # Delete existing steps
-            self.supabase.table("steps").delete().eq("recipe_id", str(recipe_id)).execute()
-            # Insert new steps
-            if recipe.steps:
-                steps_data = [
-                    {
-                        "recipe_id": str(recipe_id),
-                        "description": step.description,
-                        "order_index": step.order_index,
-                        "duration": step.duration,
-                        "temperature": step.temperature,
-                    }
-                    for step in recipe.steps
-                ]
-                self.supabase.table("steps").insert(steps_data).execute()
-
-        # Update tags if provided
+            payload["steps"] = [step.model_dump() for step in recipe.steps]
         if recipe.tag_ids is not None:
-            # Delete existing recipe_tags
-            self.supabase.table("recipe_tags").delete().eq("recipe_id", str(recipe_id)).execute()
-            # Insert new recipe_tags
-            if recipe.tag_ids:
-                recipe_tags_data = [
-                    {"recipe_id": str(recipe_id), "tag_id": str(tag_id)}
-                    for tag_id in recipe.tag_ids
-                ]
-                self.supabase.table("recipe_tags").insert(recipe_tags_data).execute()
+            payload["tag_ids"] = [str(tag_id) for tag_id in recipe.tag_ids]
+        return payload
 
-        # Fetch and return updated recipe
-        return await self.get_recipe(recipe_id, user_id)
-
-    async def delete_recipe(self, recipe_id: UUID, user_id: UUID) -> None:
-        """Delete a recipe"""
-        # Verify ownership
-        existing = await self.get_recipe(recipe_id, user_id)
-        if not existing:
-            raise ValueError("Recipe not found")
-
-        # Delete recipe (cascade will handle related records)
-        self.supabase.table("recipes").delete().eq("id", str(recipe_id)).execute()
-
-    async def search_recipes(self, query: str, user_id: UUID) -> List[Recipe]:
-        """Search recipes by title, description, or ingredients"""
-        # Use full-text search on title and description
-        response = self.supabase.table("recipes").select(
-            """
-            *,
-            ingredients(*),
-            steps(*),
-            recipe_tags(
-                tags(*)
-            ),
-            attachments(*)
-            """
-        ).eq("user_id", str(user_id)).or_(
-            f"title.ilike.%{query}%,description.ilike.%{query}%"
-        ).execute()
-
-        recipes = []
-        for item in response.data:
-            # Also search in ingredients
-            ingredients_match = any(
-                query.lower() in ing.get("name", "").lower()
-                for ing in item.get("ingredients", [])
-            )
-            if ingredients_match or query.lower() in item.get("title", "").lower() or query.lower() in item.get("description", "").lower():
-                recipes.append(self._transform_recipe(item))
-
-        return recipes
+    def _recipe_document(self, data: dict) -> dict:
+        """Reshape a recipe row from the database into the Recipe schema (tags come nested in recipe_tags)"""
+        tags = [tag_data["tags"] for tag_data in data.get("recipe_tags") or [] if "tags" in tag_data]
+        return {**data, "tags": tags}
 
     def _transform_recipe(self, data: dict) -> Recipe:
         """Transform database response to Recipe model"""
-        # Extract tags from recipe_tags
-        tags = []
-        if "recipe_tags" in data and data["recipe_tags"]:
-            tags = [tag_data["tags"] for tag_data in data["recipe_tags"] if "tags" in tag_data]
-
-        return Recipe(
-            id=UUID(data["id"]),
-            user_id=UUID(data["user_id"]),
-            title=data["title"],
-            description=data.get("description"),
-            prep_time=data.get("prep_time"),
-            cook_time=data.get("cook_time"),
-            servings=data.get("servings"),
-            difficulty=data.get("difficulty"),
-            cuisine_type=data.get("cuisine_type"),
-            image_url=data.get("image_url"),
-            source_url=data.get("source_url"),
-            notes=data.get("notes"),
-            created_at=data["created_at"],
-            updated_at=data["updated_at"],
-            synced_at=data.get("synced_at"),
-            ingredients=[Ingredient(**ing) for ing in data.get("ingredients", [])],
-            steps=[Step(**step) for step in data.get("steps", [])],
-            tags=[Tag(**tag) for tag in tags],
-            attachments=[Attachment(**att) for att in data.get("attachments", [])] if "attachments" in data else [],
-        )
+        return Recipe.model_validate(self._recipe_document(data))
+
+    def _transform_recipes(self, rows: List[dict]) -> List[Recipe]:
+        """Transform many database rows to Recipe models in a single validation pass"""
+        with gc_paused():
+            return RECIPE_LIST_ADAPTER.validate_python([self._recipe_document(row) for row in rows])
+
@@ -0,0 +1,109 @@
+"""
+Application-lifetime instances of the OCR and URL import services.
+
+Building these services is not free: each one sets up its OpenAI extractor, and
+OCRService starts a Tesseract process to check that it is installed. They are
+built once by the FastAPI lifespan handler, which also reports which of them
+are usable, and handed to routes through get_service_registry.
+"""
+
+import logging
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceUnavailableError(Exception):
+    """A service could not be built at startup (missing dependency or configuration)"""
+
+
+def _build_vision_ocr(http_client: httpx.AsyncClient):
+    from app.services.openai_ocr_service import OpenAIOCRService
+
+    return OpenAIOCRService()
+
+
+def _build_ocr(http_client: httpx.AsyncClient):
+    from app.services.ocr_service import OCRService
+
+    return OCRService(use_openai=True, http_client=http_client)
+
+
+def _build_url_parser(http_client: httpx.AsyncClient):
+    from app.services.url_parser_service import URLParserService
+
+    return URLParserService(http_client=http_client)
+
+
+def _build_instagram_parser(http_client: httpx.AsyncClient):
+    from app.services.instagram_parser_service import InstagramParserService
+
+    return InstagramParserService(http_client=http_client)
+
+
+SERVICE_FACTORIES: Dict[str, Callable[[httpx.AsyncClient], object]] = {
+    "vision_ocr": _build_vision_ocr,
+    "ocr": _build_ocr,
+    "url_parser": _build_url_parser,
+    "instagram_parser": _build_instagram_parser,
+}
+
+
+class ServiceRegistry:
+    """Services built once, plus the reason any of them could not be built"""
+
+    def __init__(self, http_client: httpx.AsyncClient):
+        self.http_client = http_client
+        self._services: Dict[str, object] = {}
+        self._errors: Dict[str, str] = {}
+
+    def start(self) -> None:
+        for name, factory in SERVICE_FACTORIES.items():
+            try:
+                self._services[name] = factory(self.http_client)
+            except Exception as e:
+                self._errors[name] = str(e)
+                logger.warning(f"Service '{name}' unavailable: {str(e)}")
+
+    def get(self, name: str):
+        """Get a started service, or raise ServiceUnavailableError with the startup failure"""
+        service = self._services.get(name)
+        if service is None:
+            raise ServiceUnavailableError(
+                self._errors.get(name, f"Unknown service '{name}'")
+            )
+        return service
+
+    def health(self) -> Dict[str, str]:
+        return {
+            name: "ok" if name in self._services else "unavailable"
+            for name in SERVICE_FACTORIES
+        }
+
+
+_service_registry: Optional[ServiceRegistry] = None
+
+
+def start_services(http_client: Optional[httpx.AsyncClient] = None) -> ServiceRegistry:
+    """Build every service and log the ones that are unavailable (called on application startup)"""
+    global _service_registry
+    _service_registry = ServiceRegistry(http_client or get_http_client())
+    _service_registry.start()
+    return _service_registry
+
+
+def get_service_registry() -> ServiceRegistry:
+    """Get the started services, starting them on first use outside the app lifespan (e.g. tests)"""
+    if _service_registry is None:
+        return start_services()
+    return _service_registry
+
+
+def shutdown_services() -> None:
+    """Drop the service instances (called on application shutdown)"""
+    global _service_registry
+    _service_registry = None
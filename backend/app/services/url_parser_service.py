@@ -15,17 +15,20 @@ from bs4 import BeautifulSoup
 from typing import Dict, Optional
 from app.services.recipe_parser import RecipeParser
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 
 class URLParserService:
-    def __init__(self, use_openai: bool = True):
+    def __init__(self, use_openai: bool = True, http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize URL parser service.
         
         Args:
             use_openai: If True, use OpenAI API for extraction (requires OPENAI_API_KEY).
                        If False or OpenAI is unavailable, falls back to traditional parsing.
+            http_client: Client for fetching pages; defaults to the shared application client.
         """
+        self.http_client = http_client or get_http_client()
         self.use_openai = use_openai and OPENAI_AVAILABLE
         self.openai_extractor = None
         self.parser = None
@@ -33,7 +36,7 @@ class URLParserService:
         # Initialize OpenAI extractor if requested and available
         if self.use_openai:
             try:
-                self.openai_extractor = OpenAIRecipeExtractor()
+                self.openai_extractor = OpenAIRecipeExtractor(http_client=self.http_client)
             except (ValueError, ImportError) as e:
                 # Fall back to traditional parsing if OpenAI is not configured
                 self.use_openai = False
@@ -72,14 +75,12 @@ class URLParserService:
         
         # Fallback to traditional parsing
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
-                html_content = response.text
+            response = await self.http_client.get(url, follow_redirects=True)
+            response.raise_for_status()
+            html_content = response.text
 
-            # Extract content using trafilatura
-            downloaded = trafilatura.fetch_url(url)
-            text = trafilatura.extract(downloaded) or ""
+            # Extract content using trafilatura (from the page already fetched)
+            text = trafilatura.extract(html_content) or ""
 
             # Parse HTML for structured data
             soup = BeautifulSoup(html_content, "html.parser")
@@ -0,0 +1,191 @@
+"""
+Image payloads for the OpenAI Vision API.
+
+The API never looks at more than a fixed number of pixels: with detail
+"high" it fits the image within 2048x2048, scales the short side down to
+768 px and bills 512 px tiles; with detail "low" it looks at one 512 px
+thumbnail. Anything beyond that is uploaded, base64-inflated and thrown
+away. So each upload is decoded once, rotated per EXIF, resized to what the
+model will actually see (nudged onto the tile grid when that saves a row of
+tiles) and re-encoded as JPEG/WebP, and the detail level is picked from the
+result. The bytes and estimated tokens saved are reported per request.
+"""
+
+import base64
+import io
+import math
+from typing import Dict, Tuple
+
+from PIL import Image, ImageOps
+
+from app.services.ocr_preprocess import flatten_alpha
+
+# How the API sees images with detail "high"
+VISION_MAX_SIDE = 2048
+VISION_SHORT_SIDE = 768
+VISION_TILE_SIDE = 512
+# Shrink up to this fraction further if that drops a row or column of tiles
+VISION_TILE_SLACK = 0.1
+
+# (base tokens, tokens per tile) by model prefix, most specific first
+VISION_TOKEN_COSTS = (
+    ("gpt-4o-mini", (2833, 5667)),
+    ("", (85, 170)),
+)
+
+# Formats the API accepts as-is, by Pillow format name
+PASSTHROUGH_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+
+class VisionPayload:
+    """An image ready for a vision request, and what it saved"""
+
+    def __init__(
+        self,
+        data: bytes,
+        mime_type: str,
+        detail: str,
+        size: Tuple[int, int],
+        original_bytes: int,
+        original_tokens: int,
+        tokens: int,
+    ):
+        self.data = data
+        self.mime_type = mime_type
+        self.detail = detail
+        self.size = size
+        self.original_bytes = original_bytes
+        self.original_tokens = original_tokens
+        self.tokens = tokens
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode('ascii')}"
+
+    def report(self) -> Dict:
+        return {
+            "width": self.size[0],
+            "height": self.size[1],
+            "detail": self.detail,
+            "original_bytes": self.original_bytes,
+            "bytes": len(self.data),
+            "bytes_saved": self.original_bytes - len(self.data),
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "tokens_saved": self.original_tokens - self.tokens,
+        }
+
+
+def prepare_vision_image(
+    image_data: bytes,
+    model: str,
+    detail: str = "auto",
+    image_format: str = "jpeg",
+    quality: int = 85,
+) -> VisionPayload:
+    """
+    Decode, orient, resize and re-encode an upload for a vision request.
+
+    detail "auto" sends images that fit in one low-detail tile as "low"
+    (nothing is lost) and everything else as "high", since recipe text has
+    to stay legible.
+    """
+    image: Image.Image = Image.open(io.BytesIO(image_data))
+    original_format = image.format
+    # Opening only reads the header, so this is the upright size before any decoding
+    original_size = _oriented_size(image)
+    # For a JPEG, let the decoder skip pixels that will be scaled away anyway
+    image.draft("RGB", (VISION_SHORT_SIDE, VISION_SHORT_SIDE))
+    image = ImageOps.exif_transpose(image)
+
+    if detail == "auto":
+        detail = "low" if max(original_size) <= VISION_TILE_SIDE else "high"
+    target = vision_size(original_size, detail)
+    resized = target != original_size
+
+    if image.size != target:
+        image = image.resize(target, Image.Resampling.LANCZOS)
+    data, mime_type = _encode(flatten_alpha(image), image_format, quality)
+    # Re-encoding an already compact image can only lose quality
+    if (
+        not resized
+        and original_format in PASSTHROUGH_FORMATS
+        and len(image_data) <= len(data)
+    ):
+        data, mime_type = image_data, PASSTHROUGH_FORMATS[original_format]
+
+    return VisionPayload(
+        data=data,
+        mime_type=mime_type,
+        detail=detail,
+        size=target,
+        original_bytes=len(image_data),
+        original_tokens=estimate_tokens(original_size, "high", model),
+        tokens=estimate_tokens(target, detail, model),
+    )
+
+
+def vision_size(size: Tuple[int, int], detail: str = "high") -> Tuple[int, int]:
+    """The largest size the API will actually look at for this detail level"""
+    width, height = size
+    if detail == "low":
+        scale = min(1.0, VISION_TILE_SIDE / max(width, height))
+        return _scaled(size, scale)
+
+    width, height = _api_size(size)
+
+    # A side just past a tile boundary costs a whole extra row of tiles
+    trims = [
+        (side // VISION_TILE_SIDE) * VISION_TILE_SIDE / side
+        for side in (width, height)
+        if side > VISION_TILE_SIDE and side % VISION_TILE_SIDE
+    ]
+    trim = max(trims, default=1.0)
+    if trim >= 1 - VISION_TILE_SLACK:
+        width, height = _scaled((width, height), trim)
+    return width, height
+
+
+def estimate_tokens(size: Tuple[int, int], detail: str, model: str) -> int:
+    base, per_tile = next(
+        costs for prefix, costs in VISION_TOKEN_COSTS if model.startswith(prefix)
+    )
+    if detail == "low":
+        return base
+    width, height = _api_size(size)
+    tiles = math.ceil(width / VISION_TILE_SIDE) * math.ceil(height / VISION_TILE_SIDE)
+    return base + per_tile * tiles
+
+
+def _api_size(size: Tuple[int, int]) -> Tuple[int, int]:
+    """What the API scales a detail "high" image to before tiling it"""
+    width, height = size
+    scale = min(1.0, VISION_MAX_SIDE / max(width, height))
+    if min(width, height) * scale > VISION_SHORT_SIDE:
+        scale = VISION_SHORT_SIDE / min(width, height)
+    return _scaled(size, scale)
+
+
+def _scaled(size: Tuple[int, int], scale: float) -> Tuple[int, int]:
+    if scale >= 1.0:
+        return size
+    # floor, so scaling onto a tile boundary never lands one pixel past it
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+
+def _encode(image: Image.Image, image_format: str, quality: int) -> Tuple[bytes, str]:
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    if image_format == "webp":
+        image.save(buffer, format="WEBP", quality=quality, method=4)
+        return buffer.getvalue(), "image/webp"
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue(), "image/jpeg"
+
+
+def _oriented_size(image: Image.Image) -> Tuple[int, int]:
+    width, height = image.size
+    if image.getexif().get(0x0112) in (5, 6, 7, 8):
+        return height, width
+    return width, height
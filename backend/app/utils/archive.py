@@ -0,0 +1,148 @@
+"""
+Incremental parsing of recipe archives (NDJSON or a JSON array of objects).
+
+Records are decoded as the upload arrives, so an archive never has to be held
+in memory whole. Each record is yielded with its 0-based position; a record
+that cannot be decoded is yielded as a ValueError so the caller can report it
+and carry on.
+"""
+
+import codecs
+import json
+import zlib
+from typing import AsyncIterator, Tuple, Union
+
+# A single record larger than this is rejected rather than buffered
+MAX_RECORD_BYTES = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+ArchiveRecord = Tuple[int, Union[dict, ValueError]]
+
+
+async def gunzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Decompress a gzip byte stream as it arrives"""
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+
+async def iter_archive_records(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[ArchiveRecord]:
+    """
+    Yield (index, record) for each object in an NDJSON or JSON array upload.
+
+    The format is detected from the first non-whitespace character ("[" means
+    a JSON array). Malformed NDJSON lines are reported individually; a
+    malformed JSON array cannot be resynchronised, so parsing stops with a
+    ValueError for the remainder.
+    """
+    iterator = chunks.__aiter__()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    pos = 0
+    has_more = True
+
+    async def read_more() -> None:
+        """Drop the consumed part of the buffer and append the next chunk of text"""
+        nonlocal buffer, pos, has_more
+        buffer = buffer[pos:]
+        pos = 0
+        while True:
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                buffer += text_decoder.decode(b"", final=True)
+                has_more = False
+                return
+            text = text_decoder.decode(chunk)
+            if text:
+                buffer += text
+                return
+
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        if pos < len(buffer):
+            break
+        if not has_more:
+            return
+        await read_more()
+
+    index = 0
+    if buffer[pos] != "[":
+        while True:
+            newline = buffer.find("\n", pos)
+            if newline == -1 and has_more:
+                if len(buffer) - pos > MAX_RECORD_BYTES:
+                    yield index, ValueError("Record is too large")
+                    return
+                await read_more()
+                continue
+            line_end = len(buffer) if newline == -1 else newline
+            line = buffer[pos:line_end]
+            pos = line_end + 1
+            if line.strip():
+                yield index, _parse_record(line)
+                index += 1
+            if pos >= len(buffer) and not has_more:
+                return
+
+    # JSON array: decode one element at a time
+    pos += 1
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        if buffer.startswith(",", pos):
+            pos = _skip_whitespace(buffer, pos + 1)
+        if pos == len(buffer):
+            if not has_more:
+                yield index, ValueError("Archive ended before the closing ]")
+                return
+            await read_more()
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if has_more and len(buffer) - pos <= MAX_RECORD_BYTES:
+                # Most likely the element is split across chunks
+                await read_more()
+                continue
+            yield index, ValueError(
+                "Record is too large" if has_more else f"Invalid JSON: {e.msg}"
+            )
+            return
+        if end == len(buffer) and has_more:
+            # A number or literal at the very end may continue in the next chunk
+            await read_more()
+            continue
+        pos = end
+        yield index, (
+            value
+            if isinstance(value, dict)
+            else ValueError("Record must be a JSON object")
+        )
+        index += 1
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _parse_record(line: str) -> Union[dict, ValueError]:
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError as e:
+        return ValueError(f"Invalid JSON: {e.msg}")
+    if not isinstance(value, dict):
+        return ValueError("Record must be a JSON object")
+    return value
@@ -1,3 +1,85 @@
 # Helper functions
-# TODO: Implement helper utilities
+import base64
+import gc
+import hashlib
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Tuple, Union
+from uuid import UUID
 
+
+def encode_cursor(updated_at: str, recipe_id: str) -> str:
+    """Encode a keyset position (updated_at, id) as an opaque URL-safe cursor"""
+    raw = json.dumps([updated_at, recipe_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by encode_cursor, raising ValueError if malformed.
+
+    Cursors come from clients and end up inside PostgREST filter strings, so
+    both parts are parsed (timestamp, UUID) and returned in canonical form.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, recipe_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at).isoformat(), str(UUID(recipe_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def encode_sync_cursor(change_seq: int) -> str:
+    """Encode a position in a user's change log as an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(f"seq:{change_seq}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_sync_cursor, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, change_seq = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        if prefix != "seq":
+            raise ValueError(prefix)
+        return int(change_seq)
+    except Exception:
+        raise ValueError("Invalid sync cursor; pull again without `since`")
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag (quoted) from the given version components"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def recipe_etag(recipe_id, updated_at: Union[str, datetime]) -> str:
+    """ETag for a single recipe, derived from its updated_at timestamp"""
+    if isinstance(updated_at, str):
+        updated_at = datetime.fromisoformat(updated_at)
+    return make_etag(recipe_id, updated_at.isoformat())
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison, per RFC 9110)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+@contextmanager
+def gc_paused():
+    """
+    Suspend the cyclic garbage collector while building many objects at once.
+
+    Allocation-triggered collections otherwise rescan the young objects
+    repeatedly; none of them are garbage yet, so the pass is wasted work.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
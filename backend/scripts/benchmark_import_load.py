@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Load test: recipe CRUD latency while URL imports run in parallel.
+
+Runs the real FastAPI app in-process. --clients clients keep listing recipes
+(GET /api/v1/recipes/, backed by an in-memory Supabase stand-in) while
+--imports concurrent clients import recipes through POST /api/v1/parse-url.
+Recipe pages are served by a mock transport and OpenAI is replaced by a
+stand-in that takes --openai-ms per completion, either
+
+  before: blocking the event loop, like the synchronous OpenAI client did
+  after:  awaiting, like the shared AsyncOpenAI client
+
+CRUD latency is also measured with no imports running, as the baseline.
+
+Usage:
+    python scripts/benchmark_import_load.py [--clients 10] [--imports 8] [--openai-ms 2000] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Settings are required at import time; the benchmark never talks to Supabase or OpenAI
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench.bench.bench")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+import httpx  # noqa: E402
+from benchmark_recipe_service import USER_ID, FakeSupabase, make_recipe_row  # noqa: E402
+from app.main import app  # noqa: E402
+from app.api.routes.recipes import get_recipe_service  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.dependencies import get_current_user  # noqa: E402
+from app.core.openai_client import OpenAIClient  # noqa: E402
+from app.services.recipe_service import RecipeService  # noqa: E402
+from app.services.registry import ServiceRegistry, get_service_registry  # noqa: E402
+from app.services.url_parser_service import URLParserService  # noqa: E402
+
+RECIPE_PAGE = "<html><body><h1>Tomato soup</h1><p>2 cups tomatoes. Simmer for 20 minutes.</p></body></html>"
+COMPLETION = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({
+    "title": "Tomato soup",
+    "ingredients": [{"name": "tomatoes", "amount": 2, "unit": "cups", "order_index": 1}],
+    "steps": [{"description": "Simmer", "order_index": 1, "duration": 20}],
+})))])
+
+
+class BlockingOpenAI:
+    """The old behaviour: a synchronous client called from an async handler"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def chat_completion(self, **kwargs):
+        time.sleep(self.latency)
+        return COMPLETION
+
+
+class FakeAsyncOpenAI:
+    """AsyncOpenAI stand-in whose completions take `latency` seconds"""
+
+    def __init__(self, latency: float):
+        async def create(**kwargs):
+            await asyncio.sleep(latency)
+            return COMPLETION
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+def make_registry(openai_client) -> ServiceRegistry:
+    pages = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=RECIPE_PAGE)))
+    parser = URLParserService(http_client=pages)
+    parser.openai_extractor.client = openai_client
+    registry = ServiceRegistry(pages)
+    registry._services["url_parser"] = parser
+    return registry
+
+
+async def run_load(clients: int, imports: int, duration: float) -> list:
+    """CRUD latencies in ms, measured while `imports` clients import recipes"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        deadline = time.perf_counter() + duration
+        latencies = []
+
+        async def crud_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get("/api/v1/recipes/")
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        async def import_client():
+            while time.perf_counter() < deadline:
+                response = await client.post("/api/v1/parse-url/", json={"url": "https://recipes.example/soup"})
+                response.raise_for_status()
+
+        await asyncio.gather(*(crud_client() for _ in range(clients)), *(import_client() for _ in range(imports)))
+        return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"  {label:<28} {len(ordered):6d} req   p50 {statistics.median(ordered):8.1f} ms   "
+          f"p95 {p95:8.1f} ms   max {ordered[-1]:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--imports", type=int, default=8)
+    parser.add_argument("--openai-ms", type=float, default=2000.0)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated Supabase query latency")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    args = parser.parse_args()
+
+    fake = FakeSupabase([make_recipe_row(i) for i in range(20)], args.latency_ms / 1000)
+    app.dependency_overrides[get_current_user] = lambda: {"id": USER_ID, "email": "bench@example.com", "user_metadata": {}}
+    app.dependency_overrides[get_recipe_service] = lambda: RecipeService(fake)
+
+    openai_latency = args.openai_ms / 1000
+    print(f"GET /api/v1/recipes/ from {args.clients} clients for {args.duration:.0f}s per scenario; "
+          f"{args.imports} parallel imports, {args.openai_ms:.0f} ms per OpenAI call, "
+          f"OPENAI_MAX_CONCURRENCY={settings.openai_max_concurrency}")
+
+    report("no imports", asyncio.run(run_load(args.clients, 0, args.duration)))
+
+    app.dependency_overrides[get_service_registry] = lambda: make_registry(BlockingOpenAI(openai_latency))
+    report("before (blocking OpenAI)", asyncio.run(run_load(args.clients, args.imports, args.duration)))
+
+    async def run_async_openai():
+        openai_client = OpenAIClient(FakeAsyncOpenAI(openai_latency), settings.openai_max_concurrency)
+        app.dependency_overrides[get_service_registry] = lambda: make_registry(openai_client)
+        return await run_load(args.clients, args.imports, args.duration)
+
+    report("after  (AsyncOpenAI)", asyncio.run(run_async_openai()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON response encoding for large recipe lists.
+
+Renders --recipes assembled recipes with each JSON_RESPONSE_BACKEND encoder
+("stdlib" is FastAPI's default JSONResponse behaviour), both from Recipe
+models (what the recipe routes return) and from the plain dicts FastAPI
+produces for routes that return data through response_model. Each case runs
+in a fresh process, so peak memory (max RSS growth while encoding) is not
+skewed by earlier cases.
+
+Usage:
+    python scripts/benchmark_json_response.py [--recipes 1000] [--ingredients 15] [--steps 10] [--runs 5]
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Settings are required at import time; the benchmark never talks to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench.bench.bench")
+
+BACKENDS = ["stdlib", "pydantic", "orjson"]
+SHAPES = ["models", "dicts"]
+
+
+def run_case(backend: str, shape: str, args: argparse.Namespace, results) -> None:
+    from benchmark_recipe_transform import make_rows
+    from app.api.responses import build_json_encoder
+    from app.services.recipe_service import RecipeService
+
+    recipes = RecipeService(object(), cache=None)._transform_recipes(
+        make_rows(args.recipes, args.ingredients, args.steps)
+    )
+    content = recipes if shape == "models" else [recipe.model_dump(mode="json") for recipe in recipes]
+    encode = build_json_encoder(backend)
+    gc.collect()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    body = encode(content)
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    for _ in range(args.runs):
+        gc.collect()
+        start = time.perf_counter()
+        encode(content)
+        timings.append(time.perf_counter() - start)
+
+    # ru_maxrss is in kilobytes on Linux
+    results.put((min(timings) * 1000, (rss_peak - rss_before) / 1024, len(body) / 1024 / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--ingredients", type=int, default=15)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{args.recipes} recipes x {args.ingredients} ingredients x {args.steps} steps, best of {args.runs}")
+    print(f"  {'backend':<10} {'content':<8} {'encode':>10} {'peak mem':>12} {'body':>10}")
+    for shape in SHAPES:
+        for backend in BACKENDS:
+            results = context.Queue()
+            process = context.Process(target=run_case, args=(backend, shape, args, results))
+            process.start()
+            encode_ms, peak_mb, body_mb = results.get()
+            process.join()
+            print(f"  {backend:<10} {shape:<8} {encode_ms:7.1f} ms {peak_mb:9.1f} MiB {body_mb:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark Tesseract OCR throughput and event-loop responsiveness.
+
+OCRs --images images (rendered recipe text, or the files in --corpus) with
+--concurrency requests in flight, and compares:
+
+  before: pytesseract.image_to_string called on the event loop
+  after:  app.services.ocr_engine worker pool (OCR_WORKERS processes,
+          resident tesserocr engine when installed)
+
+While OCR runs, a ticker measures the longest event-loop stall, which is how
+long every other API request would have been frozen.
+
+Requires Tesseract (and optionally tesserocr) to be installed.
+
+Usage:
+    python scripts/benchmark_ocr.py [--images 16] [--concurrency 8] [--corpus DIR]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings are required at import time; the benchmark never talks to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench.bench.bench")
+
+from PIL import Image, ImageDraw  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services import ocr_engine  # noqa: E402
+
+RECIPE_LINES = [
+    "Lemon Ricotta Pancakes",
+    "Serves 4. Prep 10 minutes, cook 15 minutes.",
+    "1 1/2 cups all-purpose flour",
+    "2 tablespoons sugar",
+    "1 cup whole milk ricotta",
+    "3 large eggs, separated",
+    "Zest and juice of 1 lemon",
+    "Whisk the dry ingredients in a large bowl.",
+    "Fold the whipped egg whites into the batter.",
+    "Cook on a buttered griddle until golden, about 2 minutes per side.",
+]
+
+
+def render_page(index: int) -> bytes:
+    """A phone-photo-sized page of recipe text"""
+    image = Image.new("RGB", (3024, 4032), color=(250, 248, 240))
+    draw = ImageDraw.Draw(image)
+    for line_number, line in enumerate(RECIPE_LINES):
+        draw.text((200, 300 + line_number * 120), f"{line} ({index})", fill=(20, 20, 20), font_size=64)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def load_images(args: argparse.Namespace) -> List[bytes]:
+    if args.corpus:
+        paths = sorted(p for p in Path(args.corpus).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp"})
+        return [p.read_bytes() for p in paths[:args.images]]
+    return [render_page(i) for i in range(args.images)]
+
+
+async def recognize_inline(image_data: bytes) -> str:
+    """The old behaviour: Tesseract called directly from the async handler"""
+    import pytesseract
+    if settings.tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = settings.tesseract_cmd
+    return pytesseract.image_to_string(Image.open(io.BytesIO(image_data)))
+
+
+async def run(recognize, images: List[bytes], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stall = max(stall, time.perf_counter() - start - 0.01)
+
+    async def one(image_data):
+        async with semaphore:
+            return await recognize(image_data)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(one(image) for image in images))
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker_task
+    return len(images) / elapsed, stall * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--corpus", help="directory of photos to OCR instead of rendered pages")
+    args = parser.parse_args()
+
+    images = load_images(args)
+    engine = "tesserocr (resident)" if ocr_engine.TESSEROCR_AVAILABLE else "pytesseract"
+    print(f"{len(images)} images, {args.concurrency} in flight, "
+          f"OCR_WORKERS={settings.ocr_workers or os.cpu_count()}, engine: {engine}")
+
+    before = asyncio.run(run(recognize_inline, images, args.concurrency))
+
+    async def run_pool():
+        # Start the workers (and load their engines) before timing
+        await asyncio.gather(*(ocr_engine.recognize_text(images[0]) for _ in range(settings.ocr_workers or 1)))
+        return await run(ocr_engine.recognize_text, images, args.concurrency)
+
+    after = asyncio.run(run_pool())
+    ocr_engine.shutdown_ocr_executor()
+
+    print(f"  {'':<28} {'throughput':>14} {'max loop stall':>16}")
+    print(f"  {'before (on the event loop)':<28} {before[0]:8.2f} img/s {before[1]:12.0f} ms")
+    print(f"  {'after  (worker pool)':<28} {after[0]:8.2f} img/s {after[1]:12.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark recipe API throughput under concurrent load.
+
+Runs the real FastAPI app against an in-memory Supabase stand-in whose
+queries block for a fixed latency (like a PostgREST round trip), and
+compares requests/sec when queries run inline on the event loop ("before")
+against the thread-pool query layer ("after").
+
+Usage:
+    python scripts/benchmark_recipe_service.py [--clients 50] [--requests 500] [--latency-ms 40]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings are required at import time; the benchmark never talks to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench.bench.bench")
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.core.dependencies import get_current_user  # noqa: E402
+from app.api.routes.recipes import get_recipe_service  # noqa: E402
+from app.services import recipe_service as recipe_service_module  # noqa: E402
+from app.services.recipe_service import RecipeService  # noqa: E402
+
+USER_ID = str(uuid.uuid4())
+
+
+def make_recipe_row(index: int) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    recipe_id = str(uuid.uuid4())
+    return {
+        "id": recipe_id,
+        "user_id": USER_ID,
+        "title": f"Recipe {index}",
+        "description": "Benchmark recipe",
+        "prep_time": 10,
+        "cook_time": 20,
+        "servings": 4,
+        "difficulty": "easy",
+        "cuisine_type": "Italian",
+        "image_url": None,
+        "source_url": None,
+        "notes": None,
+        "created_at": now,
+        "updated_at": now,
+        "synced_at": None,
+        "ingredients": [
+            {
+                "id": str(uuid.uuid4()),
+                "recipe_id": recipe_id,
+                "name": f"Ingredient {i}",
+                "amount": 1.0,
+                "unit": "cup",
+                "notes": None,
+                "order_index": i,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(5)
+        ],
+        "steps": [
+            {
+                "id": str(uuid.uuid4()),
+                "recipe_id": recipe_id,
+                "description": f"Step {i}",
+                "order_index": i,
+                "duration": None,
+                "temperature": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(5)
+        ],
+        "recipe_tags": [],
+        "attachments": [],
+    }
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Chainable stand-in for a PostgREST builder; execute() blocks like real I/O"""
+
+    def __init__(self, rows: list, latency: float):
+        self.rows = rows
+        self.latency = latency
+        self.is_single = False
+
+    def __getattr__(self, name):
+        def chain(*args, **kwargs):
+            if name == "single":
+                self.is_single = True
+            return self
+        return chain
+
+    def execute(self):
+        time.sleep(self.latency)
+        return FakeResponse(self.rows[0] if self.is_single else self.rows)
+
+
+class FakeSupabase:
+    def __init__(self, rows: list, latency: float):
+        self.rows = rows
+        self.latency = latency
+
+    def table(self, name: str) -> FakeQuery:
+        if name == "recipe_list_versions":
+            return FakeQuery([{"version": 1}], self.latency)
+        return FakeQuery(self.rows, self.latency)
+
+
+async def run_inline(query):
+    """The pre-thread-pool behaviour: execute() directly on the event loop"""
+    return query.execute()
+
+
+async def run_load(clients: int, total: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(total):
+            queue.put_nowait(i)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                response = await client.get("/api/v1/recipes/")
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    fake = FakeSupabase([make_recipe_row(i) for i in range(20)], args.latency_ms / 1000)
+    app.dependency_overrides[get_current_user] = lambda: {"id": USER_ID, "email": "bench@example.com", "user_metadata": {}}
+    app.dependency_overrides[get_recipe_service] = lambda: RecipeService(fake)
+
+    print(f"GET /api/v1/recipes/ x {args.requests}, {args.clients} concurrent clients, "
+          f"{args.latency_ms:.0f} ms simulated query latency")
+
+    threaded_run_query = recipe_service_module.run_query
+    recipe_service_module.run_query = run_inline
+    before = asyncio.run(run_load(args.clients, args.requests))
+    recipe_service_module.run_query = threaded_run_query
+    after = asyncio.run(run_load(args.clients, args.requests))
+
+    print(f"  before (inline execute): {before:8.1f} req/s")
+    print(f"  after  (thread pool):    {after:8.1f} req/s")
+    print(f"  speedup:                 {after / before:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark turning database rows into a JSON recipe list response.
+
+Builds --recipes recipe rows (each with --ingredients ingredients and --steps
+steps, shaped like PostgREST returns them) and times two pipelines:
+
+  before: per-object model construction, then FastAPI's response_model
+          re-validation, serialization and JSONResponse rendering
+  after:  one bulk TypeAdapter validation (RecipeService._transform_recipes)
+          rendered directly by FastJSONResponse
+
+Usage:
+    python scripts/benchmark_recipe_transform.py [--recipes 1000] [--ingredients 15] [--steps 10] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings are required at import time; the benchmark never talks to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench.bench.bench")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from app.api.responses import FastJSONResponse  # noqa: E402
+from app.models.recipe import Recipe, Ingredient, Step, Tag, Attachment  # noqa: E402
+from app.services.recipe_service import RecipeService  # noqa: E402
+
+
+def make_rows(count: int, ingredients: int, steps: int) -> List[dict]:
+    now = datetime.now(timezone.utc).isoformat()
+    user_id = str(uuid.uuid4())
+    rows = []
+    for index in range(count):
+        recipe_id = str(uuid.uuid4())
+        rows.append({
+            "id": recipe_id,
+            "user_id": user_id,
+            "title": f"Recipe {index}",
+            "description": "Benchmark recipe",
+            "prep_time": 10,
+            "cook_time": 20,
+            "total_time": 30,
+            "servings": 4,
+            "difficulty": "easy",
+            "cuisine_type": "Italian",
+            "image_url": None,
+            "source_url": None,
+            "notes": None,
+            "created_at": now,
+            "updated_at": now,
+            "synced_at": None,
+            "ingredients": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "recipe_id": recipe_id,
+                    "name": f"Ingredient {i}",
+                    "amount": 1.5,
+                    "unit": "cup",
+                    "notes": None,
+                    "order_index": i,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(ingredients)
+            ],
+            "steps": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "recipe_id": recipe_id,
+                    "description": f"Step {i}: stir and simmer",
+                    "order_index": i,
+                    "duration": 5,
+                    "temperature": None,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(steps)
+            ],
+            "recipe_tags": [],
+            "attachments": [],
+        })
+    return rows
+
+
+def legacy_transform(data: dict) -> Recipe:
+    """RecipeService._transform_recipe as it was: one constructor call per nested object"""
+    tags = []
+    if "recipe_tags" in data and data["recipe_tags"]:
+        tags = [tag_data["tags"] for tag_data in data["recipe_tags"] if "tags" in tag_data]
+
+    return Recipe(
+        id=uuid.UUID(data["id"]),
+        user_id=uuid.UUID(data["user_id"]),
+        title=data["title"],
+        description=data.get("description"),
+        prep_time=data.get("prep_time"),
+        cook_time=data.get("cook_time"),
+        servings=data.get("servings"),
+        difficulty=data.get("difficulty"),
+        cuisine_type=data.get("cuisine_type"),
+        image_url=data.get("image_url"),
+        source_url=data.get("source_url"),
+        notes=data.get("notes"),
+        created_at=data["created_at"],
+        updated_at=data["updated_at"],
+        synced_at=data.get("synced_at"),
+        ingredients=[Ingredient(**ing) for ing in data.get("ingredients", [])],
+        steps=[Step(**step) for step in data.get("steps", [])],
+        tags=[Tag(**tag) for tag in tags],
+        attachments=[Attachment(**att) for att in data.get("attachments", [])] if "attachments" in data else [],
+    )
+
+
+def best_of(runs: int, func) -> float:
+    timings = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--ingredients", type=int, default=15)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.recipes, args.ingredients, args.steps)
+    service = RecipeService(object(), cache=None)
+    field = create_response_field(name="Response_get_recipes", type_=List[Recipe])
+
+    def before_build():
+        return [legacy_transform(row) for row in rows]
+
+    def before_serialize(recipes):
+        content = asyncio.run(serialize_response(field=field, response_content=recipes))
+        return JSONResponse(content).body
+
+    def after_build():
+        return service._transform_recipes(rows)
+
+    def after_serialize(recipes):
+        return FastJSONResponse(recipes).body
+
+    legacy_recipes = before_build()
+    fast_recipes = after_build()
+    assert legacy_recipes == fast_recipes, "fast path must build identical models"
+
+    results = {
+        "before": (best_of(args.runs, before_build), best_of(args.runs, lambda: before_serialize(legacy_recipes))),
+        "after": (best_of(args.runs, after_build), best_of(args.runs, lambda: after_serialize(fast_recipes))),
+    }
+
+    print(f"{args.recipes} recipes x {args.ingredients} ingredients x {args.steps} steps, best of {args.runs}")
+    print(f"  {'':<8} {'build':>10} {'serialize':>12} {'total':>10}")
+    for label, (build, serialize) in results.items():
+        print(f"  {label:<8} {build:8.1f} ms {serialize:10.1f} ms {build + serialize:8.1f} ms")
+    before_total = sum(results["before"])
+    after_total = sum(results["after"])
+    print(f"  speedup: {before_total / after_total:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
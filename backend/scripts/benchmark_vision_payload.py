@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark OpenAI Vision payloads: bytes and estimated tokens per upload.
+
+For each image (typical uploads rendered here, or the files in --corpus),
+compares what used to be sent (the original upload, base64-encoded, detail
+left to the API) with app.services.vision_payload (resized to what the model
+sees, re-encoded, detail picked per image), and the time the preparation
+takes.
+
+Usage:
+    python scripts/benchmark_vision_payload.py [--corpus DIR] [--model gpt-4o] [--format jpeg|webp]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Settings are required at import time; the benchmark never talks to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench.bench.bench")
+
+from PIL import Image, ImageDraw  # noqa: E402
+from benchmark_ocr import RECIPE_LINES  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.vision_payload import prepare_vision_image  # noqa: E402
+
+
+def render(size: Tuple[int, int], image_format: str, font_size: int) -> bytes:
+    image = Image.new("RGB", size, color=(250, 248, 240))
+    draw = ImageDraw.Draw(image)
+    for line_number, line in enumerate(RECIPE_LINES * 3):
+        draw.text((font_size, font_size * (2 + line_number * 2)), line, fill=(20, 20, 20), font_size=font_size)
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **({"quality": 92} if image_format == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+def load_images(args: argparse.Namespace) -> List[Tuple[str, bytes]]:
+    if args.corpus:
+        paths = sorted(p for p in Path(args.corpus).iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp"})
+        return [(p.name, p.read_bytes()) for p in paths]
+    return [
+        ("phone photo 3024x4032 JPEG", render((3024, 4032), "JPEG", 64)),
+        ("phone screenshot 1170x2532 PNG", render((1170, 2532), "PNG", 40)),
+        ("desktop screenshot 2880x1800 PNG", render((2880, 1800), "PNG", 36)),
+        ("cropped card 480x360 PNG", render((480, 360), "PNG", 14)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of uploads instead of rendered images")
+    parser.add_argument("--model", default=settings.openai_vision_model)
+    parser.add_argument("--format", default=settings.openai_vision_format, choices=["jpeg", "webp"])
+    parser.add_argument("--quality", type=int, default=settings.openai_vision_quality)
+    args = parser.parse_args()
+
+    print(f"model {args.model}, {args.format} q{args.quality}")
+    print(f"  {'':<34} {'KB before':>10} {'KB after':>9} {'tokens before':>14} {'after':>7} {'detail':>7} {'ms':>6}")
+    for name, image_data in load_images(args):
+        start = time.perf_counter()
+        payload = prepare_vision_image(image_data, args.model, settings.openai_vision_detail, args.format, args.quality)
+        elapsed = (time.perf_counter() - start) * 1000
+        report = payload.report()
+        print(f"  {name[:34]:<34} {report['original_bytes'] / 1024:10.0f} {report['bytes'] / 1024:9.0f} "
+              f"{report['original_tokens']:14d} {report['tokens']:7d} {report['detail']:>7} {elapsed:6.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+from uuid import uuid4
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -24,3 +26,26 @@ def mock_user():
         "user_metadata": {}
     }
 
+
+def make_row():
+    """A recipe row as returned by RECIPE_DETAIL_SELECT"""
+    now = datetime.now(timezone.utc).isoformat()
+    recipe_id = str(uuid4())
+    return {
+        "id": recipe_id,
+        "user_id": str(uuid4()),
+        "title": "Soup",
+        "difficulty": "easy",
+        "total_time": 30,
+        "created_at": now,
+        "updated_at": now,
+        "ingredients": [
+            {
+                "id": str(uuid4()), "recipe_id": recipe_id, "name": "Leek", "amount": 2, "unit": None,
+                "notes": None, "order_index": 0, "created_at": now, "updated_at": now,
+            }
+        ],
+        "steps": [],
+        "recipe_tags": [{"tags": {"id": str(uuid4()), "name": "quick", "color": None, "created_at": now, "updated_at": now}}],
+        "attachments": [],
+    }
@@ -0,0 +1,125 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import JWTError, jwt
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.core.security import TokenCache, decode_access_token
+
+SECRET = "test-jwt-secret"
+USER_ID = "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11"
+
+
+def make_token(secret=SECRET, **overrides):
+    claims = {
+        "sub": USER_ID,
+        "email": "test@example.com",
+        "aud": "authenticated",
+        "iss": f"{settings.supabase_url.rstrip('/')}/auth/v1",
+        "exp": int(time.time()) + 3600,
+        "user_metadata": {"full_name": "Test User"},
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_jwt_secret", SECRET)
+    monkeypatch.setattr(settings, "auth_local_verification", True)
+
+
+async def test_valid_token_is_verified_locally(jwt_secret):
+    supabase = MagicMock()
+    user = await get_current_user(bearer(make_token()), supabase)
+    assert user == {
+        "id": USER_ID,
+        "email": "test@example.com",
+        "user_metadata": {"full_name": "Test User"},
+    }
+    supabase.auth.get_user.assert_not_called()
+
+
+@pytest.mark.parametrize("token", [
+    make_token(exp=int(time.time()) - 10),
+    make_token(aud="anon"),
+    make_token(iss="https://evil.example.com/auth/v1"),
+    make_token(secret="wrong-secret"),
+    "not-a-jwt",
+])
+async def test_invalid_tokens_are_rejected(jwt_secret, token):
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(bearer(token), MagicMock())
+    assert exc.value.status_code == 401
+
+
+async def test_unsupported_algorithm_is_rejected(jwt_secret):
+    token = jwt.encode({"sub": USER_ID}, SECRET, algorithm="HS512")
+    with pytest.raises(JWTError, match="Unsupported token algorithm"):
+        await decode_access_token(token)
+
+
+async def test_falls_back_to_remote_without_secret(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_jwt_secret", None)
+    supabase = MagicMock()
+    supabase.auth.get_user.return_value.user.id = USER_ID
+    supabase.auth.get_user.return_value.user.email = "test@example.com"
+    supabase.auth.get_user.return_value.user.user_metadata = {}
+    supabase.auth.get_user.return_value.error = None
+
+    user = await get_current_user(bearer(make_token()), supabase)
+    assert user["id"] == USER_ID
+    supabase.auth.get_user.assert_called_once()
+
+
+async def test_token_cache_coalesces_concurrent_misses():
+    cache = TokenCache(ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": USER_ID}
+
+    token = make_token()
+    results = await asyncio.gather(*(cache.get_or_fetch(token, fetch) for _ in range(10)))
+    assert all(result == {"id": USER_ID} for result in results)
+    assert len(calls) == 1
+
+    assert await cache.get_or_fetch(token, fetch) == {"id": USER_ID}
+    assert len(calls) == 1
+
+
+async def test_token_cache_expires_with_token(monkeypatch):
+    cache = TokenCache(ttl=3600)
+    now = time.time()
+    token = make_token(exp=int(now) + 5)
+
+    async def fetch():
+        return {"id": USER_ID}
+
+    await cache.get_or_fetch(token, fetch)
+    assert cache._entries[next(iter(cache._entries))][0] <= now + 5
+
+
+async def test_token_cache_does_not_cache_failures():
+    cache = TokenCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        raise HTTPException(status_code=401)
+
+    token = make_token()
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await cache.get_or_fetch(token, fetch)
+    assert len(calls) == 2
+    assert len(cache) == 0
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+import pytest
+from app.services.recipe_service import RecipeService
+from app.utils.helpers import decode_sync_cursor, encode_sync_cursor
+from tests.conftest import make_row
+
+
+def make_service(changes, expired=False):
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value = MagicMock(data={"changes": changes, "expired": expired})
+    return RecipeService(supabase, cache=None), supabase
+
+
+async def test_expired_cursor_asks_for_a_full_sync():
+    service, _ = make_service([], expired=True)
+
+    with pytest.raises(ValueError, match="expired"):
+        await service.get_changes(uuid4(), since=encode_sync_cursor(3))
+
+
+def change(seq, deleted=False):
+    row = make_row()
+    return {"id": row["id"], "seq": seq, "deleted": deleted, "recipe": None if deleted else row}
+
+
+async def test_changes_split_recipes_from_tombstones():
+    updated, deleted = change(5), change(6, deleted=True)
+    service, supabase = make_service([updated, deleted])
+
+    result = await service.get_changes(uuid4(), since=encode_sync_cursor(4), limit=10)
+
+    assert [str(recipe.id) for recipe in result.recipes] == [updated["id"]]
+    assert [str(recipe_id) for recipe_id in result.deleted_ids] == [deleted["id"]]
+    assert result.has_more is False
+    assert decode_sync_cursor(result.cursor) == 6
+    assert supabase.rpc.call_args.args[1]["p_since"] == 4
+
+
+async def test_extra_change_signals_another_page_and_is_not_returned():
+    service, supabase = make_service([change(1), change(2, deleted=True), change(3)])
+
+    result = await service.get_changes(uuid4(), limit=2)
+
+    assert result.has_more is True
+    assert len(result.recipes) == 1 and len(result.deleted_ids) == 1
+    # The next pull starts after the last change returned, not after the extra one
+    assert decode_sync_cursor(result.cursor) == 2
+    assert supabase.rpc.call_args.args[1]["p_since"] is None
+
+
+async def test_no_changes_keep_the_cursor():
+    service, _ = make_service([])
+    since = encode_sync_cursor(9)
+
+    result = await service.get_changes(uuid4(), since=since)
+
+    assert result.cursor == since
+    assert result.has_more is False
+    assert result.recipes == [] and result.deleted_ids == []
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+import pytest
+from app.db import session
+
+
+def make_query(execute):
+    query = MagicMock()
+    query.execute.side_effect = execute
+    return query
+
+
+async def test_run_query_overlaps_blocking_calls():
+    # Each call blocks until the other one is running too, so this only
+    # finishes if the queries run side by side on the pool
+    barrier = threading.Barrier(2, timeout=5)
+
+    def execute():
+        barrier.wait()
+        return threading.current_thread().name
+
+    threads = await asyncio.gather(
+        session.run_query(make_query(execute)),
+        session.run_query(make_query(execute)),
+    )
+
+    assert len(set(threads)) == 2
+    assert all(name.startswith("supabase-db") for name in threads)
+
+
+async def test_shutdown_db_executor_rebuilds_pool_on_next_query():
+    executor = session.get_db_executor()
+    session.shutdown_db_executor()
+
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+
+    result = await session.run_sync(lambda value: value, "ok")
+
+    assert result == "ok"
+    assert session.get_db_executor() is not executor
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+from postgrest.exceptions import APIError
+from app.models.recipe import RecipeCreate
+from app.services.recipe_service import EnsuredUsers, RecipeService
+from tests.conftest import make_row
+
+
+def make_service(known_users=None):
+    supabase = MagicMock()
+    return RecipeService(supabase, cache=None, known_users=known_users or EnsuredUsers()), supabase
+
+
+def rpc_names(supabase):
+    return [call.args[0] for call in supabase.rpc.call_args_list]
+
+
+async def test_user_is_ensured_once_per_process():
+    service, supabase = make_service()
+    user_id = uuid4()
+    supabase.rpc.return_value.execute.return_value = MagicMock(data=make_row())
+
+    await service.create_recipe(RecipeCreate(title="Soup"), user_id)
+    await service.create_recipe(RecipeCreate(title="Bread"), user_id)
+
+    assert rpc_names(supabase) == ["ensure_user", "create_recipe_full", "create_recipe_full"]
+    assert supabase.rpc.call_args_list[0].args[1] == {"p_user_id": str(user_id)}
+    supabase.table.assert_not_called()
+    supabase.auth.admin.get_user_by_id.assert_not_called()
+
+
+async def test_unknown_auth_user_is_not_remembered():
+    service, supabase = make_service()
+    user_id = uuid4()
+    supabase.rpc.return_value.execute.return_value = MagicMock(data=False)
+
+    await service._ensure_user_exists(user_id)
+    await service._ensure_user_exists(user_id)
+
+    assert rpc_names(supabase) == ["ensure_user", "ensure_user"]
+    assert user_id not in service.known_users
+
+
+async def test_stale_known_user_is_ensured_again_on_foreign_key_violation():
+    user_id = uuid4()
+    known_users = EnsuredUsers()
+    known_users.add(user_id)
+    service, supabase = make_service(known_users)
+    supabase.rpc.return_value.execute.side_effect = [
+        APIError({"message": "violates foreign key constraint", "code": "23503"}),
+        MagicMock(data=True),
+        MagicMock(data=make_row()),
+    ]
+
+    recipe = await service.create_recipe(RecipeCreate(title="Soup"), user_id)
+
+    assert recipe.title == "Soup"
+    assert rpc_names(supabase) == ["create_recipe_full", "ensure_user", "create_recipe_full"]
+    assert user_id in known_users
+
+
+def test_ensured_users_evicts_least_recently_used():
+    known_users = EnsuredUsers(max_entries=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    known_users.add(first)
+    known_users.add(second)
+    assert first in known_users
+
+    known_users.add(third)
+
+    assert first in known_users
+    assert second not in known_users
+    assert len(known_users) == 2
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.routes.recipes import get_recipe_service
+from app.core.dependencies import get_current_user
+from app.services.recipe_service import RecipeService
+from app.utils.helpers import etag_matches, make_etag, recipe_etag
+from tests.conftest import make_row
+
+USER_ID = uuid4()
+
+
+def test_recipe_etag_same_for_string_and_datetime():
+    recipe_id = "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11"
+    from_db = recipe_etag(recipe_id, "2024-05-01T12:30:00.27116+00:00")
+    from_model = recipe_etag(recipe_id, datetime(2024, 5, 1, 12, 30, 0, 271160, tzinfo=timezone.utc))
+    assert from_db == from_model
+    assert from_db.startswith('"') and from_db.endswith('"')
+
+
+def test_recipe_etag_changes_with_updated_at():
+    recipe_id = "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11"
+    assert recipe_etag(recipe_id, "2024-05-01T12:30:00+00:00") != recipe_etag(recipe_id, "2024-05-01T12:30:01+00:00")
+
+
+def test_etag_matches():
+    etag = make_etag("user", 3, "limit=20")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+
+
+def get(path, service, headers=None):
+    app.dependency_overrides[get_current_user] = lambda: {"id": str(USER_ID)}
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        return TestClient(app).get(path, headers=headers or {})
+    finally:
+        app.dependency_overrides.clear()
+
+
+def list_service(version, rows):
+    service = MagicMock()
+    service.get_list_version = AsyncMock(return_value=version)
+    service.get_recipes_page = AsyncMock(return_value=(rows, None))
+    return service
+
+
+def test_recipe_list_revalidates_with_304():
+    rows = [{"id": "1", "title": "Soup"}]
+    first = get("/api/v1/recipes/?limit=20", list_service(3, rows))
+    assert first.status_code == 200
+    assert first.json() == rows
+    etag = first.headers["ETag"]
+
+    service = list_service(3, rows)
+    unchanged = get("/api/v1/recipes/?limit=20", service, {"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+    # The version alone decides; the page is never loaded
+    service.get_recipes_page.assert_not_called()
+
+    # A write bumps the version
+    assert get("/api/v1/recipes/?limit=20", list_service(4, rows), {"If-None-Match": etag}).status_code == 200
+    # Another query is another representation
+    assert get("/api/v1/recipes/?limit=50", list_service(3, rows), {"If-None-Match": etag}).status_code == 200
+
+
+def test_recipe_revalidates_with_304_without_loading_it():
+    recipe = RecipeService(object(), cache=None)._transform_recipe(make_row())
+    service = MagicMock()
+    service.get_recipe_updated_at = AsyncMock(return_value=recipe.updated_at.isoformat())
+    service.get_recipe = AsyncMock(return_value=recipe)
+    path = f"/api/v1/recipes/{recipe.id}"
+
+    response = get(path, service, {"If-None-Match": recipe_etag(recipe.id, recipe.updated_at)})
+
+    assert response.status_code == 304
+    service.get_recipe.assert_not_called()
+    stale = get(path, service, {"If-None-Match": recipe_etag(recipe.id, "2024-04-01T00:00:00+00:00")})
+    assert stale.status_code == 200
+    assert stale.headers["ETag"] == response.headers["ETag"]
@@ -0,0 +1,56 @@
+import gzip
+import json
+from unittest.mock import MagicMock
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.routes import recipes as recipes_routes
+from app.api.routes.recipes import get_recipe_service
+from app.core.dependencies import get_current_user
+from app.services.recipe_service import RecipeService
+from tests.conftest import make_row
+
+
+def make_service(rows, page_size):
+    """RecipeService whose recipes table returns `rows` in pages of `page_size` (+1 lookahead)"""
+    pages = [rows[i:i + page_size + 1] for i in range(0, len(rows), page_size)]
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value.eq.return_value
+    query = query.order.return_value.order.return_value.limit.return_value
+    query.execute.side_effect = [MagicMock(data=page) for page in pages]
+    cursor_query = supabase.table.return_value.select.return_value.eq.return_value.or_.return_value
+    cursor_query.order.return_value.order.return_value.limit.return_value.execute = query.execute
+    return RecipeService(supabase, cache=None)
+
+
+def export(service, params):
+    app.dependency_overrides[get_current_user] = lambda: {"id": str(uuid4())}
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        return TestClient(app).get("/api/v1/recipes/export", params=params)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_export_streams_every_page_as_ndjson(monkeypatch):
+    monkeypatch.setattr(recipes_routes, "EXPORT_PAGE_SIZE", 2)
+    rows = [make_row() for _ in range(5)]
+
+    response = export(make_service(rows, page_size=2), {"format": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.content.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [row["id"] for row in rows]
+
+
+def test_export_gzip(monkeypatch):
+    monkeypatch.setattr(recipes_routes, "EXPORT_PAGE_SIZE", 2)
+    rows = [make_row() for _ in range(3)]
+
+    response = export(make_service(rows, page_size=2), {"compress": "gzip"})
+
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="recipe-vault-export.ndjson.gz"' in response.headers["content-disposition"]
+    lines = gzip.decompress(response.content).splitlines()
+    assert len(lines) == 3
@@ -0,0 +1,60 @@
+import asyncio
+import httpx
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import http_client as http_client_module
+from app.core.http_client import HostLimitedTransport, get_http_client
+from app.core.security import JWKSCache
+from app.services.instagram_parser_service import InstagramParserService
+
+
+async def test_host_limited_transport_caps_concurrency_per_host():
+    active = {"a.example": 0, "b.example": 0}
+    peak = {"a.example": 0, "b.example": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, text="ok")
+
+    transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=2)
+    async with httpx.AsyncClient(transport=transport) as client:
+        responses = await asyncio.gather(*[
+            client.get(f"https://{host}/recipe/{i}") for host in active for i in range(6)
+        ])
+
+    assert all(response.text == "ok" for response in responses)
+    assert peak == {"a.example": 2, "b.example": 2}
+    assert transport._hosts == {}
+
+
+async def test_fetchers_share_the_injected_client():
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        if request.url.path.endswith("jwks.json"):
+            return httpx.Response(200, json={"keys": [{"kid": "k1"}]})
+        return httpx.Response(200, text='<meta property="og:description" content="Pasta with basil">')
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        jwks = JWKSCache("https://project.supabase.co/auth/v1/.well-known/jwks.json", ttl=600, http_client=client)
+        instagram = InstagramParserService(http_client=client)
+
+        assert await jwks.get_key("k1") == {"kid": "k1"}
+        assert await instagram._fetch_instagram_description("https://www.instagram.com/p/abc/") == "Pasta with basil"
+
+    assert len(requested) == 2
+
+
+def test_lifespan_opens_and_closes_the_shared_client():
+    with TestClient(app):
+        client = get_http_client()
+        assert not client.is_closed
+        assert get_http_client() is client
+
+    assert client.is_closed
+    assert http_client_module._http_client is None
@@ -0,0 +1,174 @@
+import gzip
+import json
+import zlib
+from unittest.mock import MagicMock
+from uuid import uuid4
+import httpx
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+from app.main import app
+from app.api.routes.recipes import get_recipe_service
+from app.core.dependencies import get_current_user
+from app.services.recipe_service import EnsuredUsers, RecipeService
+from app.utils.archive import iter_archive_records
+from tests.conftest import make_row
+
+USER_ID = uuid4()
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(data: bytes, size: int = 7):
+    return [record async for record in iter_archive_records(chunked(data, size))]
+
+
+def make_service(rpc_side_effect=None):
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.side_effect = rpc_side_effect
+    known_users = EnsuredUsers()
+    known_users.add(USER_ID)
+    return RecipeService(supabase, cache=None, known_users=known_users)
+
+
+def rpc_payloads(service):
+    return [call.args[1]["p_recipes"] for call in service.supabase.rpc.call_args_list]
+
+
+async def test_parses_json_array_split_across_chunks():
+    records = [{"title": f"Recipe {i}", "notes": "a, b ] {c}"} for i in range(5)]
+
+    parsed = await collect(json.dumps(records, indent=2).encode())
+
+    assert parsed == list(enumerate(records))
+
+
+async def test_reports_bad_ndjson_lines_and_keeps_going():
+    data = b'{"title": "One"}\nnot json\n\n[1, 2]\n{"title": "Two"}'
+
+    parsed = await collect(data, size=3)
+
+    assert [index for index, _ in parsed] == [0, 1, 2, 3]
+    assert parsed[0][1] == {"title": "One"}
+    assert isinstance(parsed[1][1], ValueError)
+    assert isinstance(parsed[2][1], ValueError)
+    assert parsed[3][1] == {"title": "Two"}
+
+
+async def test_truncated_json_array_is_reported():
+    parsed = await collect(b'[{"title": "One"}, {"title": "Tw')
+
+    assert parsed[0] == (0, {"title": "One"})
+    assert isinstance(parsed[1][1], ValueError)
+
+
+async def test_import_batches_records_and_reports_invalid_ones():
+    service = make_service()
+
+    async def records():
+        yield 0, {"title": "Soup", "tags": ["quick", {"name": "vegan"}], "ingredients": [{"name": "leek"}]}
+        yield 1, ValueError("Invalid JSON: Expecting value")
+        yield 2, {"description": "no title"}
+        yield 3, {"title": "Bread", "steps": [{"description": "Knead"}, {"description": "Bake"}]}
+        yield 4, {"title": "Salad"}
+
+    result = await service.import_recipes(records(), USER_ID, batch_size=2)
+
+    assert result.imported == 3
+    assert [(error.index, error.title) for error in result.errors] == [(1, None), (2, None)]
+    batches = rpc_payloads(service)
+    assert [[recipe["title"] for recipe in batch] for batch in batches] == [["Soup"], ["Bread", "Salad"]]
+    assert batches[0][0]["tags"] == ["quick", "vegan"]
+    assert batches[0][0]["ingredients"][0]["order_index"] == 0
+    assert [step["order_index"] for step in batches[1][0]["steps"]] == [0, 1]
+
+
+async def test_failed_batch_is_retried_record_by_record():
+    error = APIError({"message": "value too long", "code": "22001"})
+    service = make_service([error, MagicMock(data=[]), error])
+
+    async def records():
+        yield 0, {"title": "Good"}
+        yield 1, {"title": "Bad"}
+
+    result = await service.import_recipes(records(), USER_ID)
+
+    assert result.imported == 1
+    assert [(e.index, e.title, e.error) for e in result.errors] == [(1, "Bad", "value too long")]
+    assert [len(batch) for batch in rpc_payloads(service)] == [2, 1, 1]
+
+
+async def test_corrupt_stream_keeps_the_batches_already_imported():
+    service = make_service()
+
+    async def records():
+        for index in range(3):
+            yield index, {"title": f"Recipe {index}"}
+        raise zlib.error("invalid block type")
+
+    result = await service.import_recipes(records(), USER_ID, batch_size=2)
+
+    assert result.imported == 2
+    assert result.failed == 1
+    # Recipe 2 was parsed but its batch was never written
+    assert result.errors[0].index == 2
+    assert "invalid block type" in result.errors[0].error
+
+
+async def test_unreachable_database_stops_the_import_with_a_partial_count():
+    service = make_service([MagicMock(data=[]), httpx.ConnectError("connection refused")])
+
+    async def records():
+        for index in range(5):
+            yield index, {"title": f"Recipe {index}"}
+
+    result = await service.import_recipes(records(), USER_ID, batch_size=2)
+
+    assert result.imported == 2
+    assert [(e.index, e.title) for e in result.errors] == [(2, None)]
+    assert "connection refused" in result.errors[0].error
+    assert len(rpc_payloads(service)) == 2
+
+
+def test_import_route_accepts_gzipped_export():
+    service = make_service()
+    archive = "".join(json.dumps(make_row() | {"tags": []}, default=str) + "\n" for _ in range(3))
+
+    app.dependency_overrides[get_current_user] = lambda: {"id": str(USER_ID)}
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        response = TestClient(app).post(
+            "/api/v1/recipes/import",
+            content=gzip.compress(archive.encode()),
+            headers={"Content-Type": "application/gzip"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+    assert len(rpc_payloads(service)[0]) == 3
+
+
+def test_import_route_reports_a_corrupt_gzip_body():
+    service = make_service()
+    compressed = gzip.compress(b'{"title": "Soup"}\n' * 10)
+
+    app.dependency_overrides[get_current_user] = lambda: {"id": str(USER_ID)}
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        response = TestClient(app).post(
+            "/api/v1/recipes/import",
+            content=compressed[:10] + b"garbage" + compressed[17:],
+            headers={"Content-Type": "application/gzip"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["imported"] == 0
+    assert body["errors"][0]["index"] == 0
+    assert body["errors"][0]["error"].startswith("Import stopped")
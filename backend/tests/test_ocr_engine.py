@@ -0,0 +1,132 @@
+import io
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from PIL import Image
+from app.services import ocr_engine
+from app.services.ocr_engine import OCRTimeoutError, OCRUnavailableError
+
+
+class FakeEngine:
+    """tesserocr.PyTessBaseAPI stand-in"""
+
+    def __init__(self, finishes: bool):
+        self.finishes = finishes
+        self.images = []
+        self.timeouts = []
+
+    def SetImage(self, image):
+        self.images.append(image.size)
+
+    def Recognize(self, timeout=0):
+        self.timeouts.append(timeout)
+        return self.finishes
+
+    def GetUTF8Text(self):
+        return "2 cups flour\n"
+
+
+def png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("L", (40, 20), color=255).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_resident_engine_is_reused_with_a_deadline(monkeypatch):
+    engine = FakeEngine(finishes=True)
+    monkeypatch.setattr(ocr_engine, "_engine", engine)
+    monkeypatch.setattr(ocr_engine, "_timeout", 2.5)
+
+    assert ocr_engine._recognize(png_bytes()) == "2 cups flour\n"
+    assert ocr_engine._recognize(png_bytes()) == "2 cups flour\n"
+
+    assert engine.images == [(40, 20), (40, 20)]
+    assert engine.timeouts == [2500, 2500]
+
+
+def test_engine_deadline_raises_timeout(monkeypatch):
+    clock = iter([100.0, 101.0])
+    monkeypatch.setattr(ocr_engine.time, "monotonic", lambda: next(clock))
+    monkeypatch.setattr(ocr_engine, "_engine", FakeEngine(finishes=False))
+    monkeypatch.setattr(ocr_engine, "_timeout", 1.0)
+
+    with pytest.raises(OCRTimeoutError):
+        ocr_engine._recognize(png_bytes())
+
+
+def test_engine_failure_before_the_deadline_is_not_a_timeout(monkeypatch):
+    clock = iter([100.0, 100.2])
+    monkeypatch.setattr(ocr_engine.time, "monotonic", lambda: next(clock))
+    monkeypatch.setattr(ocr_engine, "_engine", FakeEngine(finishes=False))
+    monkeypatch.setattr(ocr_engine, "_timeout", 1.0)
+
+    with pytest.raises(RuntimeError, match="could not recognise"):
+        ocr_engine._recognize(png_bytes())
+
+
+class FakePool(Executor):
+    """ProcessPoolExecutor stand-in whose workers have died `crashes` times"""
+
+    built = []
+
+    def __init__(self, crashes, **kwargs):
+        self.crashes = crashes
+        self.shut_down = False
+        FakePool.built.append(self)
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.crashes:
+            future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def use_pools(monkeypatch, *crashes):
+    FakePool.built = []
+    pending = iter(crashes)
+    monkeypatch.setattr(ocr_engine, "_ocr_executor", None)
+    monkeypatch.setattr(ocr_engine, "ProcessPoolExecutor", lambda **kwargs: FakePool(next(pending), **kwargs))
+    monkeypatch.setattr(ocr_engine, "_recognize", lambda image_data: "2 cups flour\n")
+
+
+async def test_broken_pool_is_rebuilt_and_the_image_retried(monkeypatch):
+    use_pools(monkeypatch, True, False)
+
+    assert await ocr_engine.recognize_text(b"image") == "2 cups flour\n"
+
+    broken, rebuilt = FakePool.built
+    assert broken.shut_down and not rebuilt.shut_down
+    assert ocr_engine.get_ocr_executor() is rebuilt
+
+
+async def test_pool_that_breaks_again_is_reported_unavailable(monkeypatch):
+    use_pools(monkeypatch, True, True, False)
+
+    with pytest.raises(OCRUnavailableError):
+        await ocr_engine.recognize_text(b"image")
+
+    assert len(FakePool.built) == 2
+    # The next request starts from a fresh pool
+    assert await ocr_engine.recognize_text(b"image") == "2 cups flour\n"
+
+
+async def test_ocr_service_recognises_in_the_worker_pool(monkeypatch):
+    from app.services import ocr_service
+
+    async def fake_recognize_text(image_data):
+        assert image_data == b"image"
+        return "Pancakes\n2 cups flour"
+
+    monkeypatch.setattr(ocr_service, "check_engine", lambda: None)
+    monkeypatch.setattr(ocr_service, "recognize_text", fake_recognize_text)
+
+    service = ocr_service.OCRService(use_openai=False)
+    result = await service.process_image(b"image", use_openai_parsing=False)
+
+    assert result["text"] == "Pancakes\n2 cups flour"
+    assert result["recipe"]
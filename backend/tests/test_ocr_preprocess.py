@@ -0,0 +1,78 @@
+import io
+from PIL import Image, ImageChops, ImageDraw
+from app.services import ocr_engine
+from app.services.ocr_preprocess import binarize, estimate_skew, preprocess_for_ocr
+
+
+def text_page(size=(1200, 1600)) -> Image.Image:
+    page = Image.new("L", size, color=235)
+    draw = ImageDraw.Draw(page)
+    for line in range(12):
+        draw.text((100, 120 + line * 110), "2 cups flour, 1 tsp salt, 3 eggs", fill=30, font_size=48)
+    return page
+
+
+def test_exif_rotation_and_downscale():
+    photo = Image.new("RGB", (4000, 3000), color=(240, 230, 220))
+    exif = photo.getexif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    buffer = io.BytesIO()
+    photo.save(buffer, format="JPEG", exif=exif)
+
+    result = preprocess_for_ocr(Image.open(io.BytesIO(buffer.getvalue())), max_side=2000)
+
+    assert result.size == (1500, 2000)
+    assert result.mode == "L"
+
+
+def test_tesseract_gets_grayscale_not_a_thresholded_image():
+    page = text_page()
+    # A dark band much wider than any local threshold window, e.g. a bold heading bar
+    page.paste(40, (100, 20, 1100, 100))
+
+    result = preprocess_for_ocr(page)
+
+    assert result.mode == "L"
+    assert result.getpixel((600, 60)) == 40
+    assert len(set(result.tobytes())) > 2
+
+
+def test_binarize_keeps_text_under_uneven_lighting():
+    page = text_page()
+    # Light falls off from top to bottom; the bottom is darker than a global threshold
+    shadow = Image.linear_gradient("L").point(lambda v: 255 - v * 2 // 3).resize(page.size)
+    photo = ImageChops.multiply(page, shadow)
+    assert photo.crop((0, 1400, 1200, 1600)).getextrema()[1] < 128
+
+    binary = binarize(photo)
+
+    assert set(binary.tobytes()) <= {0, 255}
+    for top in (0, 800):
+        half = binary.crop((0, top, 1200, top + 800)).tobytes()
+        assert 0.005 < half.count(0) / len(half) < 0.2
+
+
+def test_estimate_skew_recovers_rotation():
+    tilted = text_page().rotate(3, fillcolor=235, expand=True)
+
+    assert abs(estimate_skew(tilted) + 3) <= 0.5
+
+
+def test_transparent_screenshot_becomes_white():
+    screenshot = Image.new("RGBA", (300, 200), (0, 0, 0, 0))
+    ImageDraw.Draw(screenshot).text((20, 80), "Pancakes", fill=(0, 0, 0, 255), font_size=40)
+
+    result = preprocess_for_ocr(screenshot)
+
+    assert result.getpixel((5, 5)) == 255
+    assert min(result.tobytes()) < 64
+
+
+def test_preprocessing_follows_settings(monkeypatch):
+    monkeypatch.setattr(ocr_engine.settings, "ocr_preprocess", True)
+    monkeypatch.setattr(ocr_engine.settings, "ocr_max_image_side", 1800)
+    monkeypatch.setattr(ocr_engine.settings, "ocr_deskew", True)
+    assert ocr_engine.preprocess_options() == {"max_side": 1800, "deskew": True}
+
+    monkeypatch.setattr(ocr_engine.settings, "ocr_preprocess", False)
+    assert ocr_engine.preprocess_options() is None
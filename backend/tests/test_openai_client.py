@@ -0,0 +1,56 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from app.core.openai_client import OpenAIClient
+from app.services.openai_recipe_extractor import OpenAIRecipeExtractor
+
+
+def make_completion(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_async_openai(latency: float, content: str = "{}"):
+    """AsyncOpenAI stand-in recording how many completions run at once"""
+    stats = {"active": 0, "peak": 0}
+
+    async def create(**kwargs):
+        stats["active"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        await asyncio.sleep(latency)
+        stats["active"] -= 1
+        return make_completion(content)
+
+    client = MagicMock()
+    client.chat.completions.create = create
+    return client, stats
+
+
+async def test_chat_completions_are_capped_per_process():
+    async_openai, stats = make_async_openai(latency=0.01)
+    client = OpenAIClient(async_openai, max_concurrency=3)
+
+    await asyncio.gather(*(client.chat_completion(model="m", messages=[]) for _ in range(10)))
+
+    assert stats["peak"] == 3
+
+
+async def test_extraction_does_not_block_the_event_loop():
+    recipe = {"title": "Soup", "ingredients": [], "steps": []}
+    async_openai, _ = make_async_openai(latency=0.2, content=json.dumps(recipe))
+    extractor = OpenAIRecipeExtractor(http_client=MagicMock(), openai_client=OpenAIClient(async_openai, 8))
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    result = await extractor._extract_recipe_with_openai("https://example.com/soup", "Soup recipe")
+    task.cancel()
+
+    assert result["title"] == "Soup"
+    assert ticks >= 10
@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+import pytest
+from app.services.recipe_service import RecipeService
+from app.utils.helpers import encode_cursor, decode_cursor, encode_sync_cursor, decode_sync_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2024-05-01T12:30:00.123456+00:00", "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11")
+    assert decode_cursor(cursor) == (
+        "2024-05-01T12:30:00.123456+00:00",
+        "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11",
+    )
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("2024-05-01T12:30:00+00:00", "abc")
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "e30"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("updated_at, recipe_id", [
+    ('2024-05-01T12:30:00+00:00",id.gt.0', "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11"),
+    ("2024-05-01T12:30:00+00:00", "abc),user_id.neq.x"),
+    (1714566600, "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11"),
+])
+def test_decode_cursor_rejects_values_that_are_not_a_timestamp_and_uuid(updated_at, recipe_id):
+    cursor = encode_cursor(updated_at, recipe_id)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_sync_cursor_round_trip_rejects_list_cursors():
+    assert decode_sync_cursor(encode_sync_cursor(42)) == 42
+    # A list cursor (or a timestamp cursor from before change sequences) is not a sync cursor
+    with pytest.raises(ValueError):
+        decode_sync_cursor(encode_cursor("2024-05-01T12:30:00+00:00", "5b1f0f4e-8d4a-4a53-9a57-0c2f3e0d9b11"))
+
+
+async def test_malformed_cursor_is_rejected_before_querying():
+    supabase = MagicMock()
+    service = RecipeService(supabase, cache=None)
+
+    with pytest.raises(ValueError):
+        await service.get_recipes_page(uuid4(), limit=10, cursor=encode_cursor("yesterday", "abc"))
+
+    supabase.table.return_value.select.return_value.eq.return_value.or_.assert_not_called()
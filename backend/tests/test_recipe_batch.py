@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import MagicMock
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+from app.main import app
+from app.api.routes.recipes import get_recipe_service
+from app.core.dependencies import get_current_user, get_current_user_remote
+from app.db.session import get_supabase
+from app.models.recipe import RecipeBatchOperation
+from app.services.recipe_service import RecipeService
+
+
+def make_service(rpc_data):
+    supabase = MagicMock()
+    supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [{"id": "user"}]
+    supabase.rpc.return_value.execute.return_value.data = rpc_data
+    return RecipeService(supabase), supabase
+
+
+async def test_apply_batch_validates_locally_and_keeps_order():
+    user_id = uuid4()
+    recipe_id = uuid4()
+    new_id = uuid4()
+    service, supabase = make_service([
+        {"local_id": "local_1", "id": str(new_id), "status": "created"},
+        {"local_id": "local_3", "id": str(recipe_id), "status": "deleted"},
+    ])
+
+    results = await service.apply_batch(
+        [
+            RecipeBatchOperation(op="create", local_id="local_1", recipe={"title": "Soup"}),
+            RecipeBatchOperation(op="create", local_id="local_2", recipe={"description": "no title"}),
+            RecipeBatchOperation(op="delete", local_id="local_3", id=recipe_id),
+            RecipeBatchOperation(op="update", local_id="local_4", recipe={"title": "missing id"}),
+        ],
+        user_id,
+    )
+
+    assert [r.local_id for r in results] == ["local_1", "local_2", "local_3", "local_4"]
+    assert [r.status for r in results] == ["created", "invalid", "deleted", "invalid"]
+    assert results[0].id == new_id
+
+    name, params = supabase.rpc.call_args.args
+    assert name == "apply_recipe_batch"
+    assert params["p_user_id"] == str(user_id)
+    assert [op["local_id"] for op in params["operations"]] == ["local_1", "local_3"]
+
+
+async def test_apply_batch_skips_rpc_when_nothing_valid():
+    service, supabase = make_service([])
+    results = await service.apply_batch(
+        [RecipeBatchOperation(op="delete", local_id="local_1")],
+        uuid4(),
+    )
+    assert results[0].status == "invalid"
+    supabase.rpc.assert_not_called()
+
+
+async def test_apply_batch_reports_missing_rpc_rows_as_errors():
+    recipe_id = uuid4()
+    service, _ = make_service([{"local_id": "local_1", "id": str(recipe_id), "status": "deleted"}])
+    results = await service.apply_batch(
+        [
+            RecipeBatchOperation(op="delete", local_id="local_1", id=recipe_id),
+            RecipeBatchOperation(op="delete", local_id="local_2", id=uuid4()),
+        ],
+        uuid4(),
+    )
+    assert [r.local_id for r in results] == ["local_1", "local_2"]
+    assert [r.status for r in results] == ["deleted", "error"]
+    assert results[1].error
+
+
+def post_batch(service, current_user_dependency):
+    # Supabase Auth no longer knows the session (signed out)
+    auth_client = MagicMock()
+    auth_client.auth.get_user.return_value.user = None
+    app.dependency_overrides[get_supabase] = lambda: auth_client
+    app.dependency_overrides[current_user_dependency] = lambda: {"id": str(uuid4())}
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        return TestClient(app, raise_server_exceptions=False).post(
+            "/api/v1/recipes/batch",
+            json={"operations": [{"op": "delete", "local_id": "local_1", "id": str(uuid4())}]},
+            headers={"Authorization": "Bearer token"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_batch_route_validates_the_session_remotely():
+    service, _ = make_service([{"local_id": "local_1", "status": "deleted"}])
+
+    assert post_batch(service, get_current_user_remote).status_code == 200
+    # A locally verified token alone is not enough for a request that can delete
+    assert post_batch(service, get_current_user).status_code == 401
+
+
+def test_batch_route_reports_database_failures_as_server_errors():
+    service, supabase = make_service([])
+    supabase.rpc.return_value.execute.side_effect = APIError({"message": "connection reset", "code": "08006"})
+
+    assert post_batch(service, get_current_user_remote).status_code == 500
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+from app.models.recipe import Recipe
+from app.services import recipe_cache as recipe_cache_module
+from app.services.recipe_cache import InMemoryCacheBackend, RecipeCache, RedisCacheBackend
+from app.services.recipe_service import RecipeService
+
+
+def make_recipe(user_id=None):
+    now = datetime.now(timezone.utc)
+    return Recipe(
+        id=uuid4(), user_id=user_id or uuid4(), title="Soup", created_at=now, updated_at=now
+    )
+
+
+class FakeRedis:
+    """Stand-in for a shared Redis store (redis.asyncio client)"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+async def test_hit_miss_counters():
+    cache = RecipeCache(InMemoryCacheBackend())
+    recipe = make_recipe()
+    assert await cache.get(recipe.id, recipe.user_id) is None
+    await cache.set(recipe)
+    assert await cache.get(recipe.id, recipe.user_id) is recipe
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_hit_miss_counters_are_exact_across_threads():
+    cache = RecipeCache(InMemoryCacheBackend())
+    recipe = make_recipe()
+    asyncio.run(cache.set(recipe))
+
+    async def lookups():
+        for _ in range(500):
+            await cache.get(recipe.id, recipe.user_id)
+            await cache.get(recipe.id, uuid4())
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(8):
+            pool.submit(asyncio.run, lookups())
+
+    assert cache.stats() == {"hits": 4000, "misses": 4000, "hit_ratio": 0.5}
+
+
+async def test_entries_are_scoped_per_user():
+    cache = RecipeCache(InMemoryCacheBackend())
+    recipe = make_recipe()
+    await cache.set(recipe)
+    assert await cache.get(recipe.id, uuid4()) is None
+
+
+async def test_lru_eviction():
+    backend = InMemoryCacheBackend(max_entries=2)
+    cache = RecipeCache(backend)
+    first, second, third = make_recipe(), make_recipe(), make_recipe()
+    await cache.set(first)
+    await cache.set(second)
+    await cache.get(first.id, first.user_id)  # first is now most recently used
+    await cache.set(third)
+    assert len(backend) == 2
+    assert await cache.get(second.id, second.user_id) is None
+    assert await cache.get(first.id, first.user_id) is first
+
+
+async def test_ttl_expiry(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(recipe_cache_module.time, "monotonic", lambda: clock[0])
+    cache = RecipeCache(InMemoryCacheBackend(), ttl=10)
+    recipe = make_recipe()
+    await cache.set(recipe)
+    clock[0] += 11
+    assert await cache.get(recipe.id, recipe.user_id) is None
+
+
+async def test_redis_backend_round_trip():
+    cache = RecipeCache(RedisCacheBackend(FakeRedis()))
+    recipe = make_recipe()
+    await cache.set(recipe)
+    assert await cache.get(recipe.id, recipe.user_id) == recipe
+    await cache.invalidate(recipe.id, recipe.user_id)
+    assert await cache.get(recipe.id, recipe.user_id) is None
+
+
+async def test_get_recipe_reads_through_and_delete_invalidates():
+    recipe = make_recipe()
+    row = recipe.model_dump(mode="json")
+    supabase = MagicMock()
+    select = supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value
+    select.execute.return_value.data = row
+    supabase.table.return_value.delete.return_value.eq.return_value.eq.return_value.execute.return_value.data = [row]
+    service = RecipeService(supabase, cache=RecipeCache(InMemoryCacheBackend()))
+
+    assert await service.get_recipe(recipe.id, recipe.user_id) == recipe
+    assert await service.get_recipe(recipe.id, recipe.user_id) == recipe
+    assert select.execute.call_count == 1
+
+    await service.delete_recipe(recipe.id, recipe.user_id)
+    assert await service.cache.get(recipe.id, recipe.user_id) is None
+
+
+def test_cache_none_disables_caching():
+    assert RecipeService(MagicMock(), cache=None).cache is None
+    assert RecipeService(MagicMock()).cache is recipe_cache_module.get_recipe_cache()
+
+
+async def test_etag_checks_skip_a_per_process_cache():
+    recipe = make_recipe()
+    updated_at = "2024-05-01T12:30:00+00:00"
+    supabase = MagicMock()
+    select = supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value
+    select.execute.return_value.data = [{"updated_at": updated_at}]
+
+    # Another worker may have updated the recipe since this process cached it
+    local = RecipeCache(InMemoryCacheBackend())
+    await local.set(recipe)
+    service = RecipeService(supabase, cache=local)
+    assert await service.get_recipe_updated_at(recipe.id, recipe.user_id) == updated_at
+    assert select.execute.call_count == 1
+
+    # Writes from every worker invalidate a shared cache, so it can answer
+    shared = RecipeCache(RedisCacheBackend(FakeRedis()))
+    await shared.set(recipe)
+    service = RecipeService(supabase, cache=shared)
+    assert await service.get_recipe_updated_at(recipe.id, recipe.user_id) == recipe.updated_at.isoformat()
+    assert select.execute.call_count == 1
@@ -0,0 +1,39 @@
+import json
+from uuid import UUID
+import pytest
+from app.api.responses import FastJSONResponse, build_json_encoder
+from app.models.recipe import Recipe
+from app.services.recipe_service import RecipeService
+from tests.conftest import make_row
+
+
+def test_transform_recipes_matches_single_transform():
+    service = RecipeService(object(), cache=None)
+    rows = [make_row(), make_row()]
+
+    recipes = service._transform_recipes(rows)
+
+    assert recipes == [service._transform_recipe(row) for row in rows]
+    assert isinstance(recipes[0], Recipe)
+    assert isinstance(recipes[0].ingredients[0].id, UUID)
+    assert [tag.name for tag in recipes[0].tags] == ["quick"]
+
+
+def test_fast_json_response_renders_models():
+    recipe = RecipeService(object(), cache=None)._transform_recipe(make_row())
+
+    response = FastJSONResponse([recipe], headers={"ETag": '"abc"'})
+
+    assert response.media_type == "application/json"
+    assert response.headers["ETag"] == '"abc"'
+    assert json.loads(response.body) == [recipe.model_dump(mode="json")]
+
+
+@pytest.mark.parametrize("backend", ["orjson", "pydantic", "stdlib"])
+def test_json_encoders_agree(backend):
+    recipe = RecipeService(object(), cache=None)._transform_recipe(make_row())
+    content = {"recipes": [recipe], "count": 1}
+
+    encoded = build_json_encoder(backend)(content)
+
+    assert json.loads(encoded) == {"recipes": [recipe.model_dump(mode="json")], "count": 1}
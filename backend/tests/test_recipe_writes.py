@@ -0,0 +1,80 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+import pytest
+from postgrest.exceptions import APIError
+from app.models.recipe import IngredientCreate, RecipeCreate, RecipeUpdate, StepCreate
+from app.services.recipe_service import EnsuredUsers, RecipeService
+from tests.conftest import make_row
+
+USER_ID = uuid4()
+
+
+def make_service(rpc_data=None):
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value = MagicMock(data=rpc_data or make_row())
+    known_users = EnsuredUsers()
+    known_users.add(USER_ID)
+    return RecipeService(supabase, cache=AsyncMock(), known_users=known_users), supabase
+
+
+async def test_create_recipe_is_one_rpc_with_the_full_document():
+    service, supabase = make_service()
+    tag_id = uuid4()
+
+    recipe = await service.create_recipe(
+        RecipeCreate(
+            title="Soup",
+            servings=4,
+            ingredients=[IngredientCreate(name="Leek", amount=2, order_index=0)],
+            steps=[StepCreate(description="Simmer", order_index=0, duration=20)],
+            tag_ids=[tag_id],
+        ),
+        USER_ID,
+    )
+
+    supabase.rpc.assert_called_once()
+    name, params = supabase.rpc.call_args.args
+    assert name == "create_recipe_full"
+    payload = params["payload"]
+    assert payload["user_id"] == str(USER_ID)
+    assert payload["title"] == "Soup"
+    assert payload["servings"] == 4
+    assert payload["ingredients"] == [{"name": "Leek", "amount": 2, "unit": None, "notes": None, "order_index": 0}]
+    assert payload["steps"] == [{"description": "Simmer", "order_index": 0, "duration": 20, "temperature": None}]
+    assert payload["tag_ids"] == [str(tag_id)]
+    supabase.table.assert_not_called()
+    service.cache.set.assert_awaited_once_with(recipe)
+
+
+async def test_update_recipe_sends_only_the_changed_fields():
+    service, supabase = make_service()
+    recipe_id = uuid4()
+
+    recipe = await service.update_recipe(recipe_id, RecipeUpdate(title="Leek soup", steps=[]), USER_ID)
+
+    name, params = supabase.rpc.call_args.args
+    assert name == "update_recipe_full"
+    assert params["p_recipe_id"] == str(recipe_id)
+    assert params["p_user_id"] == str(USER_ID)
+    # Omitted child lists stay untouched; an empty list clears them
+    assert params["payload"] == {"title": "Leek soup", "steps": []}
+    service.cache.set.assert_awaited_once_with(recipe)
+
+
+def test_update_payload_keeps_omitted_and_empty_child_lists_apart():
+    service, _ = make_service()
+    ingredient = IngredientCreate(name="Leek", order_index=0)
+
+    assert service._build_update_payload(RecipeUpdate()) == {}
+    assert service._build_update_payload(RecipeUpdate(ingredients=[], tag_ids=[])) == {"ingredients": [], "tag_ids": []}
+    assert service._build_update_payload(RecipeUpdate(ingredients=[ingredient]))["ingredients"] == [ingredient.model_dump()]
+
+
+async def test_update_missing_recipe_raises_not_found():
+    service, supabase = make_service()
+    supabase.rpc.return_value.execute.side_effect = APIError({"message": "recipe not found", "code": "P0002"})
+
+    with pytest.raises(ValueError, match="Recipe not found"):
+        await service.update_recipe(uuid4(), RecipeUpdate(title="Soup"), USER_ID)
+
+    service.cache.set.assert_not_awaited()
@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.routes.recipes import get_recipe_service
+from app.core.dependencies import get_current_user
+from app.models.recipe import RecipeFilters
+from app.services.recipe_service import RecipeService
+
+
+def make_document(user_id, title):
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid4()),
+        "user_id": str(user_id),
+        "title": title,
+        "created_at": now,
+        "updated_at": now,
+        "ingredients": [],
+        "steps": [],
+        "recipe_tags": [],
+        "attachments": [],
+    }
+
+
+def make_service(user_id, titles):
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value.data = {
+        "results": [{"rank": 1.0, "recipe": make_document(user_id, t)} for t in titles]
+    }
+    return RecipeService(supabase, cache=None), supabase
+
+
+async def test_search_recipes_pages_ranked_results():
+    user_id = uuid4()
+    service, supabase = make_service(user_id, ["Basil pesto", "Tomato basil soup", "Basil lemonade"])
+
+    recipes, has_more = await service.search_recipes("basil", user_id, limit=2, offset=4)
+
+    assert [r.title for r in recipes] == ["Basil pesto", "Tomato basil soup"]
+    assert has_more
+    supabase.rpc.assert_called_once_with(
+        "search_recipes",
+        {"p_user_id": str(user_id), "p_query": "basil", "p_limit": 2, "p_offset": 4, "p_filters": {}},
+    )
+
+
+def test_search_route_is_not_shadowed_by_recipe_id():
+    user_id = uuid4()
+    service, _ = make_service(user_id, ["Basil pesto"])
+    app.dependency_overrides[get_current_user] = lambda: {"id": str(user_id)}
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        response = TestClient(app).get("/api/v1/recipes/search", params={"q": "basil", "limit": 5})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [r["title"] for r in response.json()] == ["Basil pesto"]
+    assert "X-Next-Offset" not in response.headers
+
+
+async def test_search_recipes_fuzzy_and_prefix_modes():
+    user_id = uuid4()
+    service, supabase = make_service(user_id, ["Pasta with parmesan"])
+
+    recipes, has_more = await service.search_recipes("parmesean", user_id, mode="fuzzy")
+    assert [r.title for r in recipes] == ["Pasta with parmesan"]
+    assert not has_more
+    name, params = supabase.rpc.call_args.args
+    assert name == "search_recipes_fuzzy"
+    assert params["p_prefix"] is False
+    assert 0 < params["p_threshold"] <= 1
+
+    await service.search_recipes("parm", user_id, mode="prefix")
+    assert supabase.rpc.call_args.args[1]["p_prefix"] is True
+
+
+async def test_search_by_pantry_returns_coverage():
+    user_id = uuid4()
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value.data = {
+        "results": [
+            {
+                "matched": 2,
+                "required": 3,
+                "missing": 1,
+                "coverage": 2 / 3,
+                "missing_ingredients": ["cream"],
+                "recipe": make_document(user_id, "Tomato soup"),
+            }
+        ]
+    }
+    service = RecipeService(supabase, cache=None)
+
+    matches, has_more = await service.search_by_pantry(["tomatoes", "basil"], user_id, max_missing=1)
+
+    assert not has_more
+    assert matches[0].recipe.title == "Tomato soup"
+    assert (matches[0].matched, matches[0].missing, matches[0].missing_ingredients) == (2, 1, ["cream"])
+    name, params = supabase.rpc.call_args.args
+    assert name == "search_recipes_by_pantry"
+    assert params["p_ingredients"] == ["tomatoes", "basil"]
+    assert params["p_max_missing"] == 1
+
+
+async def test_search_passes_only_set_filters():
+    user_id = uuid4()
+    service, supabase = make_service(user_id, [])
+
+    await service.search_recipes(
+        "soup", user_id, filters=RecipeFilters(cuisine_types=["Italian"], tags=[], max_total_time=30)
+    )
+
+    assert supabase.rpc.call_args.args[1]["p_filters"] == {"cuisine_types": ["Italian"], "max_total_time": 30}
+
+
+def test_facets_route_parses_repeated_filters():
+    user_id = uuid4()
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value.data = {
+        "total": 2,
+        "cuisine_type": [{"value": "Italian", "count": 2}],
+        "difficulty": [{"value": "easy", "count": 1}, {"value": "hard", "count": 1}],
+        "tags": [],
+        "total_time": [{"max_total_time": 30, "count": 1}],
+    }
+    app.dependency_overrides[get_current_user] = lambda: {"id": str(user_id)}
+    app.dependency_overrides[get_recipe_service] = lambda: RecipeService(supabase, cache=None)
+    try:
+        response = TestClient(app).get(
+            "/api/v1/recipes/facets",
+            params=[("difficulty", "easy"), ("difficulty", "hard"), ("cuisine", "Italian")],
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+    name, params = supabase.rpc.call_args.args
+    assert name == "get_recipe_facets"
+    assert params["p_filters"] == {"cuisine_types": ["Italian"], "difficulties": ["easy", "hard"]}
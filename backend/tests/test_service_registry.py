@@ -0,0 +1,65 @@
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import registry
+from app.services.registry import ServiceRegistry, get_service_registry
+
+
+def make_registry(monkeypatch, factories):
+    monkeypatch.setattr(registry, "SERVICE_FACTORIES", factories)
+    services = ServiceRegistry(http_client=MagicMock())
+    services.start()
+    return services
+
+
+def post(services, path, **kwargs):
+    app.dependency_overrides[get_service_registry] = lambda: services
+    try:
+        return TestClient(app).post(path, **kwargs)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_services_are_built_once_and_reused(monkeypatch):
+    parser = MagicMock()
+    parser.parse_url = AsyncMock(return_value={"title": "Soup"})
+    factory = MagicMock(return_value=parser)
+    services = make_registry(monkeypatch, {"url_parser": factory})
+
+    for _ in range(3):
+        response = post(services, "/api/v1/parse-url", json={"url": "https://example.com/soup"})
+        assert response.status_code == 200
+        assert response.json() == {"title": "Soup"}
+
+    factory.assert_called_once_with(services.http_client)
+    assert parser.parse_url.await_count == 3
+
+
+def test_unavailable_service_reports_startup_error(monkeypatch):
+    def broken(http_client):
+        raise RuntimeError("Tesseract OCR is not installed")
+
+    services = make_registry(monkeypatch, {"ocr": broken, "url_parser": MagicMock()})
+
+    response = post(
+        services,
+        "/api/v1/ocr",
+        params={"method": "tesseract"},
+        files={"file": ("page.png", b"\x89PNG", "image/png")},
+    )
+
+    assert response.status_code == 503
+    assert "Tesseract OCR is not installed" in response.json()["detail"]
+    assert services.health() == {"ocr": "unavailable", "url_parser": "ok"}
+
+
+def test_unavailable_instagram_parser_is_503(monkeypatch):
+    def broken(http_client):
+        raise ImportError("instaloader is not installed")
+
+    services = make_registry(monkeypatch, {"instagram_parser": broken, "url_parser": MagicMock()})
+
+    response = post(services, "/api/v1/parse-url", json={"url": "https://www.instagram.com/p/abc123/"})
+
+    assert response.status_code == 503
+    assert "instaloader is not installed" in response.json()["detail"]
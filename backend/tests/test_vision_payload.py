@@ -0,0 +1,93 @@
+import base64
+import io
+import json
+from types import SimpleNamespace
+from PIL import Image, ImageDraw
+from app.services.vision_payload import estimate_tokens, prepare_vision_image, vision_size
+
+
+def encode(image: Image.Image, image_format: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **params)
+    return buffer.getvalue()
+
+
+def screenshot(size=(1170, 2532)) -> Image.Image:
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for top in range(40, size[1] - 60, 80):
+        draw.text((40, top), "2 cups flour, 1 tsp salt", fill=(0, 0, 0, 255), font_size=48)
+    return image
+
+
+def test_token_estimates_follow_the_tile_model():
+    assert estimate_tokens((1024, 1024), "high", "gpt-4o") == 85 + 170 * 4
+    assert estimate_tokens((3024, 4032), "high", "gpt-4o") == 85 + 170 * 4  # seen as 768x1024
+    assert estimate_tokens((2048, 4096), "high", "gpt-4o") == 85 + 170 * 6  # seen as 768x1536
+    assert estimate_tokens((3024, 4032), "low", "gpt-4o") == 85
+    assert estimate_tokens((1024, 1024), "high", "gpt-4o-mini") == 2833 + 5667 * 4
+
+
+def test_phone_photo_is_oriented_and_resized():
+    photo = Image.new("RGB", (4032, 3024), color=(200, 180, 150))
+    exif = photo.getexif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    image_data = encode(photo, "JPEG", quality=95, exif=exif)
+
+    payload = prepare_vision_image(image_data, "gpt-4o")
+
+    assert payload.size == (768, 1024)
+    assert Image.open(io.BytesIO(payload.data)).size == (768, 1024)
+    assert payload.mime_type == "image/jpeg"
+    assert payload.detail == "high"
+    assert payload.report()["bytes_saved"] > 0
+
+
+def test_tall_screenshot_is_trimmed_onto_the_tile_grid():
+    image_data = encode(screenshot(), "PNG")
+
+    payload = prepare_vision_image(image_data, "gpt-4o", image_format="webp")
+    report = payload.report()
+
+    # 768x1662 would be 2x4 tiles; 709x1536 is 2x3
+    assert vision_size((1170, 2532)) == (709, 1536)
+    assert payload.mime_type == "image/webp"
+    assert report["tokens"] == 85 + 170 * 6
+    assert report["tokens_saved"] == 170 * 2
+    assert report["bytes"] < report["original_bytes"]
+    # Transparency is flattened onto white, not black
+    assert Image.open(io.BytesIO(payload.data)).convert("RGB").getpixel((2, 2)) == (255, 255, 255)
+
+
+def test_small_image_is_sent_unchanged_at_low_detail():
+    image_data = encode(screenshot((400, 300)), "PNG", optimize=True)
+
+    payload = prepare_vision_image(image_data, "gpt-4o", quality=100)
+
+    assert payload.detail == "low"
+    assert payload.tokens == 85
+    assert payload.data == image_data
+    assert payload.mime_type == "image/png"
+
+
+async def test_vision_request_uses_the_optimized_payload():
+    from app.services.openai_ocr_service import OpenAIOCRService
+
+    requests = []
+
+    class FakeOpenAIClient:
+        async def chat_completion(self, **kwargs):
+            requests.append(kwargs)
+            content = json.dumps({"title": "Pancakes", "ingredients": [], "steps": []})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    service = OpenAIOCRService(openai_client=FakeOpenAIClient())
+    result = await service.extract_from_image_vision(encode(screenshot(), "PNG"))
+
+    image_url = requests[0]["messages"][1]["content"][1]["image_url"]
+    header, data = image_url["url"].split(",", 1)
+    assert header == "data:image/jpeg;base64"
+    assert Image.open(io.BytesIO(base64.b64decode(data))).size == (709, 1536)
+    assert image_url["detail"] == "high"
+    assert result["recipe"]["title"] == "Pancakes"
+    assert result["image"]["tokens_saved"] > 0
@@ -0,0 +1,127 @@
+-- Migration: commit-ordered change sequence for delta sync
+-- Databases created from an earlier schema.sql paged GET /recipes/changes by
+-- (updated_at, id). updated_at is NOW(), the transaction start time, so a write
+-- that committed after a client pulled could land behind the client's cursor
+-- and never sync. Recipes and tombstones now carry change_seq, numbered from
+-- the owner's recipe_list_versions row (see next_recipe_change_seq in schema.sql).
+-- Sync cursors issued before this migration are rejected; clients pull again
+-- from scratch.
+
+BEGIN;
+
+ALTER TABLE public.recipes ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE public.recipe_tombstones ADD COLUMN IF NOT EXISTS change_seq BIGINT;
+
+-- Number existing recipes and tombstones per user in their old (timestamp) order,
+-- after the user's current version
+CREATE TEMP TABLE numbered_changes ON COMMIT DROP AS
+SELECT
+    c.id,
+    c.deleted,
+    c.user_id,
+    COALESCE(v.version, 0) + row_number() OVER (PARTITION BY c.user_id ORDER BY c.changed_at, c.id) AS seq
+FROM (
+    SELECT id, user_id, updated_at AS changed_at, FALSE AS deleted FROM public.recipes
+    UNION ALL
+    SELECT recipe_id, user_id, deleted_at, TRUE FROM public.recipe_tombstones
+) c
+LEFT JOIN public.recipe_list_versions v ON v.user_id = c.user_id;
+
+DROP TRIGGER IF EXISTS bump_recipes_list_version ON public.recipes;
+DROP FUNCTION IF EXISTS public.bump_recipe_list_version();
+
+-- Without the user triggers, so updated_at and the search documents stay as they are
+ALTER TABLE public.recipes DISABLE TRIGGER USER;
+UPDATE public.recipes r SET change_seq = n.seq
+FROM numbered_changes n WHERE n.id = r.id AND NOT n.deleted;
+ALTER TABLE public.recipes ENABLE TRIGGER USER;
+
+UPDATE public.recipe_tombstones t SET change_seq = n.seq
+FROM numbered_changes n WHERE n.id = t.recipe_id AND n.deleted;
+
+ALTER TABLE public.recipe_tombstones ALTER COLUMN change_seq SET NOT NULL;
+
+INSERT INTO public.recipe_list_versions (user_id, version)
+SELECT user_id, MAX(seq) FROM numbered_changes GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET version = EXCLUDED.version, updated_at = NOW();
+
+CREATE OR REPLACE FUNCTION public.next_recipe_change_seq(p_user_id UUID)
+RETURNS BIGINT AS $$
+    INSERT INTO public.recipe_list_versions (user_id, version)
+    VALUES (p_user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE
+        SET version = recipe_list_versions.version + 1, updated_at = NOW()
+    RETURNING version;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION public.set_recipe_change_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.change_seq := public.next_recipe_change_seq(NEW.user_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS set_recipes_change_seq ON public.recipes;
+CREATE TRIGGER set_recipes_change_seq BEFORE INSERT OR UPDATE ON public.recipes
+    FOR EACH ROW EXECUTE FUNCTION public.set_recipe_change_seq();
+
+CREATE OR REPLACE FUNCTION public.record_recipe_tombstone()
+RETURNS TRIGGER AS $$
+DECLARE
+    seq BIGINT := public.next_recipe_change_seq(OLD.user_id);
+BEGIN
+    INSERT INTO public.recipe_tombstones (recipe_id, user_id, change_seq)
+    VALUES (OLD.id, OLD.user_id, seq)
+    ON CONFLICT (recipe_id) DO UPDATE SET deleted_at = NOW(), change_seq = seq;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP INDEX IF EXISTS public.idx_recipe_tombstones_user_deleted;
+CREATE INDEX IF NOT EXISTS idx_recipes_user_change_seq ON public.recipes(user_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_recipe_tombstones_user_change_seq ON public.recipe_tombstones(user_id, change_seq);
+
+DROP FUNCTION IF EXISTS public.get_recipe_changes(UUID, TIMESTAMPTZ, UUID, INTEGER);
+CREATE OR REPLACE FUNCTION public.get_recipe_changes(p_user_id UUID, p_since BIGINT, p_limit INTEGER)
+RETURNS JSONB AS $$
+    WITH changes AS (
+        (
+            SELECT r.id, r.change_seq AS seq, FALSE AS deleted
+            FROM public.recipes r
+            WHERE r.user_id = p_user_id
+                AND r.change_seq > COALESCE(p_since, -1)
+            ORDER BY r.change_seq
+            LIMIT p_limit + 1
+        )
+        UNION ALL
+        (
+            SELECT t.recipe_id, t.change_seq, TRUE
+            FROM public.recipe_tombstones t
+            WHERE t.user_id = p_user_id
+                AND p_since IS NOT NULL
+                AND t.change_seq > p_since
+            ORDER BY t.change_seq
+            LIMIT p_limit + 1
+        )
+        ORDER BY seq
+        LIMIT p_limit + 1
+    )
+    SELECT jsonb_build_object(
+        'changes', COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'id', id,
+                    'seq', seq,
+                    'deleted', deleted,
+                    'recipe', CASE WHEN deleted THEN NULL ELSE public.get_recipe_document(id) END
+                )
+                ORDER BY seq
+            ),
+            '[]'::jsonb
+        )
+    )
+    FROM changes;
+$$ LANGUAGE sql STABLE;
+
+COMMIT;
@@ -0,0 +1,97 @@
+-- Migration: tombstone retention
+-- Tombstones for deleted recipes were kept forever. prune_recipe_tombstones()
+-- removes those older than 90 days (nightly via pg_cron where it is enabled) and
+-- records per user how far pruning went, so get_recipe_changes can tell a client
+-- with an older cursor to sync from scratch instead of silently missing deletions.
+
+BEGIN;
+
+ALTER TABLE public.recipe_list_versions ADD COLUMN IF NOT EXISTS pruned_through BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION public.get_recipe_changes(p_user_id UUID, p_since BIGINT, p_limit INTEGER)
+RETURNS JSONB AS $$
+    WITH changes AS (
+        (
+            SELECT r.id, r.change_seq AS seq, FALSE AS deleted
+            FROM public.recipes r
+            WHERE r.user_id = p_user_id
+                AND r.change_seq > COALESCE(p_since, -1)
+            ORDER BY r.change_seq
+            LIMIT p_limit + 1
+        )
+        UNION ALL
+        (
+            SELECT t.recipe_id, t.change_seq, TRUE
+            FROM public.recipe_tombstones t
+            WHERE t.user_id = p_user_id
+                AND p_since IS NOT NULL
+                AND t.change_seq > p_since
+            ORDER BY t.change_seq
+            LIMIT p_limit + 1
+        )
+        ORDER BY seq
+        LIMIT p_limit + 1
+    )
+    SELECT jsonb_build_object(
+        'changes', COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'id', id,
+                    'seq', seq,
+                    'deleted', deleted,
+                    'recipe', CASE WHEN deleted THEN NULL ELSE public.get_recipe_document(id) END
+                )
+                ORDER BY seq
+            ),
+            '[]'::jsonb
+        ),
+        'expired', COALESCE(
+            p_since < (SELECT v.pruned_through FROM public.recipe_list_versions v WHERE v.user_id = p_user_id),
+            FALSE
+        )
+    )
+    FROM changes;
+$$ LANGUAGE sql STABLE;
+
+-- Delete tombstones older than p_retention. Clients that have not synced since then
+-- get "expired" from get_recipe_changes and pull everything again. Returns the number
+-- of tombstones removed.
+CREATE OR REPLACE FUNCTION public.prune_recipe_tombstones(p_retention INTERVAL DEFAULT INTERVAL '90 days')
+RETURNS INTEGER AS $$
+DECLARE
+    pruned INTEGER;
+BEGIN
+    WITH removed AS (
+        DELETE FROM public.recipe_tombstones
+        WHERE deleted_at < NOW() - p_retention
+        RETURNING user_id, change_seq
+    ), per_user AS (
+        SELECT user_id, MAX(change_seq) AS through, COUNT(*) AS n
+        FROM removed
+        GROUP BY user_id
+    ), marked AS (
+        UPDATE public.recipe_list_versions v
+        SET pruned_through = GREATEST(v.pruned_through, p.through)
+        FROM per_user p
+        WHERE v.user_id = p.user_id
+    )
+    SELECT COALESCE(SUM(n), 0) INTO pruned FROM per_user;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION public.prune_recipe_tombstones(INTERVAL) FROM PUBLIC, anon, authenticated;
+
+-- Prune nightly where pg_cron is enabled (Database > Extensions); otherwise schedule
+-- SELECT public.prune_recipe_tombstones() with any job runner using the service role
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'prune-recipe-tombstones', '17 3 * * *', 'SELECT public.prune_recipe_tombstones()'
+        );
+    END IF;
+END;
+$$;
+
+COMMIT;
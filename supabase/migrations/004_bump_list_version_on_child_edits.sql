@@ -0,0 +1,91 @@
+-- Migration: bump list versions on child and tag edits
+-- The list version (and so GET /recipes ETags) only moved when a recipe row was
+-- written. Adding an attachment, or renaming or recolouring a tag, changes what
+-- the list returns without touching the recipe row, so clients kept getting 304
+-- for a stale list. Statement-level triggers now bump the version of every user
+-- whose recipes the statement touched.
+
+BEGIN;
+
+-- Bump the list version of every user whose recipes a statement on a child table
+-- (ingredients, steps, recipe_tags, attachments) or on tags touched, so list ETags
+-- change with edits that leave the recipe row alone. Users are locked in id order
+-- so two statements touching the same users cannot deadlock.
+CREATE OR REPLACE FUNCTION public.bump_recipe_list_versions()
+RETURNS TRIGGER AS $$
+DECLARE
+    affected UUID[];
+BEGIN
+    IF TG_TABLE_NAME = 'attachments' THEN
+        SELECT array_agg(DISTINCT c.user_id) INTO affected FROM changed_rows c;
+    ELSIF TG_TABLE_NAME = 'tags' THEN
+        SELECT array_agg(DISTINCT r.user_id) INTO affected
+        FROM changed_rows c
+        JOIN public.recipe_tags rt ON rt.tag_id = c.id
+        JOIN public.recipes r ON r.id = rt.recipe_id;
+    ELSE
+        -- Rows deleted along with their recipe find no recipe; the tombstone
+        -- trigger has already numbered that change
+        SELECT array_agg(DISTINCT r.user_id) INTO affected
+        FROM changed_rows c
+        JOIN public.recipes r ON r.id = c.recipe_id;
+    END IF;
+
+    PERFORM public.next_recipe_change_seq(u.user_id)
+    FROM unnest(affected) AS u(user_id)
+    ORDER BY u.user_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Transition tables need one trigger per event
+CREATE TRIGGER bump_list_version_on_ingredients_insert AFTER INSERT ON public.ingredients
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_ingredients_update AFTER UPDATE ON public.ingredients
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_ingredients_delete AFTER DELETE ON public.ingredients
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_steps_insert AFTER INSERT ON public.steps
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_steps_update AFTER UPDATE ON public.steps
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_steps_delete AFTER DELETE ON public.steps
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_recipe_tags_insert AFTER INSERT ON public.recipe_tags
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_recipe_tags_delete AFTER DELETE ON public.recipe_tags
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_attachments_insert AFTER INSERT ON public.attachments
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_attachments_update AFTER UPDATE ON public.attachments
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_attachments_delete AFTER DELETE ON public.attachments
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+-- Renaming or recolouring a tag changes every recipe list that shows it
+CREATE TRIGGER bump_list_version_on_tags_update AFTER UPDATE ON public.tags
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+COMMIT;
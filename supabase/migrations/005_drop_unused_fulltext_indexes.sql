@@ -0,0 +1,12 @@
+-- Migration: drop the per-column full-text indexes
+-- Full-text search ranks recipe_search_documents (see search_recipes in
+-- schema.sql); no query filters on to_tsvector(title) or
+-- to_tsvector(description), so these GIN indexes only slowed every recipe
+-- insert and update.
+
+BEGIN;
+
+DROP INDEX IF EXISTS public.idx_recipes_title;
+DROP INDEX IF EXISTS public.idx_recipes_description;
+
+COMMIT;
@@ -0,0 +1,31 @@
+-- Migration: generate recipes.total_time
+-- schema.sql declares total_time as a stored generated column (prep_time +
+-- cook_time), but CREATE TABLE IF NOT EXISTS leaves an existing table alone, so
+-- databases created earlier kept a plain column that nothing writes: the
+-- max_total_time filter and the total-time facet saw NULL for every recipe.
+-- A plain column cannot be turned into a generated one in place, so it is
+-- dropped and added back; adding it computes the value for every existing row.
+
+BEGIN;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'recipes'
+            AND column_name = 'total_time' AND is_generated = 'NEVER'
+    ) THEN
+        ALTER TABLE public.recipes DROP COLUMN total_time;
+        ALTER TABLE public.recipes ADD COLUMN total_time INTEGER GENERATED ALWAYS AS (
+            CASE WHEN prep_time IS NULL AND cook_time IS NULL THEN NULL
+            ELSE COALESCE(prep_time, 0) + COALESCE(cook_time, 0) END
+        ) STORED;
+        COMMENT ON COLUMN public.recipes.total_time IS 'in minutes (prep + cook)';
+    END IF;
+END;
+$$;
+
+-- Dropped along with the old column
+CREATE INDEX IF NOT EXISTS idx_recipes_user_total_time ON public.recipes(user_id, total_time);
+
+COMMIT;
@@ -0,0 +1,86 @@
+-- Migration: match pantry items as a whole
+-- search_recipes_by_pantry pooled the tokens of all pantry items, so an
+-- ingredient matched when it shared any one token with the pantry: "red wine"
+-- in the pantry covered "red onion", and "fresh basil" covered "fresh thyme".
+-- An ingredient now has to hold every token of a single pantry item.
+
+BEGIN;
+
+-- Recipes the user can cook from a list of pantry items, ranked by coverage
+-- (matched / required ingredients), then fewest missing. Candidates come from
+-- intersecting the pantry tokens with ingredient_index, so recipes sharing no
+-- ingredient with the pantry are never read. An ingredient counts as matched
+-- when it has every token of one pantry item ("chicken" covers "chicken thighs",
+-- but "red wine" does not cover "red onion").
+CREATE OR REPLACE FUNCTION public.search_recipes_by_pantry(
+    p_user_id UUID, p_ingredients TEXT[], p_max_missing INTEGER, p_limit INTEGER, p_offset INTEGER
+)
+RETURNS JSONB AS $$
+    WITH pantry AS (
+        SELECT i.item_no, t.token, count(*) OVER (PARTITION BY i.item_no) AS item_tokens
+        FROM unnest(p_ingredients) WITH ORDINALITY AS i(item, item_no),
+            unnest(public.ingredient_tokens(i.item)) AS t(token)
+        GROUP BY i.item_no, t.token
+    ),
+    -- Ingredients holding all tokens of some pantry item
+    item_matches AS (
+        SELECT ix.recipe_id, ix.ingredient_id
+        FROM public.ingredient_index ix
+        JOIN pantry p ON p.token = ix.token
+        WHERE ix.user_id = p_user_id
+        GROUP BY ix.recipe_id, ix.ingredient_id, p.item_no
+        HAVING count(*) = min(p.item_tokens)
+    ),
+    matched AS (
+        SELECT recipe_id, array_agg(DISTINCT ingredient_id) AS ingredient_ids
+        FROM item_matches
+        GROUP BY recipe_id
+    ),
+    scored AS (
+        SELECT
+            m.recipe_id,
+            m.ingredient_ids,
+            cardinality(m.ingredient_ids) AS matched,
+            (SELECT count(*) FROM public.ingredients i WHERE i.recipe_id = m.recipe_id) AS required
+        FROM matched m
+    ),
+    hits AS (
+        SELECT
+            recipe_id,
+            ingredient_ids,
+            matched,
+            required,
+            required - matched AS missing,
+            matched::REAL / required AS coverage
+        FROM scored
+        WHERE p_max_missing IS NULL OR required - matched <= p_max_missing
+        ORDER BY coverage DESC, missing, recipe_id
+        LIMIT p_limit + 1 OFFSET p_offset
+    )
+    SELECT jsonb_build_object(
+        'results', COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'matched', h.matched,
+                    'required', h.required,
+                    'missing', h.missing,
+                    'coverage', h.coverage,
+                    'missing_ingredients', COALESCE(
+                        (
+                            SELECT jsonb_agg(i.name ORDER BY i.order_index)
+                            FROM public.ingredients i
+                            WHERE i.recipe_id = h.recipe_id AND NOT i.id = ANY(h.ingredient_ids)
+                        ),
+                        '[]'::jsonb
+                    ),
+                    'recipe', public.get_recipe_document(h.recipe_id)
+                )
+                ORDER BY h.coverage DESC, h.missing, h.recipe_id
+            ),
+            '[]'::jsonb
+        )
+    )
+    FROM hits h;
+$$ LANGUAGE sql STABLE;
+
+COMMIT;
@@ -0,0 +1,25 @@
+-- Migration: lock down ensure_user
+-- ensure_user is SECURITY DEFINER and was executable by PUBLIC, so any signed-in
+-- (or anonymous) client could call it over PostgREST to copy another user's
+-- auth.users email into public.users, and it resolved table names through the
+-- caller's search_path. It now runs with an empty search_path and only the
+-- service role (the backend) may execute it.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.ensure_user(p_user_id UUID)
+RETURNS BOOLEAN AS $$
+BEGIN
+    INSERT INTO public.users (id, email, full_name)
+    SELECT u.id, u.email, u.raw_user_meta_data->>'full_name'
+    FROM auth.users u
+    WHERE u.id = p_user_id
+    ON CONFLICT (id) DO NOTHING;
+    RETURN EXISTS (SELECT 1 FROM public.users p WHERE p.id = p_user_id);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+REVOKE EXECUTE ON FUNCTION public.ensure_user(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ensure_user(UUID) TO service_role;
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- Migration: lock down the change-sequence and index trigger functions
+-- next_recipe_change_seq is SECURITY DEFINER and was executable by PUBLIC, so any
+-- API caller could bump another user's list version (invalidating their ETags and
+-- burning change_seq numbers) or insert recipe_list_versions rows. Execute is now
+-- revoked; the triggers that call it run as the function owner and are unaffected.
+-- The SECURITY DEFINER trigger functions also get an empty search_path, so they
+-- only resolve the schema-qualified names they already use.
+
+BEGIN;
+
+REVOKE EXECUTE ON FUNCTION public.next_recipe_change_seq(UUID) FROM PUBLIC, anon, authenticated;
+
+ALTER FUNCTION public.next_recipe_change_seq(UUID) SET search_path = '';
+ALTER FUNCTION public.set_recipe_change_seq() SET search_path = '';
+ALTER FUNCTION public.record_recipe_tombstone() SET search_path = '';
+ALTER FUNCTION public.bump_recipe_list_versions() SET search_path = '';
+ALTER FUNCTION public.refresh_recipe_search_document_row() SET search_path = '';
+ALTER FUNCTION public.refresh_recipe_search_documents_from_ingredients() SET search_path = '';
+ALTER FUNCTION public.index_ingredient_tokens() SET search_path = '';
+
+COMMIT;
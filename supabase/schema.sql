@@ -3,6 +3,8 @@
 
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Trigram matching for typo-tolerant and prefix search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Users table (extends Supabase auth.users)
 CREATE TABLE IF NOT EXISTS public.users (
@@ -22,7 +24,10 @@ CREATE TABLE IF NOT EXISTS public.recipes (
     description TEXT,
     prep_time INTEGER, -- in minutes
     cook_time INTEGER, -- in minutes
-    total_time INTEGER, -- in minutes
+    total_time INTEGER GENERATED ALWAYS AS (
+        CASE WHEN prep_time IS NULL AND cook_time IS NULL THEN NULL
+        ELSE COALESCE(prep_time, 0) + COALESCE(cook_time, 0) END
+    ) STORED, -- in minutes (prep + cook)
     servings INTEGER,
     difficulty TEXT CHECK (difficulty IN ('easy', 'medium', 'hard')),
     cuisine_type TEXT,
@@ -31,7 +36,8 @@ CREATE TABLE IF NOT EXISTS public.recipes (
     notes TEXT,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-    synced_at TIMESTAMPTZ
+    synced_at TIMESTAMPTZ,
+    change_seq BIGINT NOT NULL DEFAULT 0 -- position in the owner's change log (set by trigger)
 );
 
 -- Ingredients table
@@ -92,12 +98,55 @@ CREATE TABLE IF NOT EXISTS public.recipe_tags (
     PRIMARY KEY (recipe_id, tag_id)
 );
 
+-- Deleted recipes, so clients can pull deletions since their last sync
+CREATE TABLE IF NOT EXISTS public.recipe_tombstones (
+    recipe_id UUID PRIMARY KEY,
+    user_id UUID NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    change_seq BIGINT NOT NULL
+);
+
+-- Weighted full-text document per recipe (title A, description B, ingredient names C,
+-- cuisine D), maintained by triggers on recipes and ingredients
+CREATE TABLE IF NOT EXISTS public.recipe_search_documents (
+    recipe_id UUID PRIMARY KEY REFERENCES public.recipes(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL,
+    document TSVECTOR NOT NULL
+);
+
+-- Inverted index from normalized ingredient token to the ingredients (and recipes)
+-- that contain it, for pantry search. Maintained by triggers on ingredients.
+CREATE TABLE IF NOT EXISTS public.ingredient_index (
+    user_id UUID NOT NULL,
+    token TEXT NOT NULL,
+    ingredient_id UUID NOT NULL REFERENCES public.ingredients(id) ON DELETE CASCADE,
+    recipe_id UUID NOT NULL REFERENCES public.recipes(id) ON DELETE CASCADE,
+    PRIMARY KEY (user_id, token, ingredient_id)
+);
+
+-- Per-user version of the recipe collection, bumped on every write to a recipe, its
+-- children or its tags (list ETags).
+-- version doubles as the user's change sequence for delta sync (recipes.change_seq).
+CREATE TABLE IF NOT EXISTS public.recipe_list_versions (
+    user_id UUID PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    pruned_through BIGINT NOT NULL DEFAULT 0 -- newest change_seq of a pruned tombstone
+);
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_recipes_user_id ON public.recipes(user_id);
 CREATE INDEX IF NOT EXISTS idx_recipes_updated_at ON public.recipes(updated_at DESC);
-CREATE INDEX IF NOT EXISTS idx_recipes_title ON public.recipes USING gin(to_tsvector('english', title));
-CREATE INDEX IF NOT EXISTS idx_recipes_description ON public.recipes USING gin(to_tsvector('english', description));
+-- Keyset pagination of a user's recipes: WHERE user_id = ? ORDER BY updated_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_recipes_user_updated_id ON public.recipes(user_id, updated_at DESC, id DESC);
+-- Facet filters on the recipe list, each keeping the keyset pagination order
+CREATE INDEX IF NOT EXISTS idx_recipes_user_cuisine ON public.recipes(user_id, cuisine_type, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_recipes_user_difficulty ON public.recipes(user_id, difficulty, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_recipes_user_total_time ON public.recipes(user_id, total_time);
+-- Trigram indexes back fuzzy (<%) and prefix (ILIKE 'chick%') search
+CREATE INDEX IF NOT EXISTS idx_recipes_title_trgm ON public.recipes USING gin(title gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_ingredients_recipe_id ON public.ingredients(recipe_id);
+CREATE INDEX IF NOT EXISTS idx_ingredients_name_trgm ON public.ingredients USING gin(name gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_ingredients_order ON public.ingredients(recipe_id, order_index);
 CREATE INDEX IF NOT EXISTS idx_steps_recipe_id ON public.steps(recipe_id);
 CREATE INDEX IF NOT EXISTS idx_steps_order ON public.steps(recipe_id, order_index);
@@ -106,6 +155,12 @@ CREATE INDEX IF NOT EXISTS idx_attachments_step_id ON public.attachments(step_id
 CREATE INDEX IF NOT EXISTS idx_attachments_user_id ON public.attachments(user_id);
 CREATE INDEX IF NOT EXISTS idx_recipe_tags_recipe_id ON public.recipe_tags(recipe_id);
 CREATE INDEX IF NOT EXISTS idx_recipe_tags_tag_id ON public.recipe_tags(tag_id);
+CREATE INDEX IF NOT EXISTS idx_recipe_search_documents_document ON public.recipe_search_documents USING gin(document);
+CREATE INDEX IF NOT EXISTS idx_recipe_search_documents_user_id ON public.recipe_search_documents(user_id);
+CREATE INDEX IF NOT EXISTS idx_ingredient_index_ingredient_id ON public.ingredient_index(ingredient_id);
+-- Delta sync: WHERE user_id = ? AND change_seq > ? ORDER BY change_seq
+CREATE INDEX IF NOT EXISTS idx_recipes_user_change_seq ON public.recipes(user_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_recipe_tombstones_user_change_seq ON public.recipe_tombstones(user_id, change_seq);
 
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -135,6 +190,240 @@ CREATE TRIGGER update_attachments_updated_at BEFORE UPDATE ON public.attachments
 CREATE TRIGGER update_tags_updated_at BEFORE UPDATE ON public.tags
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Bump a user's collection version and return it as the next change sequence number.
+-- The upsert keeps the user's version row locked until the transaction ends, so a
+-- user's writers take numbers one after another and commit in number order: once
+-- a number is visible, every smaller one is committed too (unlike NOW(), which is
+-- the transaction start time and can commit behind a client's sync cursor).
+CREATE OR REPLACE FUNCTION public.next_recipe_change_seq(p_user_id UUID)
+RETURNS BIGINT AS $$
+    INSERT INTO public.recipe_list_versions (user_id, version)
+    VALUES (p_user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE
+        SET version = recipe_list_versions.version + 1, updated_at = NOW()
+    RETURNING version;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = '';
+
+-- Only the triggers below may take numbers; callers over the API could otherwise
+-- bump any user's version (invalidating their ETags) or create junk version rows
+REVOKE EXECUTE ON FUNCTION public.next_recipe_change_seq(UUID) FROM PUBLIC, anon, authenticated;
+
+-- Number every recipe insert and update in its owner's change log
+CREATE OR REPLACE FUNCTION public.set_recipe_change_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.change_seq := public.next_recipe_change_seq(NEW.user_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+CREATE TRIGGER set_recipes_change_seq BEFORE INSERT OR UPDATE ON public.recipes
+    FOR EACH ROW EXECUTE FUNCTION public.set_recipe_change_seq();
+
+-- Record a numbered tombstone for every deleted recipe
+CREATE OR REPLACE FUNCTION public.record_recipe_tombstone()
+RETURNS TRIGGER AS $$
+DECLARE
+    seq BIGINT := public.next_recipe_change_seq(OLD.user_id);
+BEGIN
+    INSERT INTO public.recipe_tombstones (recipe_id, user_id, change_seq)
+    VALUES (OLD.id, OLD.user_id, seq)
+    ON CONFLICT (recipe_id) DO UPDATE SET deleted_at = NOW(), change_seq = seq;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+CREATE TRIGGER record_recipes_tombstone AFTER DELETE ON public.recipes
+    FOR EACH ROW EXECUTE FUNCTION public.record_recipe_tombstone();
+
+-- Bump the list version of every user whose recipes a statement on a child table
+-- (ingredients, steps, recipe_tags, attachments) or on tags touched, so list ETags
+-- change with edits that leave the recipe row alone. Users are locked in id order
+-- so two statements touching the same users cannot deadlock.
+CREATE OR REPLACE FUNCTION public.bump_recipe_list_versions()
+RETURNS TRIGGER AS $$
+DECLARE
+    affected UUID[];
+BEGIN
+    IF TG_TABLE_NAME = 'attachments' THEN
+        SELECT array_agg(DISTINCT c.user_id) INTO affected FROM changed_rows c;
+    ELSIF TG_TABLE_NAME = 'tags' THEN
+        SELECT array_agg(DISTINCT r.user_id) INTO affected
+        FROM changed_rows c
+        JOIN public.recipe_tags rt ON rt.tag_id = c.id
+        JOIN public.recipes r ON r.id = rt.recipe_id;
+    ELSE
+        -- Rows deleted along with their recipe find no recipe; the tombstone
+        -- trigger has already numbered that change
+        SELECT array_agg(DISTINCT r.user_id) INTO affected
+        FROM changed_rows c
+        JOIN public.recipes r ON r.id = c.recipe_id;
+    END IF;
+
+    PERFORM public.next_recipe_change_seq(u.user_id)
+    FROM unnest(affected) AS u(user_id)
+    ORDER BY u.user_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+-- Transition tables need one trigger per event
+CREATE TRIGGER bump_list_version_on_ingredients_insert AFTER INSERT ON public.ingredients
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_ingredients_update AFTER UPDATE ON public.ingredients
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_ingredients_delete AFTER DELETE ON public.ingredients
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_steps_insert AFTER INSERT ON public.steps
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_steps_update AFTER UPDATE ON public.steps
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_steps_delete AFTER DELETE ON public.steps
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_recipe_tags_insert AFTER INSERT ON public.recipe_tags
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_recipe_tags_delete AFTER DELETE ON public.recipe_tags
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_attachments_insert AFTER INSERT ON public.attachments
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_attachments_update AFTER UPDATE ON public.attachments
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+CREATE TRIGGER bump_list_version_on_attachments_delete AFTER DELETE ON public.attachments
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+-- Renaming or recolouring a tag changes every recipe list that shows it
+CREATE TRIGGER bump_list_version_on_tags_update AFTER UPDATE ON public.tags
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_recipe_list_versions();
+
+-- Rebuild the full-text documents of the given recipes
+CREATE OR REPLACE FUNCTION public.refresh_recipe_search_documents(recipe_ids UUID[])
+RETURNS VOID AS $$
+    INSERT INTO public.recipe_search_documents (recipe_id, user_id, document)
+    SELECT
+        r.id,
+        r.user_id,
+        setweight(to_tsvector('english', COALESCE(r.title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(r.description, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(
+            (SELECT string_agg(i.name, ' ') FROM public.ingredients i WHERE i.recipe_id = r.id), ''
+        )), 'C') ||
+        setweight(to_tsvector('english', COALESCE(r.cuisine_type, '')), 'D')
+    FROM public.recipes r
+    WHERE r.id = ANY(recipe_ids)
+    ON CONFLICT (recipe_id) DO UPDATE
+        SET user_id = EXCLUDED.user_id, document = EXCLUDED.document;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION public.refresh_recipe_search_document_row()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM public.refresh_recipe_search_documents(ARRAY[NEW.id]);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+CREATE TRIGGER refresh_recipes_search_document
+    AFTER INSERT OR UPDATE OF title, description, cuisine_type ON public.recipes
+    FOR EACH ROW EXECUTE FUNCTION public.refresh_recipe_search_document_row();
+
+-- Ingredient changes refresh each affected recipe once per statement
+CREATE OR REPLACE FUNCTION public.refresh_recipe_search_documents_from_ingredients()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM public.refresh_recipe_search_documents(ARRAY(SELECT DISTINCT recipe_id FROM old_rows));
+    ELSE
+        PERFORM public.refresh_recipe_search_documents(ARRAY(SELECT DISTINCT recipe_id FROM new_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+CREATE TRIGGER refresh_search_on_ingredients_insert AFTER INSERT ON public.ingredients
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_recipe_search_documents_from_ingredients();
+
+CREATE TRIGGER refresh_search_on_ingredients_update AFTER UPDATE ON public.ingredients
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_recipe_search_documents_from_ingredients();
+
+CREATE TRIGGER refresh_search_on_ingredients_delete AFTER DELETE ON public.ingredients
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.refresh_recipe_search_documents_from_ingredients();
+
+-- Backfill documents for recipes created before the search triggers existed
+SELECT public.refresh_recipe_search_documents(ARRAY(
+    SELECT r.id FROM public.recipes r
+    WHERE NOT EXISTS (SELECT 1 FROM public.recipe_search_documents d WHERE d.recipe_id = r.id)
+));
+
+-- Normalized tokens of an ingredient name or pantry item: English stems without
+-- stop words, so "Chopped Tomatoes" and "tomato" share the token "tomato"
+CREATE OR REPLACE FUNCTION public.ingredient_tokens(p_name TEXT)
+RETURNS TEXT[] AS $$
+    SELECT tsvector_to_array(to_tsvector('english', COALESCE(p_name, '')));
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add index entries for inserted or renamed ingredients. Deleted ingredients
+-- (and recipes) drop out of the index through ON DELETE CASCADE.
+CREATE OR REPLACE FUNCTION public.index_ingredient_tokens()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM public.ingredient_index ix
+        USING new_rows n
+        WHERE ix.ingredient_id = n.id;
+    END IF;
+
+    INSERT INTO public.ingredient_index (user_id, token, ingredient_id, recipe_id)
+    SELECT DISTINCT r.user_id, t.token, n.id, n.recipe_id
+    FROM new_rows n
+    JOIN public.recipes r ON r.id = n.recipe_id
+    CROSS JOIN LATERAL unnest(public.ingredient_tokens(n.name)) AS t(token)
+    ON CONFLICT DO NOTHING;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+CREATE TRIGGER index_ingredients_insert AFTER INSERT ON public.ingredients
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.index_ingredient_tokens();
+
+CREATE TRIGGER index_ingredients_update AFTER UPDATE ON public.ingredients
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.index_ingredient_tokens();
+
+-- Backfill the index for ingredients created before the trigger existed
+INSERT INTO public.ingredient_index (user_id, token, ingredient_id, recipe_id)
+SELECT DISTINCT r.user_id, t.token, i.id, i.recipe_id
+FROM public.ingredients i
+JOIN public.recipes r ON r.id = i.recipe_id
+CROSS JOIN LATERAL unnest(public.ingredient_tokens(i.name)) AS t(token)
+ON CONFLICT DO NOTHING;
+
 -- Function to create user profile on signup
 CREATE OR REPLACE FUNCTION public.handle_new_user()
 RETURNS TRIGGER AS $$
@@ -150,6 +439,672 @@ CREATE TRIGGER on_auth_user_created
     AFTER INSERT ON auth.users
     FOR EACH ROW EXECUTE FUNCTION public.handle_new_user();
 
+-- Create the profile for an existing auth user if on_auth_user_created did not.
+-- Returns false when there is no such auth user. It runs as the owner and reads
+-- auth.users for any id, so only the backend (service role) may call it, and the
+-- empty search_path keeps callers from shadowing the tables it uses.
+CREATE OR REPLACE FUNCTION public.ensure_user(p_user_id UUID)
+RETURNS BOOLEAN AS $$
+BEGIN
+    INSERT INTO public.users (id, email, full_name)
+    SELECT u.id, u.email, u.raw_user_meta_data->>'full_name'
+    FROM auth.users u
+    WHERE u.id = p_user_id
+    ON CONFLICT (id) DO NOTHING;
+    RETURN EXISTS (SELECT 1 FROM public.users p WHERE p.id = p_user_id);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = '';
+
+REVOKE EXECUTE ON FUNCTION public.ensure_user(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ensure_user(UUID) TO service_role;
+
+-- Assemble a recipe with its children in the same shape as the API's nested select
+-- (ingredients, steps, recipe_tags -> tags, attachments)
+CREATE OR REPLACE FUNCTION public.get_recipe_document(p_recipe_id UUID)
+RETURNS JSONB AS $$
+    SELECT to_jsonb(r) || jsonb_build_object(
+        'ingredients', COALESCE(
+            (SELECT jsonb_agg(to_jsonb(i) ORDER BY i.order_index)
+             FROM public.ingredients i WHERE i.recipe_id = r.id),
+            '[]'::jsonb),
+        'steps', COALESCE(
+            (SELECT jsonb_agg(to_jsonb(st) ORDER BY st.order_index)
+             FROM public.steps st WHERE st.recipe_id = r.id),
+            '[]'::jsonb),
+        'recipe_tags', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_object('tags', to_jsonb(t)))
+             FROM public.recipe_tags rt JOIN public.tags t ON t.id = rt.tag_id
+             WHERE rt.recipe_id = r.id),
+            '[]'::jsonb),
+        'attachments', COALESCE(
+            (SELECT jsonb_agg(to_jsonb(a))
+             FROM public.attachments a WHERE a.recipe_id = r.id),
+            '[]'::jsonb)
+    )
+    FROM public.recipes r
+    WHERE r.id = p_recipe_id;
+$$ LANGUAGE sql STABLE;
+
+-- Create a recipe with its ingredients, steps and tags in a single transaction.
+-- payload: recipe columns plus "ingredients", "steps" and "tag_ids" arrays.
+-- Returns the assembled recipe document.
+CREATE OR REPLACE FUNCTION public.create_recipe_full(payload JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    new_recipe_id UUID;
+BEGIN
+    INSERT INTO public.recipes (
+        user_id, title, description, prep_time, cook_time, servings,
+        difficulty, cuisine_type, image_url, source_url, notes
+    )
+    VALUES (
+        (payload->>'user_id')::UUID,
+        payload->>'title',
+        payload->>'description',
+        (payload->>'prep_time')::INTEGER,
+        (payload->>'cook_time')::INTEGER,
+        (payload->>'servings')::INTEGER,
+        payload->>'difficulty',
+        payload->>'cuisine_type',
+        payload->>'image_url',
+        payload->>'source_url',
+        payload->>'notes'
+    )
+    RETURNING id INTO new_recipe_id;
+
+    INSERT INTO public.ingredients (recipe_id, name, amount, unit, notes, order_index)
+    SELECT new_recipe_id, i.name, i.amount, i.unit, i.notes, i.order_index
+    FROM jsonb_to_recordset(COALESCE(payload->'ingredients', '[]'::jsonb))
+        AS i(name TEXT, amount DECIMAL(10, 2), unit TEXT, notes TEXT, order_index INTEGER);
+
+    INSERT INTO public.steps (recipe_id, description, order_index, duration, temperature)
+    SELECT new_recipe_id, st.description, st.order_index, st.duration, st.temperature
+    FROM jsonb_to_recordset(COALESCE(payload->'steps', '[]'::jsonb))
+        AS st(description TEXT, order_index INTEGER, duration INTEGER, temperature INTEGER);
+
+    INSERT INTO public.recipe_tags (recipe_id, tag_id)
+    SELECT DISTINCT new_recipe_id, tag_id::UUID
+    FROM jsonb_array_elements_text(COALESCE(payload->'tag_ids', '[]'::jsonb)) AS tag_id;
+
+    RETURN public.get_recipe_document(new_recipe_id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Insert a batch of imported recipes for p_user_id with one multi-row INSERT per table.
+-- p_recipes: array of create_recipe_full payloads, with "tags" as tag names instead of
+-- "tag_ids". Missing tags are created and all names are resolved in a single lookup.
+-- All-or-nothing; returns the new recipe ids in input order.
+CREATE OR REPLACE FUNCTION public.import_recipes(p_user_id UUID, p_recipes JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    new_ids JSONB;
+BEGIN
+    INSERT INTO public.tags (name)
+    SELECT DISTINCT tag.name
+    FROM jsonb_array_elements(p_recipes) AS r(doc),
+        jsonb_array_elements_text(COALESCE(r.doc->'tags', '[]'::jsonb)) AS tag(name)
+    ON CONFLICT (name) DO NOTHING;
+
+    WITH src AS MATERIALIZED (
+        SELECT gen_random_uuid() AS id, e.ord, e.doc
+        FROM jsonb_array_elements(p_recipes) WITH ORDINALITY AS e(doc, ord)
+    ),
+    new_recipes AS (
+        INSERT INTO public.recipes (
+            id, user_id, title, description, prep_time, cook_time, servings,
+            difficulty, cuisine_type, image_url, source_url, notes
+        )
+        SELECT
+            src.id,
+            p_user_id,
+            src.doc->>'title',
+            src.doc->>'description',
+            (src.doc->>'prep_time')::INTEGER,
+            (src.doc->>'cook_time')::INTEGER,
+            (src.doc->>'servings')::INTEGER,
+            src.doc->>'difficulty',
+            src.doc->>'cuisine_type',
+            src.doc->>'image_url',
+            src.doc->>'source_url',
+            src.doc->>'notes'
+        FROM src
+    ),
+    new_ingredients AS (
+        INSERT INTO public.ingredients (recipe_id, name, amount, unit, notes, order_index)
+        SELECT src.id, i.name, i.amount, i.unit, i.notes, i.order_index
+        FROM src,
+            jsonb_to_recordset(COALESCE(src.doc->'ingredients', '[]'::jsonb))
+                AS i(name TEXT, amount DECIMAL(10, 2), unit TEXT, notes TEXT, order_index INTEGER)
+    ),
+    new_steps AS (
+        INSERT INTO public.steps (recipe_id, description, order_index, duration, temperature)
+        SELECT src.id, st.description, st.order_index, st.duration, st.temperature
+        FROM src,
+            jsonb_to_recordset(COALESCE(src.doc->'steps', '[]'::jsonb))
+                AS st(description TEXT, order_index INTEGER, duration INTEGER, temperature INTEGER)
+    ),
+    new_recipe_tags AS (
+        INSERT INTO public.recipe_tags (recipe_id, tag_id)
+        SELECT DISTINCT src.id, t.id
+        FROM src,
+            jsonb_array_elements_text(COALESCE(src.doc->'tags', '[]'::jsonb)) AS tag(name)
+            JOIN public.tags t ON t.name = tag.name
+    )
+    SELECT jsonb_agg(src.id ORDER BY src.ord) INTO new_ids FROM src;
+
+    RETURN COALESCE(new_ids, '[]'::jsonb);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Update a recipe owned by p_user_id, applying only the differences to its children.
+-- payload: changed recipe columns, plus optional "ingredients", "steps" and "tag_ids"
+-- arrays that replace the current lists. Ingredients and steps are matched to existing
+-- rows by order_index, so unchanged rows keep their ids and are not rewritten.
+-- Raises P0002 when the recipe does not exist or belongs to another user.
+CREATE OR REPLACE FUNCTION public.update_recipe_full(p_recipe_id UUID, p_user_id UUID, payload JSONB)
+RETURNS JSONB AS $$
+BEGIN
+    -- Ownership check and row lock in one statement; always touches updated_at
+    UPDATE public.recipes SET
+        title = CASE WHEN payload ? 'title' THEN payload->>'title' ELSE title END,
+        description = CASE WHEN payload ? 'description' THEN payload->>'description' ELSE description END,
+        prep_time = CASE WHEN payload ? 'prep_time' THEN (payload->>'prep_time')::INTEGER ELSE prep_time END,
+        cook_time = CASE WHEN payload ? 'cook_time' THEN (payload->>'cook_time')::INTEGER ELSE cook_time END,
+        servings = CASE WHEN payload ? 'servings' THEN (payload->>'servings')::INTEGER ELSE servings END,
+        difficulty = CASE WHEN payload ? 'difficulty' THEN payload->>'difficulty' ELSE difficulty END,
+        cuisine_type = CASE WHEN payload ? 'cuisine_type' THEN payload->>'cuisine_type' ELSE cuisine_type END,
+        image_url = CASE WHEN payload ? 'image_url' THEN payload->>'image_url' ELSE image_url END,
+        source_url = CASE WHEN payload ? 'source_url' THEN payload->>'source_url' ELSE source_url END,
+        notes = CASE WHEN payload ? 'notes' THEN payload->>'notes' ELSE notes END
+    WHERE id = p_recipe_id AND user_id = p_user_id;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Recipe not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    IF payload ? 'ingredients' THEN
+        WITH incoming AS (
+            SELECT
+                e.doc->>'name' AS name,
+                (e.doc->>'amount')::DECIMAL(10, 2) AS amount,
+                e.doc->>'unit' AS unit,
+                e.doc->>'notes' AS notes,
+                (e.doc->>'order_index')::INTEGER AS order_index,
+                row_number() OVER (PARTITION BY (e.doc->>'order_index')::INTEGER ORDER BY e.ord) AS dup
+            FROM jsonb_array_elements(payload->'ingredients') WITH ORDINALITY AS e(doc, ord)
+        ), existing AS (
+            SELECT id, order_index,
+                row_number() OVER (PARTITION BY order_index ORDER BY created_at, id) AS dup
+            FROM public.ingredients
+            WHERE recipe_id = p_recipe_id
+        ), matched AS (
+            SELECT x.id, n.name, n.amount, n.unit, n.notes
+            FROM incoming n JOIN existing x ON x.order_index = n.order_index AND x.dup = n.dup
+        ), removed AS (
+            DELETE FROM public.ingredients i
+            WHERE i.recipe_id = p_recipe_id AND i.id NOT IN (SELECT id FROM matched)
+        ), changed AS (
+            UPDATE public.ingredients i
+            SET name = m.name, amount = m.amount, unit = m.unit, notes = m.notes
+            FROM matched m
+            WHERE i.id = m.id
+                AND (i.name, i.amount, i.unit, i.notes) IS DISTINCT FROM (m.name, m.amount, m.unit, m.notes)
+        )
+        INSERT INTO public.ingredients (recipe_id, name, amount, unit, notes, order_index)
+        SELECT p_recipe_id, n.name, n.amount, n.unit, n.notes, n.order_index
+        FROM incoming n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM existing x WHERE x.order_index = n.order_index AND x.dup = n.dup
+        );
+    END IF;
+
+    IF payload ? 'steps' THEN
+        WITH incoming AS (
+            SELECT
+                e.doc->>'description' AS description,
+                (e.doc->>'duration')::INTEGER AS duration,
+                (e.doc->>'temperature')::INTEGER AS temperature,
+                (e.doc->>'order_index')::INTEGER AS order_index,
+                row_number() OVER (PARTITION BY (e.doc->>'order_index')::INTEGER ORDER BY e.ord) AS dup
+            FROM jsonb_array_elements(payload->'steps') WITH ORDINALITY AS e(doc, ord)
+        ), existing AS (
+            SELECT id, order_index,
+                row_number() OVER (PARTITION BY order_index ORDER BY created_at, id) AS dup
+            FROM public.steps
+            WHERE recipe_id = p_recipe_id
+        ), matched AS (
+            SELECT x.id, n.description, n.duration, n.temperature
+            FROM incoming n JOIN existing x ON x.order_index = n.order_index AND x.dup = n.dup
+        ), removed AS (
+            DELETE FROM public.steps st
+            WHERE st.recipe_id = p_recipe_id AND st.id NOT IN (SELECT id FROM matched)
+        ), changed AS (
+            UPDATE public.steps st
+            SET description = m.description, duration = m.duration, temperature = m.temperature
+            FROM matched m
+            WHERE st.id = m.id
+                AND (st.description, st.duration, st.temperature)
+                    IS DISTINCT FROM (m.description, m.duration, m.temperature)
+        )
+        INSERT INTO public.steps (recipe_id, description, order_index, duration, temperature)
+        SELECT p_recipe_id, n.description, n.order_index, n.duration, n.temperature
+        FROM incoming n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM existing x WHERE x.order_index = n.order_index AND x.dup = n.dup
+        );
+    END IF;
+
+    IF payload ? 'tag_ids' THEN
+        DELETE FROM public.recipe_tags rt
+        WHERE rt.recipe_id = p_recipe_id
+            AND NOT (rt.tag_id::TEXT IN (SELECT jsonb_array_elements_text(payload->'tag_ids')));
+
+        INSERT INTO public.recipe_tags (recipe_id, tag_id)
+        SELECT DISTINCT p_recipe_id, tag_id::UUID
+        FROM jsonb_array_elements_text(payload->'tag_ids') AS tag_id
+        ON CONFLICT (recipe_id, tag_id) DO NOTHING;
+    END IF;
+
+    RETURN public.get_recipe_document(p_recipe_id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Apply a batch of offline-sync operations for p_user_id in one call.
+-- operations: array of {"op": "create"|"update"|"delete", "local_id", "id", "recipe"}.
+-- Each operation runs in its own subtransaction so a failure only affects that item.
+-- Returns [{"local_id", "id", "status", "error"}] in the same order.
+CREATE OR REPLACE FUNCTION public.apply_recipe_batch(p_user_id UUID, operations JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    operation JSONB;
+    doc JSONB;
+    results JSONB := '[]'::jsonb;
+BEGIN
+    FOR operation IN SELECT value FROM jsonb_array_elements(operations) LOOP
+        BEGIN
+            IF operation->>'op' = 'create' THEN
+                doc := public.create_recipe_full(
+                    operation->'recipe' || jsonb_build_object('user_id', p_user_id)
+                );
+                results := results || jsonb_build_object(
+                    'local_id', operation->>'local_id', 'id', doc->>'id', 'status', 'created'
+                );
+            ELSIF operation->>'op' = 'update' THEN
+                doc := public.update_recipe_full(
+                    (operation->>'id')::UUID, p_user_id, COALESCE(operation->'recipe', '{}'::jsonb)
+                );
+                results := results || jsonb_build_object(
+                    'local_id', operation->>'local_id', 'id', doc->>'id', 'status', 'updated'
+                );
+            ELSIF operation->>'op' = 'delete' THEN
+                DELETE FROM public.recipes
+                WHERE id = (operation->>'id')::UUID AND user_id = p_user_id;
+                IF NOT FOUND THEN
+                    RAISE EXCEPTION 'Recipe not found' USING ERRCODE = 'P0002';
+                END IF;
+                results := results || jsonb_build_object(
+                    'local_id', operation->>'local_id', 'id', operation->>'id', 'status', 'deleted'
+                );
+            ELSE
+                RAISE EXCEPTION 'Unknown operation %', operation->>'op';
+            END IF;
+        EXCEPTION
+            WHEN SQLSTATE 'P0002' THEN
+                results := results || jsonb_build_object(
+                    'local_id', operation->>'local_id', 'id', operation->>'id',
+                    'status', 'not_found', 'error', SQLERRM
+                );
+            WHEN OTHERS THEN
+                results := results || jsonb_build_object(
+                    'local_id', operation->>'local_id', 'id', operation->>'id',
+                    'status', 'error', 'error', SQLERRM
+                );
+        END;
+    END LOOP;
+
+    RETURN results;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recipes changed and deleted for p_user_id after change sequence number p_since,
+-- oldest first, at most p_limit + 1 entries (the extra one signals another page).
+-- A NULL p_since starts from the beginning and skips tombstones.
+-- Returns {"changes": [{"id", "seq", "deleted", "recipe"}], "expired": bool}; expired
+-- means deletions after p_since have been pruned, so the client must sync from scratch.
+CREATE OR REPLACE FUNCTION public.get_recipe_changes(p_user_id UUID, p_since BIGINT, p_limit INTEGER)
+RETURNS JSONB AS $$
+    WITH changes AS (
+        (
+            SELECT r.id, r.change_seq AS seq, FALSE AS deleted
+            FROM public.recipes r
+            WHERE r.user_id = p_user_id
+                AND r.change_seq > COALESCE(p_since, -1)
+            ORDER BY r.change_seq
+            LIMIT p_limit + 1
+        )
+        UNION ALL
+        (
+            SELECT t.recipe_id, t.change_seq, TRUE
+            FROM public.recipe_tombstones t
+            WHERE t.user_id = p_user_id
+                AND p_since IS NOT NULL
+                AND t.change_seq > p_since
+            ORDER BY t.change_seq
+            LIMIT p_limit + 1
+        )
+        ORDER BY seq
+        LIMIT p_limit + 1
+    )
+    SELECT jsonb_build_object(
+        'changes', COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'id', id,
+                    'seq', seq,
+                    'deleted', deleted,
+                    'recipe', CASE WHEN deleted THEN NULL ELSE public.get_recipe_document(id) END
+                )
+                ORDER BY seq
+            ),
+            '[]'::jsonb
+        ),
+        'expired', COALESCE(
+            p_since < (SELECT v.pruned_through FROM public.recipe_list_versions v WHERE v.user_id = p_user_id),
+            FALSE
+        )
+    )
+    FROM changes;
+$$ LANGUAGE sql STABLE;
+
+-- Delete tombstones older than p_retention. Clients that have not synced since then
+-- get "expired" from get_recipe_changes and pull everything again. Returns the number
+-- of tombstones removed.
+CREATE OR REPLACE FUNCTION public.prune_recipe_tombstones(p_retention INTERVAL DEFAULT INTERVAL '90 days')
+RETURNS INTEGER AS $$
+DECLARE
+    pruned INTEGER;
+BEGIN
+    WITH removed AS (
+        DELETE FROM public.recipe_tombstones
+        WHERE deleted_at < NOW() - p_retention
+        RETURNING user_id, change_seq
+    ), per_user AS (
+        SELECT user_id, MAX(change_seq) AS through, COUNT(*) AS n
+        FROM removed
+        GROUP BY user_id
+    ), marked AS (
+        UPDATE public.recipe_list_versions v
+        SET pruned_through = GREATEST(v.pruned_through, p.through)
+        FROM per_user p
+        WHERE v.user_id = p.user_id
+    )
+    SELECT COALESCE(SUM(n), 0) INTO pruned FROM per_user;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION public.prune_recipe_tombstones(INTERVAL) FROM PUBLIC, anon, authenticated;
+
+-- Prune nightly where pg_cron is enabled (Database > Extensions); otherwise schedule
+-- SELECT public.prune_recipe_tombstones() with any job runner using the service role
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'prune-recipe-tombstones', '17 3 * * *', 'SELECT public.prune_recipe_tombstones()'
+        );
+    END IF;
+END;
+$$;
+
+-- Whether a recipe passes the list/search facet filters:
+-- {"cuisine_types": [...], "difficulties": [...], "tags": [...], "max_total_time": n}.
+-- Missing keys do not filter; values within one key are alternatives.
+CREATE OR REPLACE FUNCTION public.recipe_matches_filters(p_recipe public.recipes, p_filters JSONB)
+RETURNS BOOLEAN AS $$
+    SELECT
+        (p_filters->'cuisine_types' IS NULL
+            OR p_recipe.cuisine_type IN (SELECT jsonb_array_elements_text(p_filters->'cuisine_types')))
+        AND (p_filters->'difficulties' IS NULL
+            OR p_recipe.difficulty IN (SELECT jsonb_array_elements_text(p_filters->'difficulties')))
+        AND (p_filters->'max_total_time' IS NULL
+            OR p_recipe.total_time <= (p_filters->>'max_total_time')::INTEGER)
+        AND (p_filters->'tags' IS NULL OR EXISTS (
+            SELECT 1
+            FROM public.recipe_tags rt
+            JOIN public.tags t ON t.id = rt.tag_id
+            WHERE rt.recipe_id = p_recipe.id
+                AND t.name IN (SELECT jsonb_array_elements_text(p_filters->'tags'))
+        ));
+$$ LANGUAGE sql STABLE;
+
+-- Ranked full-text search over a user's recipes (web-search syntax: quotes, OR, -term).
+-- Returns {"results": [{"rank", "recipe"}]}, best first, at most p_limit + 1 entries.
+CREATE OR REPLACE FUNCTION public.search_recipes(
+    p_user_id UUID, p_query TEXT, p_limit INTEGER, p_offset INTEGER, p_filters JSONB DEFAULT '{}'
+)
+RETURNS JSONB AS $$
+    WITH hits AS (
+        SELECT d.recipe_id, ts_rank_cd(d.document, q.query) AS rank
+        FROM public.recipe_search_documents d
+        JOIN public.recipes r ON r.id = d.recipe_id,
+            websearch_to_tsquery('english', p_query) AS q(query)
+        WHERE d.user_id = p_user_id
+            AND d.document @@ q.query
+            AND public.recipe_matches_filters(r, p_filters)
+        ORDER BY rank DESC, d.recipe_id
+        LIMIT p_limit + 1 OFFSET p_offset
+    )
+    SELECT jsonb_build_object(
+        'results', COALESCE(
+            jsonb_agg(
+                jsonb_build_object('rank', rank, 'recipe', public.get_recipe_document(recipe_id))
+                ORDER BY rank DESC, recipe_id
+            ),
+            '[]'::jsonb
+        )
+    )
+    FROM hits;
+$$ LANGUAGE sql STABLE;
+
+-- Recipes the user can cook from a list of pantry items, ranked by coverage
+-- (matched / required ingredients), then fewest missing. Candidates come from
+-- intersecting the pantry tokens with ingredient_index, so recipes sharing no
+-- ingredient with the pantry are never read. An ingredient counts as matched
+-- when it has every token of one pantry item ("chicken" covers "chicken thighs",
+-- but "red wine" does not cover "red onion").
+CREATE OR REPLACE FUNCTION public.search_recipes_by_pantry(
+    p_user_id UUID, p_ingredients TEXT[], p_max_missing INTEGER, p_limit INTEGER, p_offset INTEGER
+)
+RETURNS JSONB AS $$
+    WITH pantry AS (
+        SELECT i.item_no, t.token, count(*) OVER (PARTITION BY i.item_no) AS item_tokens
+        FROM unnest(p_ingredients) WITH ORDINALITY AS i(item, item_no),
+            unnest(public.ingredient_tokens(i.item)) AS t(token)
+        GROUP BY i.item_no, t.token
+    ),
+    -- Ingredients holding all tokens of some pantry item
+    item_matches AS (
+        SELECT ix.recipe_id, ix.ingredient_id
+        FROM public.ingredient_index ix
+        JOIN pantry p ON p.token = ix.token
+        WHERE ix.user_id = p_user_id
+        GROUP BY ix.recipe_id, ix.ingredient_id, p.item_no
+        HAVING count(*) = min(p.item_tokens)
+    ),
+    matched AS (
+        SELECT recipe_id, array_agg(DISTINCT ingredient_id) AS ingredient_ids
+        FROM item_matches
+        GROUP BY recipe_id
+    ),
+    scored AS (
+        SELECT
+            m.recipe_id,
+            m.ingredient_ids,
+            cardinality(m.ingredient_ids) AS matched,
+            (SELECT count(*) FROM public.ingredients i WHERE i.recipe_id = m.recipe_id) AS required
+        FROM matched m
+    ),
+    hits AS (
+        SELECT
+            recipe_id,
+            ingredient_ids,
+            matched,
+            required,
+            required - matched AS missing,
+            matched::REAL / required AS coverage
+        FROM scored
+        WHERE p_max_missing IS NULL OR required - matched <= p_max_missing
+        ORDER BY coverage DESC, missing, recipe_id
+        LIMIT p_limit + 1 OFFSET p_offset
+    )
+    SELECT jsonb_build_object(
+        'results', COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'matched', h.matched,
+                    'required', h.required,
+                    'missing', h.missing,
+                    'coverage', h.coverage,
+                    'missing_ingredients', COALESCE(
+                        (
+                            SELECT jsonb_agg(i.name ORDER BY i.order_index)
+                            FROM public.ingredients i
+                            WHERE i.recipe_id = h.recipe_id AND NOT i.id = ANY(h.ingredient_ids)
+                        ),
+                        '[]'::jsonb
+                    ),
+                    'recipe', public.get_recipe_document(h.recipe_id)
+                )
+                ORDER BY h.coverage DESC, h.missing, h.recipe_id
+            ),
+            '[]'::jsonb
+        )
+    )
+    FROM hits h;
+$$ LANGUAGE sql STABLE;
+
+-- Typo-tolerant search over recipe titles and ingredient names using trigrams.
+-- Fuzzy mode matches words at least p_threshold similar to the query ("parmesean");
+-- prefix mode matches words starting with it, for search-as-you-type ("chick").
+-- Ingredient matches score slightly below title matches. Same result shape as search_recipes.
+CREATE OR REPLACE FUNCTION public.search_recipes_fuzzy(
+    p_user_id UUID, p_query TEXT, p_prefix BOOLEAN, p_threshold REAL, p_limit INTEGER, p_offset INTEGER,
+    p_filters JSONB DEFAULT '{}'
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_query TEXT := lower(trim(p_query));
+    v_pattern TEXT;
+    v_result JSONB;
+BEGIN
+    -- Threshold used by the index-backed <% operator for this transaction only
+    PERFORM set_config('pg_trgm.word_similarity_threshold', p_threshold::TEXT, true);
+    v_pattern := replace(replace(replace(v_query, '\', '\\'), '%', '\%'), '_', '\_');
+
+    WITH matches AS (
+        SELECT r.id AS recipe_id, word_similarity(v_query, r.title) AS score
+        FROM public.recipes r
+        WHERE r.user_id = p_user_id
+            AND CASE WHEN p_prefix
+                THEN r.title ILIKE v_pattern || '%' OR r.title ILIKE '% ' || v_pattern || '%'
+                ELSE v_query <% r.title
+            END
+        UNION ALL
+        SELECT i.recipe_id, 0.8 * word_similarity(v_query, i.name)
+        FROM public.ingredients i
+        JOIN public.recipes r ON r.id = i.recipe_id
+        WHERE r.user_id = p_user_id
+            AND CASE WHEN p_prefix
+                THEN i.name ILIKE v_pattern || '%' OR i.name ILIKE '% ' || v_pattern || '%'
+                ELSE v_query <% i.name
+            END
+    ),
+    hits AS (
+        SELECT m.recipe_id, max(m.score) AS rank
+        FROM matches m
+        JOIN public.recipes r ON r.id = m.recipe_id
+        WHERE public.recipe_matches_filters(r, p_filters)
+        GROUP BY m.recipe_id
+        ORDER BY rank DESC, recipe_id
+        LIMIT p_limit + 1 OFFSET p_offset
+    )
+    SELECT jsonb_build_object(
+        'results', COALESCE(
+            jsonb_agg(
+                jsonb_build_object('rank', rank, 'recipe', public.get_recipe_document(recipe_id))
+                ORDER BY rank DESC, recipe_id
+            ),
+            '[]'::jsonb
+        )
+    )
+    INTO v_result
+    FROM hits;
+
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql STABLE
+-- Plan per call so the CASE on p_prefix folds away and the trigram indexes are used
+SET plan_cache_mode = force_custom_plan;
+
+-- Per-value counts of the recipes matching p_filters, computed in one pass:
+-- {"total", "cuisine_type": [{"value", "count"}], "difficulty": [...], "tags": [...],
+--  "total_time": [{"max_total_time", "count"}]} (total_time counts are cumulative).
+CREATE OR REPLACE FUNCTION public.get_recipe_facets(p_user_id UUID, p_filters JSONB DEFAULT '{}')
+RETURNS JSONB AS $$
+    WITH filtered AS (
+        SELECT r.id, r.cuisine_type, r.difficulty, r.total_time
+        FROM public.recipes r
+        WHERE r.user_id = p_user_id
+            AND public.recipe_matches_filters(r, p_filters)
+    ),
+    grouped AS (
+        SELECT
+            GROUPING(cuisine_type) AS no_cuisine,
+            GROUPING(difficulty) AS no_difficulty,
+            cuisine_type,
+            difficulty,
+            count(*) AS n,
+            count(*) FILTER (WHERE total_time <= 15) AS within_15,
+            count(*) FILTER (WHERE total_time <= 30) AS within_30,
+            count(*) FILTER (WHERE total_time <= 60) AS within_60,
+            count(*) FILTER (WHERE total_time <= 120) AS within_120
+        FROM filtered
+        GROUP BY GROUPING SETS ((cuisine_type), (difficulty), ())
+    ),
+    tag_counts AS (
+        SELECT t.name, count(*) AS n
+        FROM filtered f
+        JOIN public.recipe_tags rt ON rt.recipe_id = f.id
+        JOIN public.tags t ON t.id = rt.tag_id
+        GROUP BY t.name
+    )
+    SELECT jsonb_build_object(
+        'total', COALESCE((SELECT n FROM grouped WHERE no_cuisine = 1 AND no_difficulty = 1), 0),
+        'cuisine_type', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('value', cuisine_type, 'count', n) ORDER BY n DESC, cuisine_type)
+            FROM grouped WHERE no_cuisine = 0 AND cuisine_type IS NOT NULL
+        ), '[]'::jsonb),
+        'difficulty', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('value', difficulty, 'count', n) ORDER BY n DESC, difficulty)
+            FROM grouped WHERE no_difficulty = 0 AND difficulty IS NOT NULL
+        ), '[]'::jsonb),
+        'tags', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('value', name, 'count', n) ORDER BY n DESC, name)
+            FROM tag_counts
+        ), '[]'::jsonb),
+        'total_time', COALESCE((
+            SELECT jsonb_build_array(
+                jsonb_build_object('max_total_time', 15, 'count', within_15),
+                jsonb_build_object('max_total_time', 30, 'count', within_30),
+                jsonb_build_object('max_total_time', 60, 'count', within_60),
+                jsonb_build_object('max_total_time', 120, 'count', within_120)
+            )
+            FROM grouped WHERE no_cuisine = 1 AND no_difficulty = 1
+        ), '[]'::jsonb)
+    );
+$$ LANGUAGE sql STABLE;
+
 -- Row Level Security (RLS) Policies
 
 -- Enable RLS on all tables
@@ -160,6 +1115,10 @@ ALTER TABLE public.steps ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.attachments ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.tags ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.recipe_tags ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.recipe_tombstones ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.recipe_list_versions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.recipe_search_documents ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.ingredient_index ENABLE ROW LEVEL SECURITY;
 
 -- Users policies
 CREATE POLICY "Users can view their own profile"
@@ -333,6 +1292,26 @@ CREATE POLICY "Users can delete recipe_tags of their recipes"
         )
     );
 
+-- Recipe_tombstones policies (rows are written by the delete trigger only)
+CREATE POLICY "Users can view their own recipe tombstones"
+    ON public.recipe_tombstones FOR SELECT
+    USING (auth.uid() = user_id);
+
+-- Recipe_list_versions policies (rows are written by the recipes triggers only)
+CREATE POLICY "Users can view their own recipe list version"
+    ON public.recipe_list_versions FOR SELECT
+    USING (auth.uid() = user_id);
+
+-- Recipe_search_documents policies (rows are written by the search triggers only)
+CREATE POLICY "Users can view their own recipe search documents"
+    ON public.recipe_search_documents FOR SELECT
+    USING (auth.uid() = user_id);
+
+-- Ingredient_index policies (rows are written by the ingredients triggers only)
+CREATE POLICY "Users can view their own ingredient index"
+    ON public.ingredient_index FOR SELECT
+    USING (auth.uid() = user_id);
+
 -- Storage bucket policies (to be configured in Supabase dashboard)
 -- Bucket: recipe-images
 -- Policy: Users can upload files to their own folder: {user_id}/*
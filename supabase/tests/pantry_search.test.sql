@@ -0,0 +1,46 @@
+-- pgTAP tests for search_recipes_by_pantry; run with `supabase test db`
+BEGIN;
+SELECT plan(4);
+
+INSERT INTO auth.users (id, email) VALUES ('00000000-0000-0000-0000-0000000000a1', 'pantry@example.com');
+INSERT INTO public.recipes (id, user_id, title) VALUES
+    ('00000000-0000-0000-0000-0000000000b1', '00000000-0000-0000-0000-0000000000a1', 'Salsa'),
+    ('00000000-0000-0000-0000-0000000000b2', '00000000-0000-0000-0000-0000000000a1', 'Roast chicken');
+INSERT INTO public.ingredients (recipe_id, name, order_index) VALUES
+    ('00000000-0000-0000-0000-0000000000b1', 'Red onion', 0),
+    ('00000000-0000-0000-0000-0000000000b1', 'Fresh thyme', 1),
+    ('00000000-0000-0000-0000-0000000000b1', 'Tomatoes', 2),
+    ('00000000-0000-0000-0000-0000000000b2', 'Chicken thighs', 0);
+
+CREATE TEMP TABLE salsa AS
+SELECT r AS result
+FROM jsonb_array_elements(
+    public.search_recipes_by_pantry(
+        '00000000-0000-0000-0000-0000000000a1', ARRAY['red wine', 'fresh basil', 'tomato'], NULL, 10, 0
+    )->'results'
+) AS r
+WHERE r->'recipe'->>'title' = 'Salsa';
+
+SELECT is(
+    (SELECT (result->>'matched')::INTEGER FROM salsa), 1,
+    'only the tomatoes match; shared adjectives are not enough'
+);
+SELECT is(
+    (SELECT result->'missing_ingredients' FROM salsa), '["Red onion", "Fresh thyme"]'::JSONB,
+    '"red wine" does not cover "red onion", nor "fresh basil" "fresh thyme"'
+);
+SELECT is(
+    (public.search_recipes_by_pantry(
+        '00000000-0000-0000-0000-0000000000a1', ARRAY['chicken'], NULL, 10, 0
+    )->'results'->0->>'matched')::INTEGER, 1,
+    'a pantry item covers an ingredient with more words'
+);
+SELECT is(
+    jsonb_array_length(public.search_recipes_by_pantry(
+        '00000000-0000-0000-0000-0000000000a1', ARRAY['red wine'], NULL, 10, 0
+    )->'results'), 0,
+    'a recipe sharing only one word of an item is not a candidate'
+);
+
+SELECT * FROM finish();
+ROLLBACK;